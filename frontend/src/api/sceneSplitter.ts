@@ -1,22 +1,32 @@
-import type { DocumentSummary } from '@/types/models';
+import type { DocumentSummary, JobProgress } from '@/types/models';
 
 const API_BASE = ((import.meta.env.VITE_SCENE_SPLITTER_URL as string | undefined) ?? '/api').replace(/\/$/, '');
 
-export interface DocumentsResponse {
-  documents: Array<{
+export interface DocumentItemResponse {
+  id: string;
+  filename: string;
+  file_size?: number | null;
+  mime_type?: string | null;
+  created_at?: string | null;
+  processing_jobs: Array<{
     id: string;
-    filename: string;
-    file_size?: number | null;
-    mime_type?: string | null;
-    created_at?: string | null;
-    processing_jobs: Array<{
-      id: string;
-      status: string;
-      current_step?: string | null;
-    }>;
+    status: string;
+    current_step?: string | null;
   }>;
 }
 
+export interface DocumentsResponse {
+  documents: DocumentItemResponse[];
+  next_cursor?: string | null;
+  total_estimate?: number | null;
+}
+
+export interface DocumentsPage {
+  documents: DocumentSummary[];
+  nextCursor: string | null;
+  totalEstimate: number | null;
+}
+
 export interface UploadResponse {
   job_id: string;
   task_id: string;
@@ -25,16 +35,32 @@ export interface UploadResponse {
   message: string;
 }
 
+export interface SceneItemResponse {
+  scene_id: string;
+  scene_number: number;
+  scene_text: string;
+  sentence_count: number;
+  word_count: number;
+  char_count: number;
+}
+
 export interface ScenesResponse {
   job_id: string;
+  revision?: number;
   scenes_count: number;
-  scenes: Array<{
-    scene_number: number;
-    scene_text: string;
-    sentence_count: number;
-    word_count: number;
-    char_count: number;
-  }>;
+  next_cursor?: string | null;
+  scenes: SceneItemResponse[];
+}
+
+export interface SceneChangesResponse {
+  job_id: string;
+  revision: number;
+  scenes_count: number;
+  // changed and new scenes in their final state
+  scenes: SceneItemResponse[];
+  removed_scene_ids: string[];
+  // applied in order: every scene numbered above after_scene_number at that point moved by shift
+  shifts: Array<{ after_scene_number: number; shift: number }>;
 }
 
 export interface SceneSentencesResponse {
@@ -46,11 +72,8 @@ export interface SceneSentencesResponse {
   }>;
 }
 
-export async function fetchDocuments(): Promise<DocumentSummary[]> {
-  const res = await fetch(`${API_BASE}/documents`);
-  if (!res.ok) throw new Error(`Failed to fetch documents: ${res.status}`);
-  const data = (await res.json()) as DocumentsResponse;
-  return data.documents.map((doc) => ({
+function toDocumentSummary(doc: DocumentItemResponse): DocumentSummary {
+  return {
     id: doc.id,
     filename: doc.filename,
     name: doc.filename,
@@ -62,14 +85,51 @@ export async function fetchDocuments(): Promise<DocumentSummary[]> {
       status: j.status,
       currentStep: j.current_step ?? null,
     })),
-  }));
+  };
+}
+
+export async function fetchDocuments(cursor?: string | null, limit = 50): Promise<DocumentsPage> {
+  const params = new URLSearchParams({ limit: String(limit) });
+  if (cursor) params.set('cursor', cursor);
+  const res = await fetch(`${API_BASE}/documents?${params}`);
+  if (!res.ok) throw new Error(`Failed to fetch documents: ${res.status}`);
+  const data = (await res.json()) as DocumentsResponse;
+  return {
+    documents: data.documents.map(toDocumentSummary),
+    nextCursor: data.next_cursor ?? null,
+    totalEstimate: data.total_estimate ?? null,
+  };
+}
+
+export async function fetchDocument(documentId: string): Promise<DocumentSummary> {
+  const res = await fetch(`${API_BASE}/documents/${documentId}`);
+  if (!res.ok) throw new Error(`Failed to fetch document: ${res.status}`);
+  return toDocumentSummary((await res.json()) as DocumentItemResponse);
 }
 
-export async function uploadDocument(file: File, startPage = 1, endPage = 999): Promise<UploadResponse> {
+export interface SegmentationOptions {
+  mode?: 'valleys' | 'optimal';
+  lengthUnit?: 'sentences' | 'words';
+  minSceneLength?: number;
+  maxSceneLength?: number;
+  targetSceneCount?: number;
+}
+
+export async function uploadDocument(
+  file: File,
+  startPage = 1,
+  endPage = 999,
+  segmentation: SegmentationOptions = {},
+): Promise<UploadResponse> {
   const formData = new FormData();
   formData.append('file', file);
   formData.append('start_page', String(startPage));
   formData.append('end_page', String(endPage));
+  if (segmentation.mode) formData.append('segmentation_mode', segmentation.mode);
+  if (segmentation.lengthUnit) formData.append('length_unit', segmentation.lengthUnit);
+  if (segmentation.minSceneLength) formData.append('min_scene_length', String(segmentation.minSceneLength));
+  if (segmentation.maxSceneLength) formData.append('max_scene_length', String(segmentation.maxSceneLength));
+  if (segmentation.targetSceneCount) formData.append('target_scene_count', String(segmentation.targetSceneCount));
 
   const res = await fetch(`${API_BASE}/split-scenes/`, {
     method: 'POST',
@@ -132,3 +192,51 @@ export async function mergeScenes(jobId: string, sceneNumbers: number[]) {
   }
   return res.json();
 }
+
+export type SceneOperation =
+  | { op: 'merge'; scene_numbers: number[] }
+  | { op: 'split'; scene_number: number; at_sentence: number }
+  | { op: 'move_boundary'; scene_number: number; sentences: number }
+  | { op: 'update'; scenes: Array<{ scene_number: number; scene_text: string }> };
+
+export async function applySceneOperations(jobId: string, operations: SceneOperation[]): Promise<SceneChangesResponse> {
+  const res = await fetch(`${API_BASE}/jobs/${jobId}/scenes/batch`, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json' },
+    body: JSON.stringify({ operations }),
+  });
+  if (!res.ok) {
+    const text = await res.text();
+    throw new Error(`Batch edit failed: ${res.status} ${text}`);
+  }
+  return res.json();
+}
+
+export interface JobStatusEvent {
+  job_id: string;
+  status: string;
+  current_step?: string | null;
+  error_message?: string | null;
+  revision?: number;
+  progress?: JobProgress | null;
+}
+
+export interface JobEventHandlers {
+  // the full job state: on connect and whenever the server may have missed events
+  snapshot?: (event: JobStatusEvent) => void;
+  status?: (event: JobStatusEvent) => void;
+  progress?: (event: JobProgress & { job_id: string }) => void;
+  revision?: (event: { job_id: string; revision: number }) => void;
+}
+
+// one stream for all the jobs: every EventSource holds an HTTP/1.1 connection of the
+// browser's six per host. It reconnects by itself and the server answers every connect
+// with a snapshot of each job; jobs that can no longer change get no further events.
+export function subscribeJobEvents(jobIds: string[], handlers: JobEventHandlers): () => void {
+  const source = new EventSource(`${API_BASE}/jobs/events?ids=${jobIds.map(encodeURIComponent).join(',')}`);
+  for (const [type, handler] of Object.entries(handlers)) {
+    if (!handler) continue;
+    source.addEventListener(type, (event) => handler(JSON.parse((event as MessageEvent).data)));
+  }
+  return () => source.close();
+}
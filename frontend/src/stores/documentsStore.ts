@@ -1,13 +1,24 @@
 import { computed, ref } from 'vue';
 import { defineStore } from 'pinia';
-import type { DocumentSummary } from '@/types/models';
-import { fetchDocuments, uploadDocument } from '@/api/sceneSplitter';
+import type { DocumentSummary, ProcessingJobRef } from '@/types/models';
+import { fetchDocument, fetchDocuments, subscribeJobEvents, uploadDocument } from '@/api/sceneSplitter';
+import type { JobStatusEvent } from '@/api/sceneSplitter';
+
+// jobs still moving through the workers; only these are watched
+const ACTIVE_STATUSES = ['pending', 'extracting', 'splitting'];
 
 export const useDocumentsStore = defineStore('documents', () => {
   const documents = ref<DocumentSummary[]>([]);
   const activeDocumentId = ref<string | null>(null);
   const loading = ref(false);
+  const loadingMore = ref(false);
   const error = ref<string | null>(null);
+  const nextCursor = ref<string | null>(null);
+  const totalEstimate = ref<number | null>(null);
+  const hasMore = computed(() => nextCursor.value !== null);
+  const watchedJobs = new Set<string>();
+  let closeJobStream: (() => void) | null = null;
+  let restartPending = false;
 
   const activeDocument = computed(() =>
     documents.value.find((doc) => doc.id === activeDocumentId.value) ?? null,
@@ -17,11 +28,78 @@ export const useDocumentsStore = defineStore('documents', () => {
     activeDocumentId.value = id;
   }
 
+  function findJob(jobId: string): ProcessingJobRef | undefined {
+    for (const doc of documents.value) {
+      const job = doc.processingJobs.find((j) => j.id === jobId);
+      if (job) return job;
+    }
+    return undefined;
+  }
+
+  function applyJobStatus(event: JobStatusEvent) {
+    const job = findJob(event.job_id);
+    if (!job) return;
+    job.status = event.status;
+    if (event.current_step !== undefined) job.currentStep = event.current_step;
+    if (event.progress !== undefined) job.progress = event.progress;
+    if (!ACTIVE_STATUSES.includes(event.status.toLowerCase())) unwatchJob(event.job_id);
+  }
+
+  function watchJob(jobId: string) {
+    if (watchedJobs.has(jobId)) return;
+    watchedJobs.add(jobId);
+    restartJobStream();
+  }
+
+  function unwatchJob(jobId: string) {
+    if (!watchedJobs.delete(jobId)) return;
+    // the server stops sending for a finished job by itself, only an empty set closes the stream
+    if (watchedJobs.size === 0) restartJobStream();
+  }
+
+  // reopened once per tick, so watching a whole page of jobs costs one reconnect
+  function restartJobStream() {
+    if (restartPending) return;
+    restartPending = true;
+    queueMicrotask(() => {
+      restartPending = false;
+      closeJobStream?.();
+      closeJobStream = null;
+      if (watchedJobs.size === 0) return;
+      closeJobStream = subscribeJobEvents([...watchedJobs], {
+        snapshot: applyJobStatus,
+        status: applyJobStatus,
+        progress: ({ job_id, stage, done, total }) => {
+          const job = findJob(job_id);
+          if (job) job.progress = { stage, done, total };
+        },
+      });
+    });
+  }
+
+  // live status for the latest job of every listed document that is still processing
+  function watchActiveJobs() {
+    for (const doc of documents.value) {
+      const latest = doc.processingJobs[0];
+      if (latest && ACTIVE_STATUSES.includes(latest.status.toLowerCase())) watchJob(latest.id);
+    }
+  }
+
+  function unwatchJobs() {
+    watchedJobs.clear();
+    restartJobStream();
+  }
+
   async function loadDocuments() {
     loading.value = true;
     error.value = null;
     try {
-      documents.value = await fetchDocuments();
+      const page = await fetchDocuments();
+      documents.value = page.documents;
+      nextCursor.value = page.nextCursor;
+      totalEstimate.value = page.totalEstimate;
+      unwatchJobs();
+      watchActiveJobs();
     } catch (e: any) {
       error.value = e?.message ?? 'Не удалось загрузить документы';
       throw e;
@@ -30,6 +108,32 @@ export const useDocumentsStore = defineStore('documents', () => {
     }
   }
 
+  async function loadMore() {
+    if (!nextCursor.value || loadingMore.value) return;
+    loadingMore.value = true;
+    error.value = null;
+    try {
+      const page = await fetchDocuments(nextCursor.value);
+      const known = new Set(documents.value.map((d) => d.id));
+      documents.value.push(...page.documents.filter((d) => !known.has(d.id)));
+      nextCursor.value = page.nextCursor;
+      watchActiveJobs();
+    } catch (e: any) {
+      error.value = e?.message ?? 'Не удалось загрузить документы';
+      throw e;
+    } finally {
+      loadingMore.value = false;
+    }
+  }
+
+  async function ensureDocument(id: string) {
+    const existing = documents.value.find((d) => d.id === id);
+    if (existing) return existing;
+    const doc = await fetchDocument(id);
+    documents.value.push(doc);
+    return doc;
+  }
+
   async function upload(file: File, startPage: number, endPage: number) {
     error.value = null;
     const response = await uploadDocument(file, startPage, endPage);
@@ -46,6 +150,7 @@ export const useDocumentsStore = defineStore('documents', () => {
       existing.processingJobs.unshift({ id: response.job_id, status: response.status });
     }
     activeDocumentId.value = response.document_id;
+    watchJob(response.job_id);
     return response;
   }
 
@@ -54,9 +159,16 @@ export const useDocumentsStore = defineStore('documents', () => {
     activeDocumentId,
     activeDocument,
     loading,
+    loadingMore,
     error,
+    hasMore,
+    totalEstimate,
     loadDocuments,
+    loadMore,
+    ensureDocument,
     upload,
     setActiveDocument,
+    watchActiveJobs,
+    unwatchJobs,
   };
 });
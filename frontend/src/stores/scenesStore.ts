@@ -1,13 +1,15 @@
 import { computed, ref } from 'vue';
 import { defineStore } from 'pinia';
 import type { Scene, Illustration } from '@/types/models';
-import { fetchScenes, fetchSceneSentences, patchScenes, approveJob, mergeScenes } from '@/api/sceneSplitter';
+import { fetchScenes, fetchSceneSentences, approveJob, applySceneOperations } from '@/api/sceneSplitter';
+import type { SceneChangesResponse, SceneItemResponse, SceneOperation } from '@/api/sceneSplitter';
 import { fetchSceneImage } from '@/api/imageGenerator';
 
 export const useScenesStore = defineStore('scenes', () => {
   const jobId = ref<string | null>(null);
   const storyUuid = ref<string | null>(null);
   const scenes = ref<Scene[]>([]);
+  const revision = ref<number | null>(null);
   const illustrations = ref<Record<string, Illustration>>({});
   const sentencesMap = ref<Record<number, string[]>>({});
   const dirtyTexts = ref<Record<number, string>>({});
@@ -67,15 +69,8 @@ export const useScenesStore = defineStore('scenes', () => {
     error.value = null;
     try {
       const resp = await fetchScenes(targetJobId);
-      scenes.value = resp.scenes.map((s) => ({
-        id: `${targetJobId}-${s.scene_number}`,
-        sceneNumber: s.scene_number,
-        index: s.scene_number,
-        title: `Сцена ${s.scene_number}`,
-        text: s.scene_text,
-        sentenceCount: s.sentence_count,
-        status: 'pending',
-      }));
+      scenes.value = resp.scenes.map((s) => toScene(targetJobId, s));
+      revision.value = resp.revision ?? null;
       listPage.value = 1;
       illustrations.value = {};
       sentencesMap.value = {};
@@ -90,11 +85,63 @@ export const useScenesStore = defineStore('scenes', () => {
     }
   }
 
+  function toScene(targetJobId: string, s: SceneItemResponse): Scene {
+    return {
+      id: `${targetJobId}-${s.scene_number}`,
+      sceneId: s.scene_id,
+      sceneNumber: s.scene_number,
+      index: s.scene_number,
+      title: `Сцена ${s.scene_number}`,
+      text: s.scene_text,
+      sentenceCount: s.sentence_count,
+      status: 'pending',
+    };
+  }
+
+  function renumberScene(targetJobId: string, scene: Scene, sceneNumber: number) {
+    scene.id = `${targetJobId}-${sceneNumber}`;
+    scene.sceneNumber = sceneNumber;
+    scene.index = sceneNumber;
+    scene.title = `Сцена ${sceneNumber}`;
+  }
+
+  // applies the delta of an edit instead of reloading the whole job; returns false if it does not fit the local state
+  function applySceneChanges(targetJobId: string, changes: SceneChangesResponse): boolean {
+    const removed = new Set(changes.removed_scene_ids);
+    const changed = new Set(changes.scenes.map((s) => s.scene_id));
+    const kept = scenes.value.filter((s) => s.sceneId && !removed.has(s.sceneId) && !changed.has(s.sceneId));
+    if (kept.length + changes.scenes.length !== changes.scenes_count) return false;
+
+    for (const scene of kept) {
+      let sceneNumber = scene.sceneNumber;
+      for (const { after_scene_number, shift } of changes.shifts) {
+        if (sceneNumber > after_scene_number) sceneNumber += shift;
+      }
+      renumberScene(targetJobId, scene, sceneNumber);
+    }
+    scenes.value = [...kept, ...changes.scenes.map((s) => toScene(targetJobId, s))].sort(
+      (a, b) => a.sceneNumber - b.sceneNumber,
+    );
+    revision.value = changes.revision;
+
+    // sentences and images are keyed by scene number, which the edit may have shifted
+    if (changes.removed_scene_ids.length || changes.shifts.length) {
+      sentencesMap.value = {};
+      illustrations.value = {};
+      for (const scene of scenes.value) scene.status = 'pending';
+    } else {
+      for (const s of changes.scenes) delete sentencesMap.value[s.scene_number];
+    }
+    setListPage(listPage.value);
+    return true;
+  }
+
   function resetScenes() {
     stopImagePolling();
     jobId.value = null;
     storyUuid.value = null;
     scenes.value = [];
+    revision.value = null;
     illustrations.value = {};
     sentencesMap.value = {};
     dirtyTexts.value = {};
@@ -217,24 +264,26 @@ export const useScenesStore = defineStore('scenes', () => {
       scene_number: Number(num),
       scene_text: text,
     }));
+    const operations: SceneOperation[] = [];
     if (patches.length) {
-      await patchScenes(jobId.value, patches);
+      operations.push({ op: 'update', scenes: patches });
     }
 
+    // merged from the end so the numbers of the remaining groups stay valid
     const mergeGroups = buildMergeGroups(pendingMergeLinksAll.value, scenes.value.length);
-    if (mergeGroups.length) {
-      const sorted = mergeGroups.sort((a, b) => b[b.length - 1] - a[a.length - 1]);
-      for (const group of sorted) {
-        await mergeScenes(jobId.value, group);
-      }
-      await loadScenes(jobId.value);
-      pendingMergeLinks.value = {};
-      pendingMergeLinksAuto.value = {};
-      return;
+    const sorted = mergeGroups.sort((a, b) => b[b.length - 1] - a[a.length - 1]);
+    for (const group of sorted) {
+      operations.push({ op: 'merge', scene_numbers: group });
     }
+    if (!operations.length) return;
 
-    if (patches.length) {
-      dirtyTexts.value = {};
+    const targetJobId = jobId.value;
+    const changes = await applySceneOperations(targetJobId, operations);
+    dirtyTexts.value = {};
+    pendingMergeLinks.value = {};
+    pendingMergeLinksAuto.value = {};
+    if (!applySceneChanges(targetJobId, changes)) {
+      await loadScenes(targetJobId);
     }
   }
 
@@ -316,6 +365,7 @@ export const useScenesStore = defineStore('scenes', () => {
   return {
     jobId,
     scenes,
+    revision,
     illustrations,
     sentencesMap,
     dirtyTexts,
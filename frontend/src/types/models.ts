@@ -1,9 +1,16 @@
 export type SceneStatus = 'pending' | 'approved' | 'generating' | 'ready' | 'error';
 
+export interface JobProgress {
+  stage: 'pages' | 'sentences' | 'shards' | 'scenes' | string;
+  done: number;
+  total: number | null;
+}
+
 export interface ProcessingJobRef {
   id: string;
   status: string;
   currentStep?: string | null;
+  progress?: JobProgress | null;
 }
 
 export interface DocumentSummary {
@@ -19,6 +26,7 @@ export interface DocumentSummary {
 
 export interface Scene {
   id: string;
+  sceneId?: string;
   index: number;
   sceneNumber: number;
   title?: string;
@@ -1,12 +1,31 @@
-from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Depends
+import asyncio
+import hashlib
+import json
+import os
+import time
+from datetime import datetime
+from typing import List, Optional
+from uuid import UUID, uuid4
+
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Depends, Header, Query, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import ValidationError
 from sqlalchemy.orm import Session
 
-from app.services.tasks.extract_text_task import extract_text_task
 from app.models import Scene, Document
 from app.repositories.processing_job_repository import ProcessingJobRepository
 from app.repositories.document_repository import DocumentRepository
+from app.repositories.scene_repository import SceneRepository
 from app.models.enums import ProcessingStatus
-from app.utils.database import get_db
+from app.utils.database import get_db, get_db_session
+from app.utils.celery import celery_app
+from app.services.blob_storage import get_blob_storage, store_pdf_upload
+from app.services.job_artifacts import get_json, put_json, resegment_result_key
+from app.services.job_event_hub import get_job_event_hub
+from app.services.job_status import FINALIZED_STATUSES, normalize_status
+from app.repositories.page_cache_repository import PageCacheRepository
 from app.services.job_approval_service import (
     JobApprovalService,
     JobNotFoundError,
@@ -18,6 +37,7 @@ from app.services.scene_update_service import (
     SceneUpdateService,
     JobNotEditableError,
     SceneNotFoundError,
+    ScenePatchValidationError,
 )
 from app.services.scene_merge_service import (
     SceneMergeService,
@@ -26,78 +46,240 @@ from app.services.scene_merge_service import (
     JobNotFoundError as SceneMergeJobNotFoundError,
     SceneNotFoundError as SceneMergeSceneNotFoundError,
 )
+from app.services.scene_batch_service import (
+    SceneBatchService,
+    SceneBatchOperationError,
+    SceneBatchSceneNotFoundError,
+    JobNotFoundError as SceneBatchJobNotFoundError,
+    JobNotEditableError as SceneBatchJobNotEditableError,
+)
 from app.services.scene_query_service import (
     SceneQueryService,
     SceneNotFoundError as SceneQueryNotFound,
     JobNotFoundError as JobQueryNotFound,
 )
+from app.api.pagination import decode_cursor, encode_cursor, parse_csv, parse_fields
 from app.api.schemas import (
     ScenePatchRequest,
     ScenePatchResponse,
     SceneResponse,
     SceneMergeRequest,
     SceneMergeResponse,
+    SceneBatchRequest,
+    SceneBatchResponse,
     DocumentsResponse,
     DocumentItem,
     ProcessingJobRef,
     SceneSentencesResponse,
     SceneSentence,
+    SegmentationOptions,
+    SceneResegmentRequest,
+    SceneResegmentResponse,
+    SceneResegmentTask,
+    PageCacheEntry,
+    DocumentPageCacheResponse,
+    PageCacheEvictResponse,
 )
 
+# handlers are plain def: FastAPI runs them in its threadpool, so the blocking
+# SQLAlchemy, storage and broker calls behind them never stall the event loop
 router = APIRouter()
 
-@router.get("/documents", response_model=DocumentsResponse)
-async def list_documents(session: Session = Depends(get_db)):
-    documents = session.query(Document).all()
-    return DocumentsResponse(
-        documents=[
-            DocumentItem(
-                id=doc.id,
-                filename=doc.filename,
-                file_size=doc.file_size,
-                mime_type=doc.mime_type,
-                created_at=doc.created_at.isoformat() if doc.created_at else None,
-                processing_jobs=[
-                    ProcessingJobRef(
-                        id=job.id,
-                        status=str(job.status),
-                        current_step=str(job.current_step) if job.current_step else None,
-                    )
-                    for job in doc.processing_jobs
-                ],
+RESEGMENT_TIMEOUT_SECONDS = float(os.getenv("RESEGMENT_TIMEOUT_SECONDS", "10"))
+# a worker that took the task right at the timeout still needs a moment to mark it running
+RESEGMENT_START_GRACE_SECONDS = 5
+
+DOCUMENT_FIELDS = ("id", "filename", "file_size", "mime_type", "created_at", "processing_jobs")
+DOCUMENTS_PAGE_MAX_LIMIT = int(os.getenv("DOCUMENTS_PAGE_MAX_LIMIT", "200"))
+
+
+def _document_item(doc: Document, fields) -> DocumentItem:
+    values = {"id": doc.id}
+    if "filename" in fields:
+        values["filename"] = doc.filename
+    if "file_size" in fields:
+        values["file_size"] = doc.file_size
+    if "mime_type" in fields:
+        values["mime_type"] = doc.mime_type
+    if "created_at" in fields:
+        values["created_at"] = doc.created_at.isoformat() if doc.created_at else None
+    if "processing_jobs" in fields:
+        values["processing_jobs"] = [
+            ProcessingJobRef(
+                id=job.id,
+                status=str(job.status),
+                current_step=str(job.current_step) if job.current_step else None,
             )
-            for doc in documents
+            for job in doc.processing_jobs
         ]
+    return DocumentItem(**values)
+
+
+def _parse_job_statuses(status: Optional[str]) -> List[str]:
+    statuses = []
+    for raw in parse_csv(status):
+        try:
+            value = ProcessingStatus(raw)
+        except ValueError:
+            allowed = ", ".join(s.value for s in ProcessingStatus)
+            raise HTTPException(status_code=400, detail=f"Unknown status {raw}. Allowed: {allowed}")
+        # older rows were written as str(ProcessingStatus.X)
+        statuses.extend([value.value, f"ProcessingStatus.{value.name}"])
+    return statuses
+
+
+@router.get("/documents", response_model=DocumentsResponse, response_model_exclude_unset=True)
+def list_documents(
+    limit: int = Query(50, ge=1, description="Размер страницы"),
+    cursor: Optional[str] = Query(None, description="next_cursor предыдущей страницы"),
+    fields: Optional[str] = Query(None, description=f"Поля через запятую: {', '.join(DOCUMENT_FIELDS)}"),
+    status: Optional[str] = Query(None, description="Только документы, у которых есть задача в одном из статусов"),
+    session: Session = Depends(get_db)
+):
+    limit = min(limit, DOCUMENTS_PAGE_MAX_LIMIT)
+    selected = parse_fields(fields, DOCUMENT_FIELDS, always=("id",))
+    after = decode_cursor(cursor, ("created_at", "id"))
+    job_statuses = _parse_job_statuses(status)
+
+    try:
+        after_created_at = datetime.fromisoformat(after["created_at"]) if after else None
+        after_id = UUID(after["id"]) if after else None
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    repo = DocumentRepository(session)
+    # one row more than asked tells whether another page exists
+    documents = repo.list_page(
+        limit + 1,
+        after_created_at=after_created_at,
+        after_id=after_id,
+        job_statuses=job_statuses,
+        columns=[column for column in ("filename", "file_size", "mime_type") if column in selected] + ["created_at"],
+        with_jobs="processing_jobs" in selected,
+    )
+    has_more = len(documents) > limit
+    documents = documents[:limit]
+
+    next_cursor = None
+    if has_more:
+        last = documents[-1]
+        next_cursor = encode_cursor({"created_at": last.created_at.isoformat(), "id": str(last.id)})
+
+    return DocumentsResponse(
+        documents=[_document_item(doc, selected) for doc in documents],
+        next_cursor=next_cursor,
+        total_estimate=repo.estimate_count(job_statuses) if after is None else None,
+    )
+
+
+@router.get("/documents/{document_id}", response_model=DocumentItem)
+def get_document(document_id: str, session: Session = Depends(get_db)):
+    document = DocumentRepository(session).get_by_id(document_id)
+    if not document:
+        raise HTTPException(status_code=404, detail=f"Document {document_id} not found")
+    return _document_item(document, DOCUMENT_FIELDS)
+
+
+@router.get("/documents/{document_id}/page-cache", response_model=DocumentPageCacheResponse)
+def get_document_page_cache(document_id: str, session: Session = Depends(get_db)):
+    document = DocumentRepository(session).get_by_id(document_id)
+    if not document:
+        raise HTTPException(status_code=404, detail=f"Document {document_id} not found")
+
+    entries = PageCacheRepository(session).describe(document.content_hash) if document.content_hash else []
+    return DocumentPageCacheResponse(
+        document_id=document.id,
+        content_hash=document.content_hash,
+        page_count=document.page_count,
+        current_fingerprint=_laparams_fingerprint(),
+        entries=[
+            PageCacheEntry(
+                laparams_fingerprint=entry["laparams_fingerprint"],
+                pages=entry["pages"],
+                bytes=int(entry["bytes"]),
+                page_numbers=sorted(index + 1 for index in entry["page_indexes"]),
+                created_at=entry["oldest"].isoformat() if entry["oldest"] else None,
+                last_accessed_at=entry["last_accessed_at"].isoformat() if entry["last_accessed_at"] else None,
+            )
+            for entry in entries
+        ],
+    )
+
+
+def _laparams_fingerprint() -> str:
+    from app.services.pdf_extractor import laparams_fingerprint
+
+    return laparams_fingerprint()
+
+
+@router.delete("/page-cache", response_model=PageCacheEvictResponse)
+def evict_page_cache(
+    older_than_days: Optional[int] = None,
+    max_bytes: Optional[int] = None,
+    session: Session = Depends(get_db)
+):
+    if older_than_days is None and max_bytes is None:
+        raise HTTPException(status_code=400, detail="Specify older_than_days and/or max_bytes")
+    if (older_than_days is not None and older_than_days < 0) or (max_bytes is not None and max_bytes < 0):
+        raise HTTPException(status_code=400, detail="Eviction limits must be non-negative")
+
+    repo = PageCacheRepository(session)
+    deleted = repo.evict(older_than_days=older_than_days, max_bytes=max_bytes)
+    totals = repo.totals()
+    return PageCacheEvictResponse(
+        deleted=deleted,
+        remaining_pages=totals["pages"],
+        remaining_bytes=totals["bytes"],
     )
 
 
 @router.post("/split-scenes/")
-async def split_scenes_from_pdf(
+def split_scenes_from_pdf(
     file: UploadFile = File(...),
     start_page: int = Form(1),
     end_page: int = Form(999),
+    segmentation_mode: str = Form("valleys"),
+    length_unit: str = Form("sentences"),
+    min_scene_length: Optional[int] = Form(None),
+    max_scene_length: Optional[int] = Form(None),
+    target_scene_count: Optional[int] = Form(None),
     session: Session = Depends(get_db)
 ):
     if not file.filename.endswith('.pdf'):
         raise HTTPException(status_code=400, detail="Only PDF files are supported")
     
-    pdf_bytes = await file.read()
+    try:
+        segmentation = SegmentationOptions(
+            mode=segmentation_mode,
+            length_unit=length_unit,
+            min_scene_length=min_scene_length,
+            max_scene_length=max_scene_length,
+            target_scene_count=target_scene_count,
+        )
+    except ValidationError as e:
+        raise HTTPException(status_code=400, detail=e.errors(include_url=False, include_context=False))
+    
+    content_hash, storage_key, file_size = store_pdf_upload(file.file)
     
     doc_repo = DocumentRepository(session)
     document = doc_repo.create(
         filename=file.filename,
-        file_size=len(pdf_bytes),
-        mime_type=file.content_type or "application/pdf"
+        file_size=file_size,
+        mime_type=file.content_type or "application/pdf",
+        content_hash=content_hash,
+        storage_key=storage_key
     )
     
     job_repo = ProcessingJobRepository(session)
     job = job_repo.create(
         document_id=str(document.id),
         start_page=start_page,
-        end_page=end_page
+        end_page=end_page,
+        segmentation_options=segmentation.model_dump(mode="json")
     )
     
-    task = extract_text_task.delay(str(job.id), pdf_bytes, start_page, end_page)
+    # by name, so the API never imports the task modules and the ML stack behind them
+    task = celery_app.send_task("extract_text_task", args=[str(job.id), storage_key, start_page, end_page])
     job_repo.update_celery_task_id(str(job.id), task.id)
     
     return {
@@ -109,8 +291,23 @@ async def split_scenes_from_pdf(
     }
 
 
+def _job_status_payload(job) -> dict:
+    def _normalize_step(raw):
+        return raw.value if hasattr(raw, "value") else raw
+    
+    return {
+        "job_id": str(job.id),
+        "status": normalize_status(job.status),
+        "current_step": _normalize_step(job.current_step),
+        "error_message": job.error_message,
+        "started_at": job.started_at,
+        "completed_at": job.completed_at,
+        "processing_time": job.processing_time
+    }
+
+
 @router.get("/jobs/{job_id}/status")
-async def get_job_status(
+def get_job_status(
     job_id: str,
     session: Session = Depends(get_db)
 ):
@@ -120,32 +317,161 @@ async def get_job_status(
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     
-    def _normalize_status(raw):
-        if hasattr(raw, "value"):
-            return raw.value
-        if isinstance(raw, str) and raw.startswith("ProcessingStatus."):
-            name = raw.split(".", 1)[1]
-            if name in ProcessingStatus.__members__:
-                return ProcessingStatus[name].value
-        return raw
+    return _job_status_payload(job)
 
-    def _normalize_step(raw):
-        return raw.value if hasattr(raw, "value") else raw
-    
-    return {
-        "job_id": job_id,
-        "status": _normalize_status(job.status),
-        "current_step": _normalize_step(job.current_step),
-        "error_message": job.error_message,
-        "started_at": job.started_at,
-        "completed_at": job.completed_at,
-        "processing_time": job.processing_time
-    }
+
+JOB_EVENTS_HEARTBEAT_SECONDS = float(os.getenv("JOB_EVENTS_HEARTBEAT_SECONDS", "15"))
+JOB_EVENTS_RETRY_MS = int(os.getenv("JOB_EVENTS_RETRY_MS", "3000"))
+# the stream ends once the job can no longer change; a task that will be retried
+# puts its job back to pending, so FAILED means the retries are exhausted
+JOB_EVENTS_FINAL_STATUSES = (
+    ProcessingStatus.APPROVED.value,
+    ProcessingStatus.COMPLETED.value,
+    ProcessingStatus.FAILED.value,
+    ProcessingStatus.CANCELLED.value,
+)
+
+
+JOB_EVENTS_MAX_JOBS = int(os.getenv("JOB_EVENTS_MAX_JOBS", "100"))
+
+
+def _job_snapshot_payload(job) -> dict:
+    snapshot = _job_status_payload(job)
+    snapshot["revision"] = job.revision
+    if job.shards_total:
+        snapshot["progress"] = {
+            "stage": "shards",
+            "done": len(job.shards_completed or []),
+            "total": job.shards_total,
+        }
+    return jsonable_encoder(snapshot)
+
+
+def _job_snapshots(job_ids: List[str]) -> dict:
+    session = get_db_session()
+    try:
+        return {str(job.id): _job_snapshot_payload(job) for job in ProcessingJobRepository(session).get_by_ids(job_ids)}
+    finally:
+        session.close()
+
+
+def _sse(event_type: str, data: dict) -> str:
+    return f"event: {event_type}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+async def _job_events_response(job_ids: List[str]) -> StreamingResponse:
+    hub = get_job_event_hub()
+    # subscribed before the snapshots, so nothing committed after them is missed
+    queue = hub.subscribe(job_ids)
+    try:
+        snapshots = await run_in_threadpool(_job_snapshots, job_ids)
+    except Exception:
+        hub.unsubscribe(job_ids, queue)
+        raise
+    if not snapshots:
+        hub.unsubscribe(job_ids, queue)
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    async def events():
+        watching = set()
+        try:
+            yield f"retry: {JOB_EVENTS_RETRY_MS}\n\n"
+            current = snapshots
+            while True:
+                if current is not None:
+                    # unknown jobs and jobs that can no longer change are dropped from the stream
+                    watching = set()
+                    for job_id, snapshot in current.items():
+                        yield _sse("snapshot", snapshot)
+                        if snapshot["status"] not in JOB_EVENTS_FINAL_STATUSES:
+                            watching.add(job_id)
+                    current = None
+                if not watching:
+                    break
+
+                try:
+                    event = await asyncio.wait_for(queue.get(), JOB_EVENTS_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+
+                event_type = event.pop("type", "message")
+                if event_type == "resync":
+                    current = await run_in_threadpool(_job_snapshots, sorted(watching))
+                    continue
+                if event.get("job_id") not in watching:
+                    continue
+                yield _sse(event_type, event)
+                if event_type == "status" and event.get("status") in JOB_EVENTS_FINAL_STATUSES:
+                    watching.discard(event["job_id"])
+        finally:
+            hub.unsubscribe(job_ids, queue)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+# async, unlike the other handlers: a stream lives as long as the tab and would pin
+# a threadpool thread for all of it; the only blocking call goes to the threadpool
+@router.get("/jobs/events")
+async def stream_jobs_events(ids: str = Query(..., description="ID задач через запятую")):
+    """One stream for every job a page watches: browsers allow only six HTTP/1.1 connections per host."""
+    try:
+        job_ids = list(dict.fromkeys(str(UUID(value.strip())) for value in ids.split(",") if value.strip()))
+    except ValueError:
+        raise HTTPException(status_code=422, detail="ids must be comma-separated job UUIDs")
+    if not job_ids:
+        raise HTTPException(status_code=422, detail="ids must name at least one job")
+    if len(job_ids) > JOB_EVENTS_MAX_JOBS:
+        raise HTTPException(status_code=422, detail=f"At most {JOB_EVENTS_MAX_JOBS} jobs per stream")
+    return await _job_events_response(job_ids)
+
+
+@router.get("/jobs/{job_id}/events")
+async def stream_job_events(job_id: UUID):
+    return await _job_events_response([str(job_id)])
+
+
+SCENE_LIST_FIELDS = (
+    "scene_id",
+    "scene_number",
+    "scene_text",
+    "sentence_count",
+    "word_count",
+    "char_count",
+    "start_sentence_idx",
+    "end_sentence_idx",
+    "boundary_confidence",
+    "start_char",
+    "end_char",
+)
+SCENES_PAGE_MAX_LIMIT = int(os.getenv("SCENES_PAGE_MAX_LIMIT", "500"))
+
+
+def _scene_list_etag(job, status_value: str, *params) -> str:
+    key = ":".join(str(part) for part in (job.id, job.revision, status_value, *params))
+    return f'"r{job.revision}-{hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]}"'
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
 
 
 @router.get("/jobs/{job_id}/scenes")
-async def get_job_scenes(
+def get_job_scenes(
     job_id: str,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, description="Размер страницы; без него возвращаются все сцены"),
+    cursor: Optional[str] = Query(None, description="next_cursor предыдущей страницы"),
+    fields: Optional[str] = Query(None, description=f"Поля через запятую: {', '.join(SCENE_LIST_FIELDS)}"),
+    q: Optional[str] = Query(None, description="Полнотекстовый поиск по тексту сцен"),
+    if_none_match: Optional[str] = Header(None),
     session: Session = Depends(get_db)
 ):
     job_repo = ProcessingJobRepository(session)
@@ -154,49 +480,63 @@ async def get_job_scenes(
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     
-    def _normalize_status_value(raw):
-        if hasattr(raw, "value"):
-            return raw.value
-        if isinstance(raw, str) and raw.startswith("ProcessingStatus."):
-            name = raw.split(".", 1)[1]
-            if name in ProcessingStatus.__members__:
-                return ProcessingStatus[name].value
-        return raw
-
-    status_value = _normalize_status_value(job.status)
-    allowed_statuses = {
-        ProcessingStatus.COMPLETED.value,
-        ProcessingStatus.APPROVED.value,
-        ProcessingStatus.READY_FOR_REVIEW.value,
-        "completed",
-        "approved",
-        "ready-for-review",
-    }
-    if status_value not in allowed_statuses:
+    status_value = normalize_status(job.status)
+    if status_value != ProcessingStatus.READY_FOR_REVIEW.value and status_value not in FINALIZED_STATUSES:
         raise HTTPException(status_code=400, detail="Scenes are not ready yet")
-    
-    scenes = session.query(Scene).filter(
-        Scene.processing_job_id == job_id
-    ).order_by(Scene.scene_number).all()
-    
+
+    if limit is not None:
+        limit = min(limit, SCENES_PAGE_MAX_LIMIT)
+    selected = parse_fields(fields, SCENE_LIST_FIELDS, always=("scene_number",))
+    after = decode_cursor(cursor, ("scene_number",))
+    search = q.strip() if q and q.strip() else None
+
+    # the listing only changes with the job revision, an unchanged reload costs one primary key lookup
+    etag = _scene_list_etag(job, status_value, limit, cursor, ",".join(sorted(selected)), search)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+
+    # the primary key behind scene_id is always loaded
+    columns = {"processing_job_id"} | (selected - {"scene_text", "scene_id"})
+    if "scene_text" in selected:
+        columns |= {"scene_text", "start_char", "end_char"}
+
+    scene_repo = SceneRepository(session)
+    scenes = scene_repo.list_page(
+        job.id,
+        limit=limit + 1 if limit is not None else None,
+        after_scene_number=int(after["scene_number"]) if after else None,
+        search=search,
+        columns=sorted(columns),
+    )
+    next_cursor = None
+    if limit is not None and len(scenes) > limit:
+        scenes = scenes[:limit]
+        next_cursor = encode_cursor({"scene_number": scenes[-1].scene_number})
+
+    def _item(scene: Scene) -> dict:
+        item = {}
+        for field in SCENE_LIST_FIELDS:
+            if field in selected:
+                if field == "scene_text":
+                    item[field] = scene.text
+                elif field == "scene_id":
+                    item[field] = scene.id
+                else:
+                    item[field] = getattr(scene, field)
+        return item
+
     return {
         "job_id": job_id,
-        "scenes_count": len(scenes),
-        "scenes": [
-            {
-                "scene_number": scene.scene_number,
-                "scene_text": scene.scene_text,
-                "sentence_count": scene.sentence_count,
-                "word_count": scene.word_count,
-                "char_count": scene.char_count,
-                "boundary_confidence": scene.boundary_confidence
-            }
-            for scene in scenes
-        ]
+        "revision": job.revision,
+        "scenes_count": scene_repo.count(job.id, search) if limit is not None or search else len(scenes),
+        "next_cursor": next_cursor,
+        "scenes": [_item(scene) for scene in scenes]
     }
 
 @router.get("/jobs/{job_id}/scenes/{scene_number}/sentences", response_model=SceneSentencesResponse)
-async def get_scene_sentences(
+def get_scene_sentences(
     job_id: str,
     scene_number: int,
     session: Session = Depends(get_db)
@@ -220,7 +560,7 @@ async def get_scene_sentences(
 
 
 @router.patch("/jobs/{job_id}/scenes", response_model=ScenePatchResponse)
-async def patch_job_scenes(
+def patch_job_scenes(
     job_id: str,
     payload: ScenePatchRequest,
     session: Session = Depends(get_db)
@@ -231,30 +571,22 @@ async def patch_job_scenes(
         updated_scenes = service.update_scenes(job_id, [scene.model_dump() for scene in payload.scenes])
     except JobNotEditableError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    except ScenePatchValidationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except SceneNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
 
     return ScenePatchResponse(
         job_id=job_id,
         scenes=[
-            SceneResponse(
-                scene_id=scene.id,
-                scene_number=scene.scene_number,
-                scene_text=scene.scene_text,
-                sentence_count=scene.sentence_count,
-                word_count=scene.word_count,
-                char_count=scene.char_count,
-                start_sentence_idx=scene.start_sentence_idx,
-                end_sentence_idx=scene.end_sentence_idx,
-                boundary_confidence=scene.boundary_confidence,
-            )
+            _scene_response(scene)
             for scene in updated_scenes
         ]
     )
 
 
 @router.post("/jobs/{job_id}/scenes/merge", response_model=SceneMergeResponse)
-async def merge_job_scenes(
+def merge_job_scenes(
     job_id: str,
     payload: SceneMergeRequest,
     session: Session = Depends(get_db)
@@ -262,7 +594,7 @@ async def merge_job_scenes(
     service = SceneMergeService(session)
 
     try:
-        scenes = service.merge_scenes(job_id, payload.scene_numbers)
+        changes = service.merge_scenes(job_id, payload.scene_numbers)
     except SceneMergeValidationError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except SceneMergeJobNotEditableError as e:
@@ -272,26 +604,131 @@ async def merge_job_scenes(
     except SceneMergeSceneNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
 
-    return SceneMergeResponse(
+    return _changes_response(SceneMergeResponse, session, job_id, changes)
+
+
+@router.post("/jobs/{job_id}/scenes/batch", response_model=SceneBatchResponse)
+def batch_edit_job_scenes(
+    job_id: str,
+    payload: SceneBatchRequest,
+    session: Session = Depends(get_db)
+):
+    service = SceneBatchService(session)
+
+    try:
+        changes = service.apply(job_id, [operation.model_dump() for operation in payload.operations])
+    except SceneBatchJobNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except SceneBatchSceneNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except SceneBatchJobNotEditableError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except SceneBatchOperationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return _changes_response(SceneBatchResponse, session, job_id, changes)
+
+
+def _scene_response(scene: Scene) -> SceneResponse:
+    return SceneResponse(
+        scene_id=scene.id,
+        scene_number=scene.scene_number,
+        scene_text=scene.text,
+        sentence_count=scene.sentence_count,
+        word_count=scene.word_count,
+        char_count=scene.char_count,
+        start_sentence_idx=scene.start_sentence_idx,
+        end_sentence_idx=scene.end_sentence_idx,
+        boundary_confidence=scene.boundary_confidence,
+        start_char=scene.start_char,
+        end_char=scene.end_char,
+    )
+
+
+def _changes_response(response_class, session: Session, job_id: str, changes):
+    job = ProcessingJobRepository(session).get_by_id(job_id)
+    return response_class(
         job_id=job_id,
-        scenes=[
-            SceneResponse(
-                scene_id=scene.id,
-                scene_number=scene.scene_number,
-                scene_text=scene.scene_text,
-                sentence_count=scene.sentence_count,
-                word_count=scene.word_count,
-                char_count=scene.char_count,
-                start_sentence_idx=scene.start_sentence_idx,
-                end_sentence_idx=scene.end_sentence_idx,
-                boundary_confidence=scene.boundary_confidence,
+        revision=job.revision,
+        scenes_count=SceneRepository(session).count(job.id),
+        scenes=[_scene_response(scene) for scene in changes.changed_scenes(session)],
+        removed_scene_ids=changes.removed_ids,
+        shifts=changes.shifts,
+    )
+
+
+@router.post("/jobs/{job_id}/scenes/resegment", response_model=SceneResegmentTask, status_code=202)
+def resegment_job_scenes(
+    job_id: UUID,
+    payload: SceneResegmentRequest
+):
+    # the proposal is picked up through GET .../resegment/{task_id} or the "resegment" job event;
+    # a task no worker started within the timeout is dropped by the broker and its marker expires.
+    # The marker is stored before sending so that it can never overwrite the worker's own.
+    task_id = str(uuid4())
+    put_json(
+        resegment_result_key(str(job_id), task_id),
+        {"status": "pending", "expires_at": time.time() + RESEGMENT_TIMEOUT_SECONDS + RESEGMENT_START_GRACE_SECONDS},
+    )
+    celery_app.send_task(
+        "resegment_scenes_task",
+        args=[str(job_id), payload.scene_number, payload.window],
+        task_id=task_id,
+        expires=RESEGMENT_TIMEOUT_SECONDS,
+    )
+    return SceneResegmentTask(job_id=job_id, task_id=task_id, status="pending")
+
+
+@router.get(
+    "/jobs/{job_id}/scenes/resegment/{task_id}",
+    response_model=SceneResegmentResponse,
+    responses={202: {"model": SceneResegmentTask}},
+)
+def get_resegment_result(job_id: UUID, task_id: str):
+    """The proposal once the worker stored it, 202 while it is pending; it is handed out once.
+
+    504 when the task was dropped unstarted or its worker never finished it,
+    410 when the proposal was handed out, cancelled or evicted already.
+    """
+    key = resegment_result_key(str(job_id), task_id)
+    storage = get_blob_storage()
+    if not storage.exists(key):
+        raise HTTPException(status_code=410, detail="Re-segmentation result is gone")
+
+    result = get_json(key)
+    if result.get("status") in {"pending", "running"}:
+        if time.time() < result["expires_at"]:
+            return JSONResponse(
+                status_code=202,
+                content=SceneResegmentTask(job_id=job_id, task_id=task_id, status=result["status"]).model_dump(mode="json"),
             )
-            for scene in scenes
-        ],
+        storage.delete(key)
+        raise HTTPException(status_code=504, detail="Re-segmentation did not finish in time")
+
+    storage.delete(key)
+    if result.get("status") == "error":
+        raise HTTPException(status_code=result["status_code"], detail=result["detail"])
+
+    return SceneResegmentResponse(
+        job_id=result["job_id"],
+        first_scene_number=result["first_scene_number"],
+        last_scene_number=result["last_scene_number"],
+        scenes=result["scenes"],
     )
 
+
+@router.delete("/jobs/{job_id}/scenes/resegment/{task_id}", status_code=204)
+def cancel_resegment(job_id: UUID, task_id: str):
+    """Revokes a proposal the client no longer waits for and drops its result if it was stored."""
+    # a running proposal is not terminated, that would take the warm model down with its worker process;
+    # the soft time limit of the task bounds it, and its late result is evicted with the unfetched ones
+    celery_app.control.revoke(task_id)
+    get_blob_storage().delete(resegment_result_key(str(job_id), task_id))
+    return Response(status_code=204)
+
+
 @router.post("/jobs/{job_id}/approve")
-async def approve_job(
+def approve_job(
     job_id: str,
     session: Session = Depends(get_db)
 ):
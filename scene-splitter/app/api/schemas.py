@@ -1,12 +1,44 @@
-from typing import List, Optional
+from typing import Annotated, List, Literal, Optional, Union
 from uuid import UUID
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
+
+from app.models.enums import SegmentationMode, SegmentLengthUnit
+
+
+# --- upload ---
+class SegmentationOptions(BaseModel):
+    mode: SegmentationMode = SegmentationMode.VALLEYS
+    length_unit: SegmentLengthUnit = SegmentLengthUnit.SENTENCES
+    min_scene_length: Optional[int] = Field(None, ge=1, description="Минимальная длина сцены")
+    max_scene_length: Optional[int] = Field(None, ge=1, description="Максимальная длина сцены")
+    target_scene_count: Optional[int] = Field(None, ge=1, description="Желаемое число сцен")
+
+    @model_validator(mode="after")
+    def check_lengths(self):
+        if (
+            self.min_scene_length is not None
+            and self.max_scene_length is not None
+            and self.min_scene_length > self.max_scene_length
+        ):
+            raise ValueError("min_scene_length cannot be greater than max_scene_length")
+        return self
 
 
 class ScenePatchPayload(BaseModel):
     scene_number: int = Field(..., ge=1, description="Номер сцены для обновления")
-    scene_text: str = Field(..., description="Новый текст сцены")
+    scene_text: Optional[str] = Field(None, description="Новый текст сцены")
+    start_char: Optional[int] = Field(None, ge=0, description="Новое начало сцены в тексте задачи")
+    end_char: Optional[int] = Field(None, ge=1, description="Новый конец сцены в тексте задачи (не включая)")
+
+    @model_validator(mode="after")
+    def check_text_or_span(self):
+        has_span = self.start_char is not None or self.end_char is not None
+        if self.scene_text is None and not has_span:
+            raise ValueError("scene_text or start_char/end_char is required")
+        if self.scene_text is not None and has_span:
+            raise ValueError("scene_text cannot be combined with start_char/end_char")
+        return self
 
 
 class ScenePatchRequest(BaseModel):
@@ -23,6 +55,8 @@ class SceneResponse(BaseModel):
     start_sentence_idx: Optional[int]
     end_sentence_idx: Optional[int]
     boundary_confidence: Optional[float]
+    start_char: Optional[int] = None
+    end_char: Optional[int] = None
 
 
 class ScenePatchResponse(BaseModel):
@@ -37,9 +71,96 @@ class SceneMergeRequest(BaseModel):
     )
 
 
-class SceneMergeResponse(BaseModel):
+class SceneShift(BaseModel):
+    after_scene_number: int = Field(..., description="Сцены с номером больше этого сдвинулись")
+    shift: int
+
+
+class SceneChangesResponse(BaseModel):
+    """Только изменённые сцены; остальные лишь перенумерованы согласно shifts (по порядку)."""
+
     job_id: UUID
-    scenes: List[SceneResponse]
+    revision: int
+    scenes_count: int
+    scenes: List[SceneResponse] = Field(..., description="Изменённые и новые сцены в итоговом состоянии")
+    removed_scene_ids: List[UUID] = []
+    shifts: List[SceneShift] = []
+
+
+class SceneMergeResponse(SceneChangesResponse):
+    pass
+
+
+class SceneMergeOperation(BaseModel):
+    op: Literal["merge"]
+    scene_numbers: List[int] = Field(..., description="Номера сцен для объединения (минимум 2, только подряд)")
+
+
+class SceneSplitOperation(BaseModel):
+    op: Literal["split"]
+    scene_number: int = Field(..., ge=1)
+    at_sentence: int = Field(..., ge=2, description="Номер предложения (с 1), с которого начинается новая сцена")
+
+
+class SceneMoveBoundaryOperation(BaseModel):
+    op: Literal["move_boundary"]
+    scene_number: int = Field(..., ge=1, description="Сцена, за которой проходит граница")
+    sentences: int = Field(
+        ...,
+        description="На сколько предложений сдвинуть границу: >0 — начало следующей сцены переходит в эту, <0 — конец этой сцены переходит в следующую",
+    )
+
+
+class SceneUpdateOperation(BaseModel):
+    op: Literal["update"]
+    scenes: List[ScenePatchPayload] = Field(..., min_length=1)
+
+
+SceneOperation = Annotated[
+    Union[SceneMergeOperation, SceneSplitOperation, SceneMoveBoundaryOperation, SceneUpdateOperation],
+    Field(discriminator="op"),
+]
+
+
+class SceneBatchRequest(BaseModel):
+    operations: List[SceneOperation] = Field(
+        ...,
+        min_length=1,
+        description="Операции применяются по порядку в одной транзакции; номера сцен — после предыдущих операций",
+    )
+
+
+class SceneBatchResponse(SceneChangesResponse):
+    pass
+
+
+class SceneResegmentRequest(BaseModel):
+    scene_number: int = Field(..., ge=1, description="Сцена, вокруг которой пересчитываются границы")
+    window: int = Field(1, ge=0, le=10, description="Сколько соседних сцен захватить с каждой стороны")
+
+
+class SceneResegmentTask(BaseModel):
+    job_id: UUID
+    task_id: str
+    status: str
+
+
+class ProposedScene(BaseModel):
+    scene_number: int
+    scene_text: str
+    sentence_count: int
+    word_count: int
+    char_count: int
+    start_sentence_idx: Optional[int]
+    end_sentence_idx: Optional[int]
+    boundary_confidence: Optional[float]
+
+
+class SceneResegmentResponse(BaseModel):
+    job_id: UUID
+    first_scene_number: int
+    last_scene_number: int
+    scenes: List[ProposedScene]
 
 
 # --- documents listing ---
@@ -50,16 +171,19 @@ class ProcessingJobRef(BaseModel):
 
 
 class DocumentItem(BaseModel):
+    # every field but id may be left out through ?fields=
     id: UUID
-    filename: str
-    file_size: Optional[int]
-    mime_type: Optional[str]
-    created_at: Optional[str]
-    processing_jobs: List[ProcessingJobRef]
+    filename: Optional[str] = None
+    file_size: Optional[int] = None
+    mime_type: Optional[str] = None
+    created_at: Optional[str] = None
+    processing_jobs: Optional[List[ProcessingJobRef]] = None
 
 
 class DocumentsResponse(BaseModel):
     documents: List[DocumentItem]
+    next_cursor: Optional[str] = Field(None, description="Курсор следующей страницы; null на последней")
+    total_estimate: Optional[int] = Field(None, description="Оценка общего числа документов")
 
 
 # --- scene sentences ---
@@ -72,3 +196,27 @@ class SceneSentencesResponse(BaseModel):
     job_id: UUID
     scene_number: int
     sentences: List[SceneSentence]
+
+
+# --- page text cache ---
+class PageCacheEntry(BaseModel):
+    laparams_fingerprint: str
+    pages: int
+    bytes: int
+    page_numbers: List[int]
+    created_at: Optional[str]
+    last_accessed_at: Optional[str]
+
+
+class DocumentPageCacheResponse(BaseModel):
+    document_id: UUID
+    content_hash: Optional[str]
+    page_count: Optional[int]
+    current_fingerprint: str
+    entries: List[PageCacheEntry]
+
+
+class PageCacheEvictResponse(BaseModel):
+    deleted: int
+    remaining_pages: int
+    remaining_bytes: int
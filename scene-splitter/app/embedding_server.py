@@ -0,0 +1,83 @@
+import os
+from contextlib import asynccontextmanager
+from typing import List, Optional
+
+import numpy as np
+from fastapi import FastAPI, HTTPException, Response
+from pydantic import BaseModel, Field
+
+from app.services.embedding_batcher import DynamicBatcher, EmbeddingQueueFullError
+from app.services.model_registry import DEFAULT_MODEL_NAME, get_model_registry
+from app.utils.memory import get_rss_bytes
+
+EMBEDDING_SERVER_MAX_BATCH = int(os.getenv("EMBEDDING_SERVER_MAX_BATCH", "256"))
+EMBEDDING_SERVER_MAX_LATENCY_MS = float(os.getenv("EMBEDDING_SERVER_MAX_LATENCY_MS", "20"))
+EMBEDDING_SERVER_MAX_QUEUE = int(os.getenv("EMBEDDING_SERVER_MAX_QUEUE", "50000"))
+
+
+class EmbedRequest(BaseModel):
+    sentences: List[str] = Field(..., description="Предложения для кодирования")
+    model: Optional[str] = Field(None, description="Имя модели; должно совпадать с моделью сервера")
+
+
+def _encode(sentences: List[str]) -> np.ndarray:
+    model = get_model_registry().get(DEFAULT_MODEL_NAME)
+    return model.encode(sentences, batch_size=EMBEDDING_SERVER_MAX_BATCH, convert_to_numpy=True)
+
+
+batcher = DynamicBatcher(
+    _encode,
+    max_batch_size=EMBEDDING_SERVER_MAX_BATCH,
+    max_latency_ms=EMBEDDING_SERVER_MAX_LATENCY_MS,
+    max_queue_sentences=EMBEDDING_SERVER_MAX_QUEUE,
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    get_model_registry().warmup(DEFAULT_MODEL_NAME)
+    await batcher.start()
+    yield
+    await batcher.stop()
+
+
+app = FastAPI(title="Scene Splitter Embedding Server", lifespan=lifespan)
+
+
+@app.post("/embed")
+async def embed(request: EmbedRequest):
+    if request.model and request.model != DEFAULT_MODEL_NAME:
+        raise HTTPException(status_code=400, detail=f"Server encodes with {DEFAULT_MODEL_NAME}, not {request.model}")
+    if not request.sentences:
+        raise HTTPException(status_code=400, detail="sentences must not be empty")
+
+    try:
+        embeddings = await batcher.submit(request.sentences)
+    except EmbeddingQueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+
+    # raw little-endian float32 rows; JSON floats would cost more than the encoding itself
+    embeddings = np.ascontiguousarray(embeddings, dtype="<f4")
+    return Response(
+        content=embeddings.tobytes(),
+        media_type="application/octet-stream",
+        headers={
+            "X-Embedding-Count": str(embeddings.shape[0]),
+            "X-Embedding-Dim": str(embeddings.shape[1]),
+            "X-Embedding-Model": DEFAULT_MODEL_NAME,
+        },
+    )
+
+
+@app.get("/metrics")
+async def metrics():
+    return {
+        "model": DEFAULT_MODEL_NAME,
+        "rss_bytes": get_rss_bytes(),
+        **batcher.metrics(),
+    }
+
+
+@app.get("/health")
+async def health():
+    return {"status": "ok", "model_loaded": get_model_registry().is_loaded(DEFAULT_MODEL_NAME)}
@@ -37,6 +37,11 @@ class BaseEvent(ABC):
     def get_routing_key(cls) -> str:
         pass
 
+    @classmethod
+    def materialize_payload(cls, payload: Dict[str, Any], session) -> Dict[str, Any]:
+        """Fills in what the stored payload only references, right before publishing."""
+        return payload
+
     def _serialize_value(self, value: Any) -> Any:
         if isinstance(value, UUID):
             return str(value)
@@ -1,3 +1,4 @@
+from typing import Any, Dict, Optional
 from uuid import UUID
 from .base import BaseEvent, event
 
@@ -8,11 +9,13 @@ class SceneSavedEvent(BaseEvent):
         self,
         scene_number: int,
         document_id: UUID,
-        scene_text: str,
+        scene_text: Optional[str],
         scene_id: UUID,
         job_id: UUID,
         word_count: int,
-        char_count: int
+        char_count: int,
+        start_char: Optional[int] = None,
+        end_char: Optional[int] = None
     ):
         super().__init__()
         self.scene_number = scene_number
@@ -22,6 +25,8 @@ class SceneSavedEvent(BaseEvent):
         self.job_id = job_id
         self.word_count = word_count
         self.char_count = char_count
+        self.start_char = start_char
+        self.end_char = end_char
     
     @property
     def event_type(self) -> str:
@@ -52,4 +57,19 @@ class SceneSavedEvent(BaseEvent):
             'job_id': self.job_id,
             'word_count': self.word_count,
             'char_count': self.char_count,
+            'start_char': self.start_char,
+            'end_char': self.end_char,
         }
+
+    @classmethod
+    def materialize_payload(cls, payload: Dict[str, Any], session) -> Dict[str, Any]:
+        # span-only scenes keep the outbox row small, consumers still receive scene_text
+        if payload.get('scene_text') is not None:
+            return payload
+
+        from ..models.job_text import JobText
+
+        job_text = session.get(JobText, UUID(payload['job_id']))
+        if job_text is None:
+            raise ValueError(f"Job text for job {payload['job_id']} not found")
+        return {**payload, 'scene_text': job_text.slice(payload['start_char'], payload['end_char'])}
@@ -1,9 +1,47 @@
+import time
+
+_IMPORT_STARTED = time.perf_counter()
+
+import logging
+import os
+import sys
+from contextlib import asynccontextmanager
+
+from anyio import to_thread
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.routes import router as api_router
+from app.services.job_event_hub import get_job_event_hub
+from app.utils.database import DB_MAX_OVERFLOW, DB_POOL_SIZE
+from app.utils.memory import get_peak_rss_bytes, get_rss_bytes
+
+logger = logging.getLogger(__name__)
+
+# modules the API must not import; they belong to the Celery workers
+HEAVY_MODULES = ("torch", "sentence_transformers", "sklearn", "scipy", "nltk", "numpy", "pdfminer", "onnxruntime")
+# threads for the sync route handlers (anyio's default is 40)
+API_THREADPOOL_SIZE = int(os.getenv("API_THREADPOOL_SIZE", "40"))
 
-app = FastAPI(title="Scene Splitter Service")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    to_thread.current_default_thread_limiter().total_tokens = API_THREADPOOL_SIZE
+    if API_THREADPOOL_SIZE > DB_POOL_SIZE + DB_MAX_OVERFLOW:
+        # not clamped: a session takes a connection only at its first query, so uploads streaming to
+        # blob storage and the resegment endpoints run on the extra threads without one
+        logger.warning(
+            f"API_THREADPOOL_SIZE={API_THREADPOOL_SIZE} exceeds DB_POOL_SIZE + DB_MAX_OVERFLOW="
+            f"{DB_POOL_SIZE + DB_MAX_OVERFLOW}; under load the extra handlers wait up to "
+            f"DB_POOL_TIMEOUT_SECONDS for a connection and then fail"
+        )
+    app.state.startup_seconds = round(time.perf_counter() - _IMPORT_STARTED, 3)
+    app.state.startup_rss_bytes = get_rss_bytes()
+    yield
+    get_job_event_hub().stop()
+
+
+app = FastAPI(title="Scene Splitter Service", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -14,3 +52,18 @@ app.add_middleware(
 )
 
 app.include_router(api_router, prefix="/api")
+
+
+@app.get("/health")
+async def health():
+    return {
+        "status": "ok",
+        "startup_seconds": getattr(app.state, "startup_seconds", None),
+        "startup_rss_bytes": getattr(app.state, "startup_rss_bytes", None),
+        "rss_bytes": get_rss_bytes(),
+        "peak_rss_bytes": get_peak_rss_bytes(),
+        "threadpool_size": API_THREADPOOL_SIZE,
+        "threadpool_busy": to_thread.current_default_thread_limiter().borrowed_tokens,
+        "job_event_streams": get_job_event_hub().subscriber_count(),
+        "heavy_modules_loaded": [name for name in HEAVY_MODULES if name in sys.modules],
+    }
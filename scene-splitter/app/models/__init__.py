@@ -2,10 +2,16 @@ from .document import Document
 from .processing_job import ProcessingJob
 from .scene import Scene
 from .outbox_event import OutboxEvent
+from .sentence_embedding import SentenceEmbedding
+from .extracted_page import ExtractedPage
+from .job_text import JobText
 
 __all__ = [
     "Document", 
     "ProcessingJob",
     "Scene",
     "OutboxEvent",
+    "SentenceEmbedding",
+    "ExtractedPage",
+    "JobText",
 ]
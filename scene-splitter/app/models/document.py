@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, DateTime
+from sqlalchemy import Column, String, Integer, DateTime, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -9,12 +9,21 @@ from ..utils.database import Base
 
 class Document(Base):
     __tablename__ = "documents"
+    __table_args__ = (
+        # keyset pagination of the document list
+        Index("ix_documents_created_at_id", "created_at", "id"),
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     filename = Column(String(255), nullable=False)
     file_size = Column(Integer)
     mime_type = Column(String(100))
-    created_at = Column(DateTime, default=func.now())
+    content_hash = Column(String(64), index=True)
+    storage_key = Column(String(512))
+    page_count = Column(Integer)
+    created_at = Column(DateTime, default=func.now(), nullable=False)
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
     
-    processing_jobs = relationship("ProcessingJob", back_populates="document")
+    processing_jobs = relationship(
+        "ProcessingJob", back_populates="document", order_by="ProcessingJob.created_at.desc()"
+    )
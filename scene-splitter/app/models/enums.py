@@ -15,3 +15,11 @@ class ProcessingStep(str, Enum):
     TEXT_EXTRACTION = "text_extraction"
     SCENE_SPLITTING = "scene_splitting"
     FINALIZATION = "finalization"
+
+class SegmentationMode(str, Enum):
+    VALLEYS = "valleys"
+    OPTIMAL = "optimal"
+
+class SegmentLengthUnit(str, Enum):
+    SENTENCES = "sentences"
+    WORDS = "words"
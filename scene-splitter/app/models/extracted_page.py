@@ -0,0 +1,19 @@
+from sqlalchemy import Column, String, Integer, DateTime, Text, Float
+from sqlalchemy.sql import func
+
+from ..utils.database import Base
+
+
+class ExtractedPage(Base):
+    __tablename__ = "extracted_pages"
+    
+    content_hash = Column(String(64), primary_key=True)
+    page_index = Column(Integer, primary_key=True)
+    laparams_fingerprint = Column(String(40), primary_key=True)
+    
+    text = Column(Text, nullable=False)
+    byte_size = Column(Integer, nullable=False, default=0)
+    extraction_seconds = Column(Float)
+    
+    created_at = Column(DateTime, default=func.now(), nullable=False)
+    last_accessed_at = Column(DateTime, default=func.now(), nullable=False, index=True)
@@ -0,0 +1,38 @@
+import zlib
+
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, LargeBinary
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+
+from ..utils.database import Base
+
+
+class JobText(Base):
+    """Normalized text of a job, stored once; scenes point into it with character spans."""
+
+    __tablename__ = "job_texts"
+
+    processing_job_id = Column(
+        UUID(as_uuid=True), ForeignKey("processing_jobs.id", ondelete="CASCADE"), primary_key=True
+    )
+
+    compressed_text = Column(LargeBinary, nullable=False)
+    char_count = Column(Integer, nullable=False)
+    byte_size = Column(Integer, nullable=False)
+
+    created_at = Column(DateTime, default=func.now(), nullable=False)
+
+    processing_job = relationship("ProcessingJob", back_populates="job_text")
+
+    @property
+    def text(self) -> str:
+        # decompressed once per loaded instance, the session identity map shares it between scenes
+        cached = self.__dict__.get("_text")
+        if cached is None:
+            cached = zlib.decompress(self.compressed_text).decode("utf-8")
+            self.__dict__["_text"] = cached
+        return cached
+
+    def slice(self, start: int, end: int) -> str:
+        return self.text[start:end]
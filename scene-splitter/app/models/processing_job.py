@@ -1,5 +1,5 @@
 from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Text
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import UUID, JSONB, ARRAY
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import uuid
@@ -11,12 +11,24 @@ class ProcessingJob(Base):
     __tablename__ = "processing_jobs"
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    document_id = Column(UUID(as_uuid=True), ForeignKey("documents.id"), nullable=False)
+    document_id = Column(UUID(as_uuid=True), ForeignKey("documents.id"), nullable=False, index=True)
     celery_task_id = Column(String(255), unique=True, index=True)
     
     start_page = Column(Integer, default=1)
     end_page = Column(Integer, default=999)
     
+    segmentation_options = Column(JSONB)
+    
+    shards_total = Column(Integer)
+    shards_completed = Column(ARRAY(Integer))
+    
+    # PDF extraction fanned out over page ranges
+    page_shards_total = Column(Integer)
+    page_shards_completed = Column(ARRAY(Integer))
+    
+    # bumped by every change to the scenes, backs the ETag of the scene listing
+    revision = Column(Integer, nullable=False, default=0, server_default="0")
+    
     status = Column(String(50), default="pending", index=True)
     current_step = Column(String(50))
     
@@ -29,6 +41,7 @@ class ProcessingJob(Base):
     
     document = relationship("Document", back_populates="processing_jobs")
     scenes = relationship("Scene", back_populates="processing_job")
+    job_text = relationship("JobText", back_populates="processing_job", uselist=False, passive_deletes=True)
     
     @property
     def processing_time(self):
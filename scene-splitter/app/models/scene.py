@@ -1,5 +1,5 @@
-from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Text, Float
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Text, Float, UniqueConstraint, Index
+from sqlalchemy.dialects.postgresql import UUID, JSONB, TSVECTOR
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import uuid
@@ -9,22 +9,45 @@ from ..utils.database import Base
 
 class Scene(Base):
     __tablename__ = "scenes"
+    __table_args__ = (
+        # deferred so renumbering updates inside one transaction may pass through duplicates
+        UniqueConstraint(
+            "processing_job_id", "scene_number",
+            name="uq_scenes_job_scene_number", deferrable=True, initially="DEFERRED"
+        ),
+        Index("ix_scenes_search_vector", "search_vector", postgresql_using="gin"),
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     processing_job_id = Column(UUID(as_uuid=True), ForeignKey("processing_jobs.id"), nullable=False)
     
     scene_number = Column(Integer, nullable=False)
     
-    scene_text = Column(Text, nullable=False)
+    # set only when the scene no longer matches a span of the job text (manual edits, legacy rows)
+    scene_text = Column(Text)
+    start_char = Column(Integer)
+    end_char = Column(Integer)
     sentence_count = Column(Integer, default=0)
     word_count = Column(Integer, default=0)
     char_count = Column(Integer, default=0)
     
     start_sentence_idx = Column(Integer)
     end_sentence_idx = Column(Integer)
+    sentence_offsets = Column(JSONB)
     
     boundary_confidence = Column(Float)
     
+    search_vector = Column(TSVECTOR)
+    
     created_at = Column(DateTime, default=func.now())
     
     processing_job = relationship("ProcessingJob", back_populates="scenes")
+
+    @property
+    def text(self) -> str:
+        if self.scene_text is not None:
+            return self.scene_text
+        job_text = self.processing_job.job_text if self.processing_job is not None else None
+        if job_text is None or self.start_char is None or self.end_char is None:
+            return ""
+        return job_text.slice(self.start_char, self.end_char)
@@ -0,0 +1,18 @@
+from sqlalchemy import Column, String, Integer, DateTime, LargeBinary
+from sqlalchemy.sql import func
+
+from ..utils.database import Base
+
+
+class SentenceEmbedding(Base):
+    __tablename__ = "sentence_embeddings"
+    
+    model_name = Column(String(255), primary_key=True)
+    sentence_hash = Column(String(40), primary_key=True)
+    
+    embedding = Column(LargeBinary, nullable=False)
+    dimensions = Column(Integer, nullable=False)
+    dtype = Column(String(16), nullable=False)
+    
+    created_at = Column(DateTime, default=func.now(), nullable=False)
+    last_used_at = Column(DateTime, default=func.now(), nullable=False, index=True)
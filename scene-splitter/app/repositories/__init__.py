@@ -1,4 +1,6 @@
 from .document_repository import DocumentRepository
 from .processing_job_repository import ProcessingJobRepository
+from .scene_repository import SceneRepository
+from .job_text_repository import JobTextRepository
 
-__all__ = ["DocumentRepository", "ProcessingJobRepository"] 
\ No newline at end of file
+__all__ = ["DocumentRepository", "ProcessingJobRepository", "SceneRepository", "JobTextRepository"] 
\ No newline at end of file
@@ -1,18 +1,30 @@
-from typing import Optional, List
-from sqlalchemy.orm import Session
+from datetime import datetime
+from typing import Iterable, Optional, List
+from sqlalchemy import exists, func, select, text, true, tuple_
+from sqlalchemy.orm import Session, load_only, selectinload
 
 from ..models.document import Document
+from ..models.processing_job import ProcessingJob
 
 
 class DocumentRepository:
     def __init__(self, db: Session):
         self.db = db
     
-    def create(self, filename: str, file_size: Optional[int] = None, mime_type: Optional[str] = None) -> Document:
+    def create(
+        self,
+        filename: str,
+        file_size: Optional[int] = None,
+        mime_type: Optional[str] = None,
+        content_hash: Optional[str] = None,
+        storage_key: Optional[str] = None
+    ) -> Document:
         document = Document(
             filename=filename,
             file_size=file_size,
-            mime_type=mime_type
+            mime_type=mime_type,
+            content_hash=content_hash,
+            storage_key=storage_key
         )
         self.db.add(document)
         self.db.commit()
@@ -22,6 +34,9 @@ class DocumentRepository:
     def get_by_id(self, document_id: str) -> Optional[Document]:
         return self.db.query(Document).filter(Document.id == document_id).first()
     
+    def get_by_content_hash(self, content_hash: str) -> Optional[Document]:
+        return self.db.query(Document).filter(Document.content_hash == content_hash).first()
+    
     def get_by_filename(self, filename: str) -> Optional[Document]:
         return self.db.query(Document).filter(Document.filename == filename).first()
     
@@ -36,4 +51,52 @@ class DocumentRepository:
             self.db.delete(document)
             self.db.commit()
             return True
-        return False 
\ No newline at end of file
+        return False
+
+    def list_page(
+        self,
+        limit: int,
+        after_created_at: Optional[datetime] = None,
+        after_id: Optional[str] = None,
+        job_statuses: Iterable[str] = (),
+        columns: Iterable[str] = (),
+        with_jobs: bool = True
+    ) -> List[Document]:
+        """Newest first, keyset paginated on (created_at, id)."""
+        query = self.db.query(Document).filter(self._status_filter(job_statuses))
+
+        columns = list(columns)
+        if columns:
+            query = query.options(load_only(*(getattr(Document, column) for column in columns)))
+        if with_jobs:
+            # one IN query for the jobs of the whole page instead of one per document
+            query = query.options(selectinload(Document.processing_jobs))
+
+        if after_created_at is not None and after_id is not None:
+            # row comparison walks ix_documents_created_at_id backwards from the cursor
+            query = query.filter(tuple_(Document.created_at, Document.id) < tuple_(after_created_at, after_id))
+
+        return query.order_by(Document.created_at.desc(), Document.id.desc()).limit(limit).all()
+
+    def estimate_count(self, job_statuses: Iterable[str] = ()) -> int:
+        job_statuses = list(job_statuses)
+        if not job_statuses:
+            # planner statistics instead of a full count; -1 until the table has been analyzed
+            estimate = self.db.execute(
+                text("SELECT reltuples::bigint FROM pg_class WHERE oid = 'documents'::regclass")
+            ).scalar()
+            if estimate is not None and estimate >= 0:
+                return int(estimate)
+        return self.db.execute(
+            select(func.count()).select_from(Document).where(self._status_filter(job_statuses))
+        ).scalar_one()
+
+    @staticmethod
+    def _status_filter(job_statuses: Iterable[str]):
+        job_statuses = list(job_statuses)
+        if not job_statuses:
+            return true()
+        return exists().where(
+            ProcessingJob.document_id == Document.id,
+            ProcessingJob.status.in_(job_statuses),
+        )
@@ -0,0 +1,112 @@
+from typing import Dict, List, Optional, Sequence, Tuple
+from datetime import datetime
+from sqlalchemy import String, any_, func, select, delete, update, tuple_
+from sqlalchemy.dialects.postgresql import array, insert
+from sqlalchemy.orm import Session
+
+from ..models.sentence_embedding import SentenceEmbedding
+
+
+class EmbeddingCacheRepository:
+    lookup_chunk_size = 1000
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_many(
+        self, model_name: str, sentence_hashes: Sequence[str], touch_older_than: Optional[datetime] = None
+    ) -> Dict[str, Tuple[bytes, str, int]]:
+        """(embedding, dtype, dimensions) of the cached sentences, in the current transaction; the caller commits.
+
+        Rows last used before touch_older_than get last_used_at bumped, in one UPDATE.
+        """
+        found: Dict[str, Tuple[bytes, str, int]] = {}
+        stale: List[str] = []
+        for chunk in self._chunks(list(sentence_hashes)):
+            rows = self.db.execute(
+                select(
+                    SentenceEmbedding.sentence_hash,
+                    SentenceEmbedding.embedding,
+                    SentenceEmbedding.dtype,
+                    SentenceEmbedding.dimensions,
+                    SentenceEmbedding.last_used_at,
+                ).where(
+                    SentenceEmbedding.model_name == model_name,
+                    SentenceEmbedding.sentence_hash.in_(chunk),
+                )
+            ).all()
+            for row in rows:
+                found[row.sentence_hash] = (bytes(row.embedding), row.dtype, row.dimensions)
+                if touch_older_than is None or row.last_used_at < touch_older_than:
+                    stale.append(row.sentence_hash)
+
+        if stale:
+            self.db.execute(
+                update(SentenceEmbedding)
+                .where(
+                    SentenceEmbedding.model_name == model_name,
+                    SentenceEmbedding.sentence_hash == any_(array(stale, type_=String)),
+                )
+                .values(last_used_at=datetime.utcnow())
+            )
+
+        return found
+
+    def put_many(
+        self, model_name: str, dtype: str, dimensions: int, embeddings: Dict[str, bytes], replace: bool = False
+    ) -> int:
+        """Stores embeddings in the current transaction; the caller commits.
+
+        Existing rows are kept unless replace is set.
+        """
+        rows = [
+            {
+                "model_name": model_name,
+                "sentence_hash": sentence_hash,
+                "embedding": data,
+                "dimensions": dimensions,
+                "dtype": dtype,
+            }
+            for sentence_hash, data in embeddings.items()
+        ]
+        for start in range(0, len(rows), self.lookup_chunk_size):
+            statement = insert(SentenceEmbedding).values(rows[start:start + self.lookup_chunk_size])
+            if replace:
+                statement = statement.on_conflict_do_update(
+                    index_elements=["model_name", "sentence_hash"],
+                    set_={
+                        "embedding": statement.excluded.embedding,
+                        "dimensions": statement.excluded.dimensions,
+                        "dtype": statement.excluded.dtype,
+                        "last_used_at": func.now(),
+                    },
+                )
+            else:
+                statement = statement.on_conflict_do_nothing(index_elements=["model_name", "sentence_hash"])
+            self.db.execute(statement)
+        return len(rows)
+
+    def count(self) -> int:
+        return self.db.execute(select(func.count()).select_from(SentenceEmbedding)).scalar_one()
+
+    def evict_to_size(self, max_entries: int) -> int:
+        excess = self.count() - max_entries
+        if excess <= 0:
+            return 0
+
+        stale = (
+            select(SentenceEmbedding.model_name, SentenceEmbedding.sentence_hash)
+            .order_by(SentenceEmbedding.last_used_at)
+            .limit(excess)
+        )
+        result = self.db.execute(
+            delete(SentenceEmbedding).where(
+                tuple_(SentenceEmbedding.model_name, SentenceEmbedding.sentence_hash).in_(stale)
+            )
+        )
+        self.db.commit()
+        return result.rowcount
+
+    def _chunks(self, items: List[str]):
+        for start in range(0, len(items), self.lookup_chunk_size):
+            yield items[start:start + self.lookup_chunk_size]
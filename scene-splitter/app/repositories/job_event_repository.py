@@ -0,0 +1,22 @@
+import json
+import os
+from typing import Any
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+JOB_EVENTS_CHANNEL = os.getenv("JOB_EVENTS_CHANNEL", "job_events")
+
+
+def job_event_payload(job_id: Any, event_type: str, **data: Any) -> str:
+    # NOTIFY payloads are capped at 8000 bytes, events carry counters and short strings only
+    return json.dumps({"type": event_type, "job_id": str(job_id), **data}, default=str)
+
+
+class JobEventRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def notify(self, job_id: Any, event_type: str, **data: Any) -> None:
+        """Queues a job event in the current transaction; listeners receive it when the caller commits."""
+        self.db.execute(select(func.pg_notify(JOB_EVENTS_CHANNEL, job_event_payload(job_id, event_type, **data))))
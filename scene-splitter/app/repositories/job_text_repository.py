@@ -0,0 +1,25 @@
+from typing import Optional
+from sqlalchemy import delete
+from sqlalchemy.orm import Session
+
+from ..models.job_text import JobText
+
+
+class JobTextRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get(self, job_id: str) -> Optional[JobText]:
+        return self.db.get(JobText, job_id)
+
+    def replace(self, job_id: str, compressed_text: bytes, char_count: int, byte_size: int) -> JobText:
+        """Replaces the text of a job in the current transaction; the caller commits."""
+        self.db.execute(delete(JobText).where(JobText.processing_job_id == job_id))
+        job_text = JobText(
+            processing_job_id=job_id,
+            compressed_text=compressed_text,
+            char_count=char_count,
+            byte_size=byte_size,
+        )
+        self.db.add(job_text)
+        return job_text
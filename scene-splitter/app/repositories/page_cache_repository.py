@@ -0,0 +1,120 @@
+from typing import Dict, List, Optional, Sequence, Tuple
+from datetime import datetime, timedelta
+from sqlalchemy import func, select, delete, update, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from ..models.extracted_page import ExtractedPage
+
+
+class PageCacheRepository:
+    chunk_size = 1000
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_pages(self, content_hash: str, fingerprint: str, page_indexes: Sequence[int]) -> Dict[int, str]:
+        rows = self.db.execute(
+            select(ExtractedPage.page_index, ExtractedPage.text).where(
+                ExtractedPage.content_hash == content_hash,
+                ExtractedPage.laparams_fingerprint == fingerprint,
+                ExtractedPage.page_index.in_(list(page_indexes)),
+            )
+        ).all()
+        found = {row.page_index: row.text for row in rows}
+
+        if found:
+            self.db.execute(
+                update(ExtractedPage)
+                .where(
+                    ExtractedPage.content_hash == content_hash,
+                    ExtractedPage.laparams_fingerprint == fingerprint,
+                    ExtractedPage.page_index.in_(list(found.keys())),
+                )
+                .values(last_accessed_at=datetime.utcnow())
+            )
+            self.db.commit()
+
+        return found
+
+    def put_pages(self, content_hash: str, fingerprint: str, pages: List[Tuple[int, str, float]]) -> int:
+        rows = [
+            {
+                "content_hash": content_hash,
+                "page_index": page_index,
+                "laparams_fingerprint": fingerprint,
+                "text": text,
+                "byte_size": len(text.encode("utf-8")),
+                "extraction_seconds": seconds,
+            }
+            for page_index, text, seconds in pages
+        ]
+        for start in range(0, len(rows), self.chunk_size):
+            self.db.execute(
+                insert(ExtractedPage)
+                .values(rows[start:start + self.chunk_size])
+                .on_conflict_do_nothing(index_elements=["content_hash", "page_index", "laparams_fingerprint"])
+            )
+        self.db.commit()
+        return len(rows)
+
+    def describe(self, content_hash: str) -> List[dict]:
+        rows = self.db.execute(
+            select(
+                ExtractedPage.laparams_fingerprint,
+                func.count().label("pages"),
+                func.coalesce(func.sum(ExtractedPage.byte_size), 0).label("bytes"),
+                func.array_agg(ExtractedPage.page_index).label("page_indexes"),
+                func.min(ExtractedPage.created_at).label("oldest"),
+                func.max(ExtractedPage.last_accessed_at).label("last_accessed_at"),
+            )
+            .where(ExtractedPage.content_hash == content_hash)
+            .group_by(ExtractedPage.laparams_fingerprint)
+        ).all()
+        return [dict(row._mapping) for row in rows]
+
+    def totals(self) -> dict:
+        row = self.db.execute(
+            select(
+                func.count().label("pages"),
+                func.coalesce(func.sum(ExtractedPage.byte_size), 0).label("bytes"),
+            )
+        ).one()
+        return {"pages": row.pages, "bytes": int(row.bytes)}
+
+    def evict(self, older_than_days: Optional[int] = None, max_bytes: Optional[int] = None) -> int:
+        deleted = 0
+
+        if older_than_days is not None:
+            cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+            result = self.db.execute(delete(ExtractedPage).where(ExtractedPage.last_accessed_at < cutoff))
+            deleted += result.rowcount
+
+        if max_bytes is not None:
+            running = (
+                select(
+                    ExtractedPage.content_hash,
+                    ExtractedPage.page_index,
+                    ExtractedPage.laparams_fingerprint,
+                    func.sum(ExtractedPage.byte_size)
+                    .over(order_by=(ExtractedPage.last_accessed_at.desc(), ExtractedPage.page_index))
+                    .label("running_bytes"),
+                )
+                .subquery()
+            )
+            overflow = select(running.c.content_hash, running.c.page_index, running.c.laparams_fingerprint).where(
+                running.c.running_bytes > max_bytes
+            )
+            result = self.db.execute(
+                delete(ExtractedPage).where(
+                    tuple_(
+                        ExtractedPage.content_hash,
+                        ExtractedPage.page_index,
+                        ExtractedPage.laparams_fingerprint,
+                    ).in_(overflow)
+                )
+            )
+            deleted += result.rowcount
+
+        self.db.commit()
+        return deleted
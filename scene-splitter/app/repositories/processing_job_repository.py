@@ -1,31 +1,35 @@
-from typing import Optional, List, Union
+from typing import Optional, List, Union, Dict, Any
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy import any_, desc, func, literal, update
 from datetime import datetime
 import uuid
 from enum import Enum
 
 from ..models.processing_job import ProcessingJob
 from ..models.enums import ProcessingStatus, ProcessingStep
+from .job_event_repository import JobEventRepository
 
 
 class ProcessingJobRepository:
 
     def __init__(self, db: Session):
         self.db = db
+        self.events = JobEventRepository(db)
     
     def create(
         self, 
         document_id: str, 
         start_page: int = 1,
         end_page: int = 999,
-        celery_task_id: Optional[str] = None
+        celery_task_id: Optional[str] = None,
+        segmentation_options: Optional[Dict[str, Any]] = None
     ) -> ProcessingJob:
         job = ProcessingJob(
             document_id=document_id,
             celery_task_id=celery_task_id,
             start_page=start_page,
-            end_page=end_page
+            end_page=end_page,
+            segmentation_options=segmentation_options
         )
         self.db.add(job)
         self.db.commit()
@@ -35,6 +39,9 @@ class ProcessingJobRepository:
     def get_by_id(self, job_id: str) -> Optional[ProcessingJob]:
         return self.db.query(ProcessingJob).filter(ProcessingJob.id == job_id).first()
     
+    def get_by_ids(self, job_ids: List[str]) -> List[ProcessingJob]:
+        return self.db.query(ProcessingJob).filter(ProcessingJob.id.in_(job_ids)).all()
+    
     def get_by_celery_task_id(self, celery_task_id: str) -> Optional[ProcessingJob]:
         return self.db.query(ProcessingJob).filter(
             ProcessingJob.celery_task_id == celery_task_id
@@ -67,7 +74,11 @@ class ProcessingJobRepository:
             job.started_at = datetime.utcnow()
         elif status_str in [ProcessingStatus.COMPLETED.value, ProcessingStatus.FAILED.value]:
             job.completed_at = datetime.utcnow()
-            
+
+        self.events.notify(
+            job.id, "status",
+            status=job.status, current_step=job.current_step, error_message=job.error_message,
+        )
         self.db.commit()
         self.db.refresh(job)
         return job
@@ -82,6 +93,71 @@ class ProcessingJobRepository:
         self.db.refresh(job)
         return job
     
+    def start_shards(self, job_id: str, shards_total: int) -> None:
+        self.db.execute(
+            update(ProcessingJob)
+            .where(ProcessingJob.id == job_id)
+            .values(shards_total=shards_total, shards_completed=[])
+        )
+        self.events.notify(job_id, "progress", stage="shards", done=0, total=shards_total)
+        self.db.commit()
+
+    def complete_shard(self, job_id: str, shard_index: int) -> bool:
+        """Marks a shard as done in the current transaction; the caller commits.
+
+        Returns True only for the call that completed the last one, see complete_page_shard.
+        """
+        return self._complete_shard(
+            job_id, shard_index, ProcessingJob.shards_completed, ProcessingJob.shards_total, "shards"
+        )
+
+    def start_page_shards(self, job_id: str, shards_total: int) -> None:
+        self.db.execute(
+            update(ProcessingJob)
+            .where(ProcessingJob.id == job_id)
+            .values(page_shards_total=shards_total, page_shards_completed=[])
+        )
+        self.events.notify(job_id, "progress", stage="page_shards", done=0, total=shards_total)
+        self.db.commit()
+
+    def complete_page_shard(self, job_id: str, shard_index: int) -> bool:
+        """Marks a page shard as extracted in the current transaction; the caller commits.
+
+        Returns True only for the call that completed the last one. The row stays
+        locked until the commit, so the last shard can hand the text on first and a
+        failure before the commit leaves its index unrecorded for the retry.
+        """
+        return self._complete_shard(
+            job_id, shard_index, ProcessingJob.page_shards_completed, ProcessingJob.page_shards_total, "page_shards"
+        )
+
+    def _complete_shard(self, job_id: str, shard_index: int, completed, total, stage: str) -> bool:
+        row = self.db.execute(
+            update(ProcessingJob)
+            .where(
+                ProcessingJob.id == job_id,
+                ~(literal(shard_index) == any_(completed)),
+            )
+            .values({completed: func.array_append(completed, shard_index)})
+            .returning(func.cardinality(completed), total)
+        ).first()
+        if row is not None:
+            self.events.notify(job_id, "progress", stage=stage, done=row[0], total=row[1])
+        # a retried shard finds its index already recorded and updates nothing
+        return row is not None and row[0] == row[1]
+    
+    def bump_revision(self, job_id: str) -> None:
+        """Marks the scenes of a job as changed in the current transaction; the caller commits."""
+        revision = self.db.execute(
+            update(ProcessingJob)
+            .where(ProcessingJob.id == job_id)
+            .values(revision=ProcessingJob.revision + 1)
+            .returning(ProcessingJob.revision)
+            .execution_options(synchronize_session="fetch")
+        ).scalar()
+        if revision is not None:
+            self.events.notify(job_id, "revision", revision=revision)
+
     def start_processing(self, job_id: str) -> Optional[ProcessingJob]:
         return self.update_status(
             job_id,
@@ -96,6 +172,14 @@ class ProcessingJobRepository:
             ProcessingStep.FINALIZATION
         )
     
+    def retry_processing(self, job_id: str, error_message: str) -> Optional[ProcessingJob]:
+        """Puts a job back to pending while its task waits for a retry; FAILED is left for the last attempt."""
+        return self.update_status(
+            job_id,
+            ProcessingStatus.PENDING,
+            error_message=error_message
+        )
+
     def fail_processing(self, job_id: str, error_message: str) -> Optional[ProcessingJob]:
         return self.update_status(
             job_id,
@@ -0,0 +1,111 @@
+import os
+from itertools import islice
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+from sqlalchemy import bindparam, case, cast, delete, func, insert, select, update
+from sqlalchemy.dialects.postgresql import REGCONFIG
+from sqlalchemy.orm import Session, load_only
+
+from ..models.scene import Scene
+
+SCENE_SEARCH_CONFIG = os.getenv("SCENE_SEARCH_CONFIG", "russian")
+
+
+def _search_config():
+    # the to_tsvector(regconfig, text) call of migration 013, never the (text, text) overload
+    return cast(SCENE_SEARCH_CONFIG, REGCONFIG)
+
+
+def scene_search_vector(text):
+    return func.to_tsvector(_search_config(), text)
+
+
+class SceneRepository:
+    batch_size = 1000
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def replace_for_job(self, job_id: str, scenes: Iterable[Dict[str, Any]]) -> int:
+        """Replaces all scenes of a job in the current transaction; the caller commits.
+
+        Every row carries search_text, the text its search_vector is built from.
+        """
+        self.db.execute(delete(Scene).where(Scene.processing_job_id == job_id))
+        # a Core insert, so search_text binds as a plain parameter rather than a mapped attribute
+        statement = insert(Scene.__table__).values(search_vector=scene_search_vector(bindparam("search_text")))
+
+        saved = 0
+        rows = iter(scenes)
+        while True:
+            batch = [
+                {**scene, "processing_job_id": job_id}
+                for scene in islice(rows, self.batch_size)
+            ]
+            if not batch:
+                return saved
+            # executemany of a Core insert is sent as multi-row INSERT ... VALUES pages
+            self.db.execute(statement, batch)
+            saved += len(batch)
+
+    def shift_ranges(self, job_id: str, runs: List[Tuple[int, int, int]]) -> int:
+        """Renumbers runs of scenes, given as (first, last, shift) by their current numbers,
+        in one statement; the caller commits.
+
+        The deferred unique constraint lets the intermediate duplicates pass. Scenes
+        already loaded in the session are not synchronized, the caller numbers those itself.
+        """
+        if not runs:
+            return 0
+        shift = case(*[(Scene.scene_number.between(first, last), delta) for first, last, delta in runs], else_=0)
+        result = self.db.execute(
+            update(Scene)
+            .where(
+                Scene.processing_job_id == job_id,
+                Scene.scene_number.between(runs[0][0], runs[-1][1]),
+            )
+            .values(scene_number=Scene.scene_number + shift)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+
+    def delete_ids(self, scene_ids: List[UUID]) -> int:
+        if not scene_ids:
+            return 0
+        result = self.db.execute(
+            delete(Scene)
+            .where(Scene.id.in_(scene_ids))
+            .execution_options(synchronize_session="evaluate")
+        )
+        return result.rowcount
+
+    def list_page(
+        self,
+        job_id: str,
+        limit: Optional[int] = None,
+        after_scene_number: Optional[int] = None,
+        search: Optional[str] = None,
+        columns: Iterable[str] = ()
+    ) -> List[Scene]:
+        query = self.db.query(Scene).filter(self._filter(job_id, search))
+        columns = list(columns)
+        if columns:
+            query = query.options(load_only(*(getattr(Scene, column) for column in columns)))
+        if after_scene_number is not None:
+            query = query.filter(Scene.scene_number > after_scene_number)
+        query = query.order_by(Scene.scene_number)
+        if limit is not None:
+            query = query.limit(limit)
+        return query.all()
+
+    def count(self, job_id: str, search: Optional[str] = None) -> int:
+        return self.db.execute(
+            select(func.count()).select_from(Scene).where(self._filter(job_id, search))
+        ).scalar_one()
+
+    @staticmethod
+    def _filter(job_id: str, search: Optional[str]):
+        condition = Scene.processing_job_id == job_id
+        if search:
+            condition = condition & Scene.search_vector.op("@@")(func.websearch_to_tsquery(_search_config(), search))
+        return condition
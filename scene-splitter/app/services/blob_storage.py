@@ -0,0 +1,230 @@
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import BinaryIO, ContextManager, Iterator, Optional, Tuple
+
+BLOB_STORAGE_BACKEND = os.getenv("BLOB_STORAGE_BACKEND", "local")
+BLOB_STORAGE_PATH = os.getenv("BLOB_STORAGE_PATH", "/app/storage")
+
+
+class BlobStorage(ABC):
+    @abstractmethod
+    def exists(self, key: str) -> bool:
+        ...
+
+    @abstractmethod
+    def put_file(self, key: str, path: str, content_type: str = "application/octet-stream") -> None:
+        ...
+
+    @abstractmethod
+    def put_bytes(self, key: str, data: bytes, content_type: str = "application/octet-stream") -> None:
+        ...
+
+    @abstractmethod
+    def get_bytes(self, key: str) -> bytes:
+        ...
+
+    @abstractmethod
+    def open_local(self, key: str) -> ContextManager[str]:
+        """Yields a local filesystem path for the object, valid inside the block."""
+
+    @contextmanager
+    def open_stream(self, key: str) -> Iterator[BinaryIO]:
+        """Yields a readable binary stream so large objects are never held in memory at once."""
+        with self.open_local(key) as path:
+            with open(path, "rb") as f:
+                yield f
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        ...
+
+    @abstractmethod
+    def iter_objects(self, prefix: str) -> Iterator[Tuple[str, float]]:
+        """Yields (key, modification time as a unix timestamp) for every object under the prefix."""
+
+
+class LocalBlobStorage(BlobStorage):
+    def __init__(self, root: str):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def exists(self, key: str) -> bool:
+        return os.path.exists(self._path(key))
+
+    def put_file(self, key: str, path: str, content_type: str = "application/octet-stream") -> None:
+        with self._replacing(key) as f:
+            with open(path, "rb") as source:
+                shutil.copyfileobj(source, f)
+
+    def put_bytes(self, key: str, data: bytes, content_type: str = "application/octet-stream") -> None:
+        with self._replacing(key) as f:
+            f.write(data)
+
+    def get_bytes(self, key: str) -> bytes:
+        with open(self._path(key), "rb") as f:
+            return f.read()
+
+    @contextmanager
+    def open_local(self, key: str) -> Iterator[str]:
+        path = self._path(key)
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Blob {key} not found")
+        yield path
+
+    def delete(self, key: str) -> None:
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def iter_objects(self, prefix: str) -> Iterator[Tuple[str, float]]:
+        for directory, _, filenames in os.walk(self._path(prefix)):
+            for filename in filenames:
+                if filename.endswith(".tmp"):
+                    continue
+                path = os.path.join(directory, filename)
+                try:
+                    modified_at = os.path.getmtime(path)
+                except FileNotFoundError:
+                    continue
+                yield os.path.relpath(path, self.root).replace(os.sep, "/"), modified_at
+
+    @contextmanager
+    def _replacing(self, key: str) -> Iterator[BinaryIO]:
+        # a temp file of its own per call: concurrent uploads of one PDF write the same key
+        target = self._path(key)
+        directory = os.path.dirname(target)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_target = tempfile.mkstemp(dir=directory, prefix=f"{os.path.basename(target)}.", suffix=".tmp")
+        try:
+            # mkstemp creates 0600, the API and the workers may run as different users
+            os.fchmod(fd, 0o644)
+            with os.fdopen(fd, "wb") as f:
+                yield f
+            os.replace(tmp_target, target)
+        except BaseException:
+            try:
+                os.remove(tmp_target)
+            except FileNotFoundError:
+                pass
+            raise
+
+    def _path(self, key: str) -> str:
+        path = os.path.normpath(os.path.join(self.root, key))
+        if not path.startswith(os.path.normpath(self.root) + os.sep):
+            raise ValueError(f"Invalid blob key: {key}")
+        return path
+
+
+class MinioBlobStorage(BlobStorage):
+    def __init__(self, endpoint: str, access_key: str, secret_key: str, bucket: str, secure: bool = False):
+        from minio import Minio
+
+        self.client = Minio(endpoint, access_key=access_key, secret_key=secret_key, secure=secure)
+        self.bucket = bucket
+        self.logger = logging.getLogger(__name__)
+        if not self.client.bucket_exists(bucket):
+            self.client.make_bucket(bucket)
+            self.logger.info(f"Created bucket: {bucket}")
+
+    def exists(self, key: str) -> bool:
+        from minio.error import S3Error
+
+        try:
+            self.client.stat_object(self.bucket, key)
+            return True
+        except S3Error as e:
+            if e.code in {"NoSuchKey", "NoSuchObject", "ResourceNotFound"}:
+                return False
+            raise
+
+    def put_file(self, key: str, path: str, content_type: str = "application/octet-stream") -> None:
+        self.client.fput_object(self.bucket, key, path, content_type=content_type)
+
+    def put_bytes(self, key: str, data: bytes, content_type: str = "application/octet-stream") -> None:
+        from io import BytesIO
+
+        self.client.put_object(self.bucket, key, BytesIO(data), len(data), content_type=content_type)
+
+    def get_bytes(self, key: str) -> bytes:
+        response = self.client.get_object(self.bucket, key)
+        try:
+            return response.read()
+        finally:
+            response.close()
+            response.release_conn()
+
+    @contextmanager
+    def open_local(self, key: str) -> Iterator[str]:
+        fd, path = tempfile.mkstemp(prefix="blob-", suffix=os.path.splitext(key)[1])
+        os.close(fd)
+        try:
+            self.client.fget_object(self.bucket, key, path)
+            yield path
+        finally:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def delete(self, key: str) -> None:
+        self.client.remove_object(self.bucket, key)
+
+    def iter_objects(self, prefix: str) -> Iterator[Tuple[str, float]]:
+        for obj in self.client.list_objects(self.bucket, prefix=prefix, recursive=True):
+            yield obj.object_name, obj.last_modified.timestamp()
+
+
+def pdf_object_key(content_hash: str) -> str:
+    return f"pdfs/{content_hash}.pdf"
+
+
+def copy_stream_to_file(source: BinaryIO, target: BinaryIO, hasher=None, chunk_size: int = 1024 * 1024) -> int:
+    size = 0
+    while True:
+        chunk = source.read(chunk_size)
+        if not chunk:
+            return size
+        if hasher is not None:
+            hasher.update(chunk)
+        target.write(chunk)
+        size += len(chunk)
+
+
+def store_pdf_upload(source: BinaryIO) -> Tuple[str, str, int]:
+    hasher = hashlib.sha256()
+    with tempfile.NamedTemporaryFile(prefix="upload-", suffix=".pdf") as tmp:
+        size = copy_stream_to_file(source, tmp, hasher)
+        tmp.flush()
+
+        content_hash = hasher.hexdigest()
+        storage_key = pdf_object_key(content_hash)
+        storage = get_blob_storage()
+        if not storage.exists(storage_key):
+            storage.put_file(storage_key, tmp.name, content_type="application/pdf")
+
+    return content_hash, storage_key, size
+
+
+_storage: Optional[BlobStorage] = None
+
+def get_blob_storage() -> BlobStorage:
+    global _storage
+    if _storage is None:
+        if BLOB_STORAGE_BACKEND == "minio":
+            _storage = MinioBlobStorage(
+                endpoint=os.environ["MINIO_ENDPOINT"],
+                access_key=os.environ["MINIO_ACCESS_KEY"],
+                secret_key=os.environ["MINIO_SECRET_KEY"],
+                bucket=os.getenv("MINIO_BUCKET", "scene-splitter"),
+                secure=os.getenv("MINIO_SECURE", "false").lower() == "true",
+            )
+        else:
+            _storage = LocalBlobStorage(BLOB_STORAGE_PATH)
+
+    return _storage
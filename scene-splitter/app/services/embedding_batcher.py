@@ -0,0 +1,170 @@
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+BATCH_SIZE_BUCKETS = (1, 8, 32, 128, 512, 2048)
+
+
+class EmbeddingQueueFullError(Exception):
+    pass
+
+
+@dataclass
+class _PendingRequest:
+    sentences: List[str]
+    future: asyncio.Future
+    enqueued_at: float = field(default_factory=time.perf_counter)
+
+
+class DynamicBatcher:
+    """Merges concurrent encode requests into batches bounded by size and waiting time.
+
+    The first request of a batch waits at most max_latency_ms for company; the
+    batch is flushed earlier once it holds max_batch_size sentences. Encoding
+    runs on a single thread so the model is never called concurrently.
+    """
+
+    def __init__(
+        self,
+        encode: Callable[[List[str]], np.ndarray],
+        max_batch_size: int = 256,
+        max_latency_ms: float = 20.0,
+        max_queue_sentences: int = 50000,
+    ):
+        self.encode = encode
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_latency = max(0.0, max_latency_ms) / 1000.0
+        self.max_queue_sentences = max_queue_sentences
+        self.logger = logging.getLogger(__name__)
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="embedding-encode")
+
+        self.started_at = time.time()
+        self.queued_sentences = 0
+        self.requests_total = 0
+        self.sentences_total = 0
+        self.batches_total = 0
+        self.errors_total = 0
+        self.encode_seconds_total = 0.0
+        self.wait_seconds_total = 0.0
+        self.last_batch_size = 0
+        self.max_batch_size_seen = 0
+        self.batch_size_histogram: Dict[str, int] = {f"le_{bucket}": 0 for bucket in BATCH_SIZE_BUCKETS}
+        self.batch_size_histogram["le_inf"] = 0
+
+    async def start(self) -> None:
+        self._queue = asyncio.Queue()
+        self._worker = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+        self._executor.shutdown(wait=False)
+
+    async def submit(self, sentences: List[str]) -> np.ndarray:
+        if self.queued_sentences + len(sentences) > self.max_queue_sentences and self.queued_sentences:
+            raise EmbeddingQueueFullError(
+                f"Embedding queue holds {self.queued_sentences} sentences, limit is {self.max_queue_sentences}"
+            )
+
+        future = asyncio.get_running_loop().create_future()
+        self.queued_sentences += len(sentences)
+        self.requests_total += 1
+        await self._queue.put(_PendingRequest(sentences, future))
+        return await future
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            size = len(batch[0].sentences)
+            deadline = loop.time() + self.max_latency
+
+            while size < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                batch.append(item)
+                size += len(item.sentences)
+
+            await self._encode_batch(batch, size)
+
+    async def _encode_batch(self, batch: List[_PendingRequest], size: int) -> None:
+        sentences = [sentence for item in batch for sentence in item.sentences]
+        started = time.perf_counter()
+        self.wait_seconds_total += sum(started - item.enqueued_at for item in batch)
+
+        try:
+            embeddings = await asyncio.get_running_loop().run_in_executor(self._executor, self.encode, sentences)
+            embeddings = np.asarray(embeddings, dtype=np.float32)
+        except Exception as e:
+            self.errors_total += 1
+            self.logger.exception(f"Encoding a batch of {size} sentences failed")
+            for item in batch:
+                if not item.future.done():
+                    item.future.set_exception(e)
+            return
+        finally:
+            self.queued_sentences -= size
+            self.encode_seconds_total += time.perf_counter() - started
+
+        offset = 0
+        for item in batch:
+            rows = embeddings[offset:offset + len(item.sentences)]
+            offset += len(item.sentences)
+            # the caller may have given up (client disconnect) while the batch was encoding
+            if not item.future.done():
+                item.future.set_result(rows)
+
+        self._record_batch(size)
+
+    def _record_batch(self, size: int) -> None:
+        self.batches_total += 1
+        self.sentences_total += size
+        self.last_batch_size = size
+        self.max_batch_size_seen = max(self.max_batch_size_seen, size)
+        for bucket in BATCH_SIZE_BUCKETS:
+            if size <= bucket:
+                self.batch_size_histogram[f"le_{bucket}"] += 1
+                break
+        else:
+            self.batch_size_histogram["le_inf"] += 1
+
+    def metrics(self) -> dict:
+        uptime = time.time() - self.started_at
+        return {
+            "queue_depth_requests": self._queue.qsize() if self._queue is not None else 0,
+            "queue_depth_sentences": self.queued_sentences,
+            "requests_total": self.requests_total,
+            "sentences_total": self.sentences_total,
+            "batches_total": self.batches_total,
+            "errors_total": self.errors_total,
+            "last_batch_size": self.last_batch_size,
+            "max_batch_size_seen": self.max_batch_size_seen,
+            "avg_batch_size": round(self.sentences_total / self.batches_total, 2) if self.batches_total else None,
+            "avg_wait_ms": round(1000 * self.wait_seconds_total / self.requests_total, 2) if self.requests_total else None,
+            "encode_seconds_total": round(self.encode_seconds_total, 3),
+            "encode_sentences_per_second": (
+                round(self.sentences_total / self.encode_seconds_total, 1) if self.encode_seconds_total else None
+            ),
+            "sentences_per_second": round(self.sentences_total / uptime, 1) if uptime > 0 else None,
+            "batch_size_histogram": dict(self.batch_size_histogram),
+            "uptime_seconds": round(uptime, 1),
+            "max_batch_size": self.max_batch_size,
+            "max_latency_ms": self.max_latency * 1000,
+        }
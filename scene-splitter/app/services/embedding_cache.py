@@ -0,0 +1,122 @@
+import hashlib
+import logging
+import os
+import unicodedata
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.repositories.embedding_cache_repository import EmbeddingCacheRepository
+from app.services.model_registry import model_cache_key
+
+EMBEDDING_CACHE_ENABLED = os.getenv("EMBEDDING_CACHE_ENABLED", "true").lower() == "true"
+EMBEDDING_CACHE_DTYPE = os.getenv("EMBEDDING_CACHE_DTYPE", "float16")
+EMBEDDING_CACHE_MAX_ENTRIES = int(os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", "5000000"))
+# last_used_at only orders the eviction, a hit within this interval does not write it again
+EMBEDDING_CACHE_TOUCH_INTERVAL_SECONDS = int(os.getenv("EMBEDDING_CACHE_TOUCH_INTERVAL_SECONDS", "3600"))
+
+
+def hash_sentence(sentence: str) -> str:
+    normalized = " ".join(unicodedata.normalize("NFC", sentence).split())
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+
+
+class EmbeddingCacheService:
+    """Sentence embeddings cached in Postgres, keyed by model and normalized sentence hash.
+
+    Rows are decoded with the dtype they were stored with. A row whose dimension
+    differs from what the model encodes now, e.g. after the model behind a key
+    changed, is encoded again and replaced.
+    """
+
+    def __init__(
+        self,
+        session: Session,
+        model_name: str,
+        dtype: str = EMBEDDING_CACHE_DTYPE,
+        backend: Optional[str] = None,
+        touch_interval: int = EMBEDDING_CACHE_TOUCH_INTERVAL_SECONDS
+    ):
+        self.session = session
+        self.repo = EmbeddingCacheRepository(session)
+        self.model_name = model_cache_key(model_name, backend)
+        self.dtype = np.dtype(dtype)
+        self.touch_interval = timedelta(seconds=touch_interval)
+        # the model's dimension, learned from the first encode
+        self.dimensions: Optional[int] = None
+        self.hits = 0
+        self.misses = 0
+        self.logger = logging.getLogger(__name__)
+
+    def embed(self, sentences: List[str], encode: Callable[[List[str]], np.ndarray]) -> np.ndarray:
+        hashes = [hash_sentence(sentence) for sentence in sentences]
+        unique: Dict[str, str] = {}
+        for sentence_hash, sentence in zip(hashes, sentences):
+            unique.setdefault(sentence_hash, sentence)
+
+        vectors: Dict[str, np.ndarray] = {}
+        cached = self.repo.get_many(self.model_name, list(unique.keys()), datetime.utcnow() - self.touch_interval)
+        for sentence_hash, (data, dtype, dimensions) in cached.items():
+            vector = self._decode(data, dtype, dimensions)
+            if vector is not None:
+                vectors[sentence_hash] = vector
+        missing = [sentence_hash for sentence_hash in unique if sentence_hash not in vectors]
+
+        if missing:
+            encoded = self._encode(encode, [unique[sentence_hash] for sentence_hash in missing])
+            # rows that did not decode are overwritten, the rest are new
+            self._store(missing, encoded, vectors, replace=len(vectors) < len(cached))
+        elif vectors and self.dimensions is None:
+            # nothing to encode tells the model's dimension, one cached sentence is encoded to check the rows
+            self._encode(encode, [unique[next(iter(vectors))]])
+
+        stale = [sentence_hash for sentence_hash, vector in vectors.items() if len(vector) != self.dimensions]
+        if stale:
+            self.logger.warning(
+                f"{len(stale)} cached embeddings of {self.model_name} do not have {self.dimensions} dimensions, re-encoding"
+            )
+            encoded = self._encode(encode, [unique[sentence_hash] for sentence_hash in stale])
+            self._store(stale, encoded, vectors, replace=True)
+
+        self.hits += len(unique) - len(missing) - len(stale)
+        self.misses += len(missing) + len(stale)
+        self.session.commit()
+
+        # fresh and cached rows go through the same storage dtype so results do not depend on hits
+        return np.stack([vectors[sentence_hash] for sentence_hash in hashes]).astype(np.float32)
+
+    def _encode(self, encode: Callable[[List[str]], np.ndarray], sentences: List[str]) -> np.ndarray:
+        stored = np.asarray(encode(sentences)).astype(self.dtype)
+        self.dimensions = stored.shape[1]
+        return stored
+
+    def _store(
+        self, hashes: List[str], stored: np.ndarray, vectors: Dict[str, np.ndarray], replace: bool = False
+    ) -> None:
+        self.repo.put_many(
+            self.model_name,
+            self.dtype.name,
+            stored.shape[1],
+            {sentence_hash: row.tobytes() for sentence_hash, row in zip(hashes, stored)},
+            replace=replace,
+        )
+        vectors.update(zip(hashes, stored))
+
+    def _decode(self, data: bytes, dtype: str, dimensions: int) -> Optional[np.ndarray]:
+        try:
+            row_dtype = np.dtype(dtype)
+        except TypeError:
+            return None
+        if len(data) != dimensions * row_dtype.itemsize:
+            return None
+        return np.frombuffer(data, dtype=row_dtype).astype(self.dtype)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+        }
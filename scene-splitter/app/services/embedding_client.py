@@ -0,0 +1,91 @@
+import os
+import random
+import time
+from typing import List, Optional
+
+import numpy as np
+
+EMBEDDING_SERVER_URL = os.getenv("EMBEDDING_SERVER_URL", "")
+EMBEDDING_SERVER_TIMEOUT_SECONDS = float(os.getenv("EMBEDDING_SERVER_TIMEOUT_SECONDS", "120"))
+# a full server queue answers 503 with Retry-After; the request is retried before the task fails
+EMBEDDING_SERVER_BUSY_RETRIES = int(os.getenv("EMBEDDING_SERVER_BUSY_RETRIES", "8"))
+EMBEDDING_SERVER_BUSY_MAX_DELAY_SECONDS = float(os.getenv("EMBEDDING_SERVER_BUSY_MAX_DELAY_SECONDS", "30"))
+
+RETRYABLE_STATUS_CODES = (429, 503)
+
+
+class EmbeddingServerError(Exception):
+    pass
+
+
+class EmbeddingClient:
+    """Drop-in for SentenceTransformer.encode backed by the embedding server.
+
+    The url is either http(s)://host:port or unix:///path/to/socket.
+    """
+
+    request_chunk_size = 4096
+
+    def __init__(
+        self,
+        url: str,
+        model_name: str,
+        timeout: float = EMBEDDING_SERVER_TIMEOUT_SECONDS,
+        busy_retries: int = EMBEDDING_SERVER_BUSY_RETRIES,
+        busy_max_delay: float = EMBEDDING_SERVER_BUSY_MAX_DELAY_SECONDS,
+    ):
+        import httpx
+
+        self.model_name = model_name
+        self.busy_retries = busy_retries
+        self.busy_max_delay = busy_max_delay
+        if url.startswith("unix://"):
+            transport = httpx.HTTPTransport(uds=url[len("unix://"):], retries=2)
+            self.client = httpx.Client(transport=transport, base_url="http://embedding-server", timeout=timeout)
+        else:
+            transport = httpx.HTTPTransport(retries=2)
+            self.client = httpx.Client(transport=transport, base_url=url.rstrip("/"), timeout=timeout)
+
+    def encode(self, sentences: List[str], **kwargs) -> np.ndarray:
+        sentences = list(sentences)
+        if not sentences:
+            return np.zeros((0, 0), dtype=np.float32)
+
+        parts = [
+            self._embed(sentences[start:start + self.request_chunk_size])
+            for start in range(0, len(sentences), self.request_chunk_size)
+        ]
+        return parts[0] if len(parts) == 1 else np.vstack(parts)
+
+    def _embed(self, sentences: List[str]) -> np.ndarray:
+        # the transport retries failed connects, busy answers are retried here
+        for attempt in range(self.busy_retries + 1):
+            response = self.client.post("/embed", json={"sentences": sentences, "model": self.model_name})
+            if response.status_code not in RETRYABLE_STATUS_CODES or attempt == self.busy_retries:
+                break
+            time.sleep(self._busy_delay(response, attempt))
+        if response.status_code != 200:
+            raise EmbeddingServerError(f"Embedding server returned {response.status_code}: {response.text}")
+
+        count = int(response.headers["X-Embedding-Count"])
+        dim = int(response.headers["X-Embedding-Dim"])
+        return np.frombuffer(response.content, dtype="<f4").reshape(count, dim).astype(np.float32)
+
+    def _busy_delay(self, response, attempt: int) -> float:
+        """Retry-After when the server sent one, exponential backoff otherwise; jittered so workers spread out."""
+        try:
+            delay = float(response.headers["Retry-After"])
+        except (KeyError, ValueError):
+            delay = 0.5 * 2 ** attempt
+        delay = min(max(delay, 0.1), self.busy_max_delay)
+        return delay * random.uniform(1.0, 1.5)
+
+
+_clients = {}
+
+def get_embedding_client(model_name: str, url: Optional[str] = None) -> EmbeddingClient:
+    url = url or EMBEDDING_SERVER_URL
+    key = (url, model_name)
+    if key not in _clients:
+        _clients[key] = EmbeddingClient(url, model_name)
+    return _clients[key]
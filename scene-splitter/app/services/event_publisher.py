@@ -103,7 +103,7 @@ class EventPublisher:
 
                     self.publish_event(
                         event_type=str(event.event_type),
-                        payload=event.payload,
+                        payload=event_class.materialize_payload(event.payload, session),
                         exchange_name=exchange_name,
                         routing_key=routing_key
                     )
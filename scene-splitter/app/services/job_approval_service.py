@@ -59,11 +59,14 @@ class JobApprovalService:
             event = SceneSavedEvent(
                 scene_number=scene.scene_number,
                 document_id=job.document_id,
+                # None for plain spans, the publisher slices the job text when it sends the event
                 scene_text=scene.scene_text,
                 scene_id=scene.id,
                 job_id=job.id,
                 word_count=scene.word_count,
                 char_count=scene.char_count,
+                start_char=scene.start_char,
+                end_char=scene.end_char,
             )
             self.outbox_repo.create_event(event=event, session=self.session)
 
@@ -0,0 +1,132 @@
+import codecs
+import io
+import json
+import tempfile
+import time
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator
+
+from app.services.blob_storage import get_blob_storage
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+def job_text_key(job_id: str) -> str:
+    return f"jobs/{job_id}/text.txt"
+
+
+def job_scenes_key(job_id: str) -> str:
+    return f"jobs/{job_id}/scenes.jsonl"
+
+
+def job_shard_plan_key(job_id: str) -> str:
+    return f"jobs/{job_id}/shards/plan.json"
+
+
+def job_shard_sentences_key(job_id: str, shard_index: int) -> str:
+    return f"jobs/{job_id}/shards/{shard_index}.sentences.json"
+
+
+def job_shard_similarities_key(job_id: str, shard_index: int) -> str:
+    return f"jobs/{job_id}/shards/{shard_index}.similarities.npy"
+
+
+def job_pages_plan_key(job_id: str) -> str:
+    return f"jobs/{job_id}/pages/plan.json"
+
+
+def job_pages_shard_key(job_id: str, shard_index: int) -> str:
+    return f"jobs/{job_id}/pages/{shard_index}.json"
+
+
+# kept outside jobs/ so the eviction lists proposals without walking every job
+RESEGMENT_RESULTS_PREFIX = "resegment/"
+
+
+def resegment_result_key(job_id: str, task_id: str) -> str:
+    return f"{RESEGMENT_RESULTS_PREFIX}{job_id}/{task_id}.json"
+
+
+def put_json(key: str, value: Any) -> str:
+    data = json.dumps(value, ensure_ascii=False).encode("utf-8")
+    get_blob_storage().put_bytes(key, data, content_type="application/json")
+    return key
+
+
+def get_json(key: str) -> Any:
+    return json.loads(get_blob_storage().get_bytes(key))
+
+
+def put_array(key: str, array: "np.ndarray") -> str:
+    # numpy is imported here, the API reads JSON artifacts and must not load it
+    import numpy as np
+
+    buffer = io.BytesIO()
+    np.save(buffer, array, allow_pickle=False)
+    get_blob_storage().put_bytes(key, buffer.getvalue())
+    return key
+
+
+def get_array(key: str) -> "np.ndarray":
+    import numpy as np
+
+    return np.load(io.BytesIO(get_blob_storage().get_bytes(key)), allow_pickle=False)
+
+
+def put_job_text(job_id: str, text: str) -> str:
+    key = job_text_key(job_id)
+    get_blob_storage().put_bytes(key, text.encode("utf-8"), content_type="text/plain; charset=utf-8")
+    return key
+
+
+def get_job_text(key: str) -> str:
+    return get_blob_storage().get_bytes(key).decode("utf-8")
+
+
+def iter_job_text(key: str, chunk_size: int = 256 * 1024) -> Iterator[str]:
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    with get_blob_storage().open_stream(key) as stream:
+        while True:
+            data = stream.read(chunk_size)
+            if not data:
+                break
+            yield decoder.decode(data)
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+def put_job_scenes(job_id: str, scenes: Iterable[Dict[str, Any]]) -> str:
+    key = job_scenes_key(job_id)
+    with tempfile.NamedTemporaryFile(mode="w", encoding="utf-8", prefix="scenes-", suffix=".jsonl") as tmp:
+        for scene in scenes:
+            tmp.write(json.dumps(scene, ensure_ascii=False))
+            tmp.write("\n")
+        tmp.flush()
+        get_blob_storage().put_file(key, tmp.name, content_type="application/x-ndjson")
+    return key
+
+
+def iter_job_scenes(key: str) -> Iterator[Dict[str, Any]]:
+    with get_blob_storage().open_stream(key) as stream:
+        for line in stream:
+            if line.strip():
+                yield json.loads(line)
+
+
+def evict_artifacts(prefix: str, older_than_seconds: float) -> int:
+    storage = get_blob_storage()
+    cutoff = time.time() - older_than_seconds
+    deleted = 0
+    for key, modified_at in storage.iter_objects(prefix):
+        if modified_at < cutoff:
+            storage.delete(key)
+            deleted += 1
+    return deleted
+
+
+def delete_artifact(key: str) -> None:
+    try:
+        get_blob_storage().delete(key)
+    except Exception as e:
+        print(f"Failed to delete artifact {key}: {e}")
@@ -0,0 +1,143 @@
+import asyncio
+import json
+import logging
+import os
+import select
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.repositories.job_event_repository import JOB_EVENTS_CHANNEL
+
+JOB_EVENTS_QUEUE_SIZE = int(os.getenv("JOB_EVENTS_QUEUE_SIZE", "100"))
+JOB_EVENTS_RECONNECT_MAX_SECONDS = float(os.getenv("JOB_EVENTS_RECONNECT_MAX_SECONDS", "30"))
+
+Subscriber = Tuple[asyncio.AbstractEventLoop, asyncio.Queue]
+
+
+class JobEventHub:
+    """Fans job events from one Postgres LISTEN connection out to the open streams of an API process.
+
+    A stream may watch several jobs through one queue. The connection is held by a daemon thread started on the first subscribe,
+    so a thousand open tabs cost one connection and a queue each, not a query
+    per poll. Every time the connection is (re)established the subscribers get
+    a "resync" event: whatever was sent while nobody listened is lost, and the
+    stream has to reread the job.
+    """
+
+    def __init__(self, channel: str = JOB_EVENTS_CHANNEL, queue_size: int = JOB_EVENTS_QUEUE_SIZE):
+        self.channel = channel
+        self.queue_size = queue_size
+        self._subscribers: Dict[str, List[Subscriber]] = {}
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.logger = logging.getLogger(__name__)
+
+    def subscribe(self, job_ids: Iterable[str]) -> asyncio.Queue:
+        """Registers one queue for the events of several jobs; call it from the event loop that reads the queue."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            for job_id in job_ids:
+                self._subscribers.setdefault(job_id, []).append((loop, queue))
+            if self._thread is None or not self._thread.is_alive():
+                self._stopping.clear()
+                self._thread = threading.Thread(target=self._listen, name="job-event-hub", daemon=True)
+                self._thread.start()
+        return queue
+
+    def unsubscribe(self, job_ids: Iterable[str], queue: asyncio.Queue) -> None:
+        with self._lock:
+            for job_id in job_ids:
+                subscribers = [entry for entry in self._subscribers.get(job_id, []) if entry[1] is not queue]
+                if subscribers:
+                    self._subscribers[job_id] = subscribers
+                else:
+                    self._subscribers.pop(job_id, None)
+
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return len({id(queue) for subscribers in self._subscribers.values() for _, queue in subscribers})
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _listen(self) -> None:
+        from app.utils.database import engine
+
+        attempt = 0
+        while not self._stopping.is_set():
+            connection = None
+            try:
+                # detached from the pool: the connection is held for the life of the process
+                connection = engine.raw_connection()
+                connection.detach()
+                driver_connection = connection.driver_connection
+                driver_connection.autocommit = True
+                with driver_connection.cursor() as cursor:
+                    cursor.execute(f'LISTEN "{self.channel}"')
+                attempt = 0
+                self._broadcast({"type": "resync"})
+
+                while not self._stopping.is_set():
+                    if select.select([driver_connection], [], [], 1.0)[0]:
+                        driver_connection.poll()
+                        while driver_connection.notifies:
+                            self._dispatch(driver_connection.notifies.pop(0).payload)
+            except Exception as e:
+                attempt += 1
+                delay = min(JOB_EVENTS_RECONNECT_MAX_SECONDS, 2 ** attempt)
+                self.logger.warning(f"Job event listener disconnected, reconnecting in {delay}s: {e}")
+                self._stopping.wait(delay)
+            finally:
+                if connection is not None:
+                    try:
+                        connection.close()
+                    except Exception:
+                        pass
+
+    def _dispatch(self, payload: str) -> None:
+        try:
+            event = json.loads(payload)
+        except ValueError:
+            self.logger.warning(f"Malformed job event ignored: {payload[:200]}")
+            return
+        with self._lock:
+            subscribers = list(self._subscribers.get(event.get("job_id"), ()))
+        self._deliver(subscribers, event)
+
+    def _broadcast(self, event: Dict[str, Any]) -> None:
+        with self._lock:
+            # a stream watching several jobs is registered under each of them, it gets one copy
+            subscribers = list({id(entry[1]): entry for entries in self._subscribers.values() for entry in entries}.values())
+        self._deliver(subscribers, event)
+
+    def _deliver(self, subscribers: List[Subscriber], event: Dict[str, Any]) -> None:
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(self._offer, queue, event)
+            except RuntimeError:
+                # the loop of a stream that was torn down without unsubscribing
+                pass
+
+    @staticmethod
+    def _offer(queue: asyncio.Queue, event: Dict[str, Any]) -> None:
+        # a stream that stopped reading loses its backlog and rereads the job once it catches up
+        if queue.full():
+            while not queue.empty():
+                queue.get_nowait()
+            event = {"type": "resync"}
+        queue.put_nowait(event)
+
+
+_hub: Optional[JobEventHub] = None
+
+def get_job_event_hub() -> JobEventHub:
+    global _hub
+    if _hub is None:
+        _hub = JobEventHub()
+
+    return _hub
@@ -0,0 +1,56 @@
+import logging
+import os
+import time
+from typing import Any, Optional
+
+from sqlalchemy import func, select
+
+from app.repositories.job_event_repository import JOB_EVENTS_CHANNEL, job_event_payload
+
+JOB_PROGRESS_INTERVAL_SECONDS = float(os.getenv("JOB_PROGRESS_INTERVAL_SECONDS", "1"))
+
+logger = logging.getLogger(__name__)
+
+
+def publish_job_event(job_id: Any, event_type: str, **data: Any) -> None:
+    """Sends a job event right away on its own autocommit connection; best effort, failures are logged."""
+    from app.utils.database import engine
+
+    try:
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+            connection.execute(
+                select(func.pg_notify(JOB_EVENTS_CHANNEL, job_event_payload(job_id, event_type, **data)))
+            )
+    except Exception as e:
+        logger.warning(f"{event_type} event for job {job_id} not sent: {e}")
+
+
+class JobProgressReporter:
+    """Throttled progress events for one stage of a job.
+
+    Stages run inside a single long transaction, so every report goes out on its
+    own autocommit connection and reaches the listeners right away. Reports are
+    best effort: a failed NOTIFY is logged and never fails the task.
+    """
+
+    def __init__(self, job_id: Any, stage: str, total: Optional[int] = None, interval: float = JOB_PROGRESS_INTERVAL_SECONDS):
+        self.job_id = job_id
+        self.stage = stage
+        self.total = total
+        self.done = 0
+        self.interval = interval
+        self._sent_at = 0.0
+
+    def advance(self, count: int = 1) -> None:
+        self.update(self.done + count)
+
+    def update(self, done: int, total: Optional[int] = None) -> None:
+        self.done = done
+        if total is not None:
+            self.total = total
+        if time.monotonic() - self._sent_at >= self.interval:
+            self.flush()
+
+    def flush(self) -> None:
+        self._sent_at = time.monotonic()
+        publish_job_event(self.job_id, "progress", stage=self.stage, done=self.done, total=self.total)
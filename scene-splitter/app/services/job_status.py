@@ -0,0 +1,21 @@
+from enum import Enum
+
+from app.models.enums import ProcessingStatus
+
+# scenes of an approved or completed job are already handed over and must not change
+FINALIZED_STATUSES = frozenset({ProcessingStatus.APPROVED.value, ProcessingStatus.COMPLETED.value})
+
+
+def normalize_status(raw_status: object) -> str:
+    """Status value of a job, also for rows written as "ProcessingStatus.NAME" by str() of the enum."""
+    if isinstance(raw_status, Enum):
+        return raw_status.value
+    if isinstance(raw_status, str) and raw_status.startswith("ProcessingStatus."):
+        name = raw_status.split(".", 1)[1]
+        if name in ProcessingStatus.__members__:
+            return ProcessingStatus[name].value
+    return str(raw_status)
+
+
+def is_finalized(raw_status: object) -> bool:
+    return normalize_status(raw_status) in FINALIZED_STATUSES
@@ -0,0 +1,40 @@
+import os
+import zlib
+from typing import List, Tuple
+
+JOB_TEXT_COMPRESSION_LEVEL = int(os.getenv("JOB_TEXT_COMPRESSION_LEVEL", "6"))
+
+
+class JobTextBuilder:
+    """Compresses the job text incrementally while handing out the span of every appended scene.
+
+    Consecutive scenes are separated by a single space, the same separator the
+    splitter joins sentences with, so the result is the normalized job text.
+    """
+
+    separator = " "
+
+    def __init__(self, level: int = JOB_TEXT_COMPRESSION_LEVEL):
+        self._compressor = zlib.compressobj(level)
+        self._chunks: List[bytes] = []
+        self.char_count = 0
+        self.byte_size = 0
+
+    def append(self, text: str) -> Tuple[int, int]:
+        if self.char_count:
+            self._write(self.separator)
+        start = self.char_count
+        self._write(text)
+        return start, self.char_count
+
+    def finish(self) -> bytes:
+        self._chunks.append(self._compressor.flush())
+        return b"".join(self._chunks)
+
+    def _write(self, text: str) -> None:
+        data = text.encode("utf-8")
+        self.char_count += len(text)
+        self.byte_size += len(data)
+        chunk = self._compressor.compress(data)
+        if chunk:
+            self._chunks.append(chunk)
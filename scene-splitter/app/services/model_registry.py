@@ -0,0 +1,167 @@
+import logging
+import os
+import shutil
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from app.utils.memory import get_rss_bytes
+
+DEFAULT_MODEL_NAME = os.getenv("SCENE_SPLITTER_MODEL", "cointegrated/rubert-tiny2")
+# torch: fp32 PyTorch; onnx: fp32 ONNX Runtime; onnx-int8: dynamically quantized ONNX Runtime
+DEFAULT_BACKEND = os.getenv("SCENE_SPLITTER_BACKEND", "torch")
+SUPPORTED_BACKENDS = ("torch", "onnx", "onnx-int8")
+MODEL_EXPORT_DIR = os.getenv("MODEL_EXPORT_DIR", "/app/storage/models")
+ONNX_QUANTIZATION_CONFIG = os.getenv("ONNX_QUANTIZATION_CONFIG", "avx2")
+WARMUP_SENTENCES = ["Модель готова к работе.", "Это предложение используется для прогрева."]
+
+
+def model_cache_key(model_name: str, backend: Optional[str] = None) -> str:
+    """Identifies the encoder output; quantized embeddings must not share cache rows with fp32 ones."""
+    backend = backend or DEFAULT_BACKEND
+    return model_name if backend == "torch" else f"{model_name}@{backend}"
+
+
+class ModelRegistry:
+    """Process-wide cache of sentence encoders shared by every task in a worker."""
+
+    def __init__(self):
+        self._models: Dict[str, Any] = {}
+        self._stats: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._tokenizer_ready = False
+        self.logger = logging.getLogger(__name__)
+
+    def get(self, model_name: str = DEFAULT_MODEL_NAME, backend: Optional[str] = None):
+        key = model_cache_key(model_name, backend)
+        model = self._models.get(key)
+        if model is not None:
+            return model
+
+        with self._lock:
+            if key not in self._models:
+                self._models[key] = self._load(model_name, backend or DEFAULT_BACKEND)
+            return self._models[key]
+
+    def warmup(self, model_name: str = DEFAULT_MODEL_NAME, backend: Optional[str] = None) -> Dict[str, Any]:
+        self.ensure_tokenizer_data()
+        model = self.get(model_name, backend)
+
+        started = time.perf_counter()
+        model.encode(WARMUP_SENTENCES)
+        warmup_seconds = time.perf_counter() - started
+
+        key = model_cache_key(model_name, backend)
+        stats = self._stats[key]
+        stats["warmup_seconds"] = round(warmup_seconds, 3)
+        self.logger.info(f"Warmed up {key} in {warmup_seconds:.3f}s")
+        return dict(stats)
+
+    def ensure_tokenizer_data(self) -> None:
+        if self._tokenizer_ready:
+            return
+
+        import nltk
+
+        with self._lock:
+            if self._tokenizer_ready:
+                return
+            try:
+                nltk.data.find("tokenizers/punkt_tab")
+            except LookupError:
+                nltk.download("punkt_tab")
+            self._tokenizer_ready = True
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {name: dict(stats) for name, stats in self._stats.items()}
+
+    def is_loaded(self, model_name: str = DEFAULT_MODEL_NAME, backend: Optional[str] = None) -> bool:
+        return model_cache_key(model_name, backend) in self._models
+
+    def _load(self, model_name: str, backend: str):
+        if backend not in SUPPORTED_BACKENDS:
+            raise ValueError(f"Unknown encoder backend: {backend}")
+
+        key = model_cache_key(model_name, backend)
+        rss_before = get_rss_bytes()
+        started = time.perf_counter()
+        model = self._load_onnx(model_name, backend == "onnx-int8") if backend != "torch" else self._load_torch(model_name)
+        load_seconds = time.perf_counter() - started
+        rss_after = get_rss_bytes()
+
+        self._stats[key] = {
+            "load_seconds": round(load_seconds, 3),
+            "parameters_bytes": self._parameters_bytes(model),
+            "rss_delta_bytes": max(0, rss_after - rss_before),
+            "rss_bytes": rss_after,
+            "loaded_at": time.time(),
+            "pid": os.getpid(),
+            "backend": backend,
+        }
+        self.logger.info(
+            f"Loaded {key} in {load_seconds:.3f}s "
+            f"(params {(self._stats[key]['parameters_bytes'] or 0) / 2**20:.1f} MiB, "
+            f"rss +{self._stats[key]['rss_delta_bytes'] / 2**20:.1f} MiB)"
+        )
+        return model
+
+    @staticmethod
+    def _load_torch(model_name: str):
+        from sentence_transformers import SentenceTransformer
+
+        return SentenceTransformer(model_name)
+
+    def _load_onnx(self, model_name: str, quantized: bool):
+        from sentence_transformers import SentenceTransformer
+
+        if not quantized:
+            return SentenceTransformer(model_name, backend="onnx")
+
+        export_dir = os.path.join(
+            MODEL_EXPORT_DIR, f"{model_name.replace('/', '__')}-qint8-{ONNX_QUANTIZATION_CONFIG}"
+        )
+        file_name = f"onnx/model_qint8_{ONNX_QUANTIZATION_CONFIG}.onnx"
+        if not os.path.isdir(export_dir):
+            self._export_quantized(model_name, export_dir)
+
+        return SentenceTransformer(export_dir, backend="onnx", model_kwargs={"file_name": file_name})
+
+    def _export_quantized(self, model_name: str, export_dir: str) -> None:
+        from sentence_transformers import SentenceTransformer, export_dynamic_quantized_onnx_model
+
+        # export next to the target and rename, so concurrent workers never load a half-written model
+        tmp_dir = f"{export_dir}.{os.getpid()}.tmp"
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+        started = time.perf_counter()
+        model = SentenceTransformer(model_name, backend="onnx")
+        model.save(tmp_dir)
+        export_dynamic_quantized_onnx_model(model, ONNX_QUANTIZATION_CONFIG, tmp_dir)
+
+        try:
+            os.rename(tmp_dir, export_dir)
+        except OSError:
+            # another process finished its export first
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+        self.logger.info(
+            f"Exported {model_name} to int8 ONNX ({ONNX_QUANTIZATION_CONFIG}) "
+            f"in {time.perf_counter() - started:.1f}s"
+        )
+
+    @staticmethod
+    def _parameters_bytes(model) -> Optional[int]:
+        try:
+            # ONNX backends keep their weights outside torch and report no parameters
+            return sum(p.numel() * p.element_size() for p in model.parameters()) or None
+        except Exception:
+            return None
+
+
+_registry = None
+
+def get_model_registry() -> ModelRegistry:
+    global _registry
+    if _registry is None:
+        _registry = ModelRegistry()
+
+    return _registry
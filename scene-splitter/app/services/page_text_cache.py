@@ -0,0 +1,104 @@
+import os
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.models import Document
+from app.repositories.page_cache_repository import PageCacheRepository
+from app.services.blob_storage import get_blob_storage
+from app.services.pdf_extractor import (
+    PDF_EXTRACTION_SHARD_PAGES,
+    PageResult,
+    PdfTextExtractorService,
+    count_pdf_pages,
+    laparams_fingerprint,
+)
+
+PAGE_CACHE_ENABLED = os.getenv("PAGE_CACHE_ENABLED", "true").lower() == "true"
+PAGE_CACHE_MAX_AGE_DAYS = int(os.getenv("PAGE_CACHE_MAX_AGE_DAYS", "30"))
+PAGE_CACHE_MAX_BYTES = int(os.getenv("PAGE_CACHE_MAX_BYTES", str(2 * 1024 ** 3)))
+
+
+class PageTextCacheService:
+    def __init__(self, session: Session, enabled: bool = PAGE_CACHE_ENABLED):
+        self.session = session
+        self.repo = PageCacheRepository(session)
+        self.storage = get_blob_storage()
+        self.enabled = enabled
+        self.fingerprint = laparams_fingerprint()
+
+    def plan(self, document: Document, start_page: int, end_page: int) -> Tuple[List[int], Dict[int, str], List[int]]:
+        """(wanted page indexes, cached page texts, indexes still to extract) for a page range."""
+        if document.page_count is None:
+            with self.storage.open_local(document.storage_key) as pdf_path:
+                document.page_count = count_pdf_pages(pdf_path)
+            self.session.commit()
+
+        start_page = max(1, start_page)
+        end_page = min(end_page, document.page_count)
+        if start_page > end_page:
+            raise ValueError("start_page cannot be greater than end_page")
+
+        wanted = list(range(start_page - 1, end_page))
+        pages: Dict[int, str] = {}
+        if self.enabled:
+            pages = self.repo.get_pages(document.content_hash, self.fingerprint, wanted)
+        missing = [index for index in wanted if index not in pages]
+        return wanted, pages, missing
+
+    @staticmethod
+    def shard(page_indexes: List[int], shard_pages: int = PDF_EXTRACTION_SHARD_PAGES) -> List[List[int]]:
+        shard_pages = max(1, shard_pages)
+        return [page_indexes[i:i + shard_pages] for i in range(0, len(page_indexes), shard_pages)]
+
+    def extract_pages(
+        self,
+        document: Document,
+        page_indexes: List[int],
+        progress: Optional[Callable[[int], None]] = None,
+        processes: Optional[int] = None,
+    ) -> Tuple[List[PageResult], dict]:
+        """Extracts pages of the document and caches them; returns the pages and the timing summary."""
+        with self.storage.open_local(document.storage_key) as pdf_path:
+            options = {} if processes is None else {"processes": processes}
+            extractor = PdfTextExtractorService(pdf_path, total_pages=document.page_count, **options)
+            extracted = extractor.extract_page_indexes(page_indexes, progress)
+        if self.enabled and extracted:
+            self.repo.put_pages(document.content_hash, self.fingerprint, extracted)
+        return extracted, extractor.timing_summary()
+
+    @staticmethod
+    def assemble(wanted: List[int], pages: Dict[int, str]) -> str:
+        return "".join(pages[index] for index in wanted).strip()
+
+    def extract_text(
+        self,
+        document: Document,
+        start_page: int,
+        end_page: int,
+        progress: Optional[Callable[[int, int], None]] = None,
+    ) -> Tuple[str, dict]:
+        """progress is called with (pages done, pages wanted); cached pages count as done up front."""
+        started = time.perf_counter()
+
+        wanted, pages, missing = self.plan(document, start_page, end_page)
+        cached_count = len(wanted) - len(missing)
+        page_progress = None
+        if progress is not None:
+            progress(cached_count, len(wanted))
+            page_progress = lambda extracted_count: progress(cached_count + extracted_count, len(wanted))
+
+        timing = {"pages": 0}
+        if missing:
+            extracted, timing = self.extract_pages(document, missing, page_progress)
+            pages.update((index, text) for index, text, _ in extracted)
+
+        stats = {
+            "pages": len(wanted),
+            "cached_pages": cached_count,
+            "extracted_pages": len(missing),
+            "seconds": round(time.perf_counter() - started, 3),
+            "extraction": timing,
+        }
+        return self.assemble(wanted, pages), stats
@@ -1,33 +1,171 @@
-from io import BytesIO
-from typing import List
+import hashlib
+import logging
+import math
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from io import StringIO
+from typing import Callable, List, Optional, Tuple
 
-from PyPDF2 import PdfReader
-from pdfminer.high_level import extract_text
+import pdfminer
+from pdfminer.converter import TextConverter
 from pdfminer.layout import LAParams
+from pdfminer.pdfdocument import PDFDocument
+from pdfminer.pdfinterp import PDFResourceManager, PDFPageInterpreter
+from pdfminer.pdfpage import PDFPage
+from pdfminer.pdfparser import PDFParser
+from pdfminer.pdftypes import resolve1
+
+PDF_EXTRACTION_PROCESSES = int(os.getenv("PDF_EXTRACTION_PROCESSES", str(os.cpu_count() or 1)))
+PDF_EXTRACTION_SHARD_PAGES = int(os.getenv("PDF_EXTRACTION_SHARD_PAGES", "16"))
+
+# (zero-based page index, page text, extraction seconds)
+PageResult = Tuple[int, str, float]
+# called with the number of pages extracted so far
+PageProgress = Callable[[int], None]
+
+
+def _laparams() -> LAParams:
+    return LAParams(
+        char_margin=2.0,
+        word_margin=0.1,
+        line_margin=0.5,
+        boxes_flow=None,
+    )
+
+
+def laparams_fingerprint() -> str:
+    params = sorted(vars(_laparams()).items())
+    return hashlib.sha1(f"{pdfminer.__version__}:{params!r}".encode("utf-8")).hexdigest()
+
+
+def count_pdf_pages(pdf_path: str) -> int:
+    with open(pdf_path, "rb") as fp:
+        document = PDFDocument(PDFParser(fp))
+        pages = resolve1(document.catalog.get("Pages"))
+        count: Optional[int] = resolve1(pages.get("Count")) if isinstance(pages, dict) else None
+        if isinstance(count, int):
+            return count
+        return sum(1 for _ in PDFPage.create_pages(document))
+
+
+def _extract_shard(pdf_path: str, page_indexes: List[int]) -> List[PageResult]:
+    wanted = set(page_indexes)
+    last = max(page_indexes)
+    results: List[PageResult] = []
+
+    with open(pdf_path, "rb") as fp:
+        document = PDFDocument(PDFParser(fp))
+        manager = PDFResourceManager(caching=True)
+        laparams = _laparams()
+
+        for index, page in enumerate(PDFPage.create_pages(document)):
+            if index > last:
+                break
+            if index not in wanted:
+                continue
+
+            started = time.perf_counter()
+            output = StringIO()
+            converter = TextConverter(manager, output, codec="utf-8", laparams=laparams)
+            PDFPageInterpreter(manager, converter).process_page(page)
+            converter.close()
+            results.append((index, output.getvalue(), time.perf_counter() - started))
+
+    return results
 
 
 class PdfTextExtractorService:
 
-    def __init__(self, pdf_bytes: bytes):
-        self.pdf_bytes = pdf_bytes
-        self.reader = PdfReader(BytesIO(pdf_bytes))
-        self.total_pages = len(self.reader.pages)
+    def __init__(
+        self,
+        pdf_path: str,
+        processes: int = PDF_EXTRACTION_PROCESSES,
+        shard_pages: int = PDF_EXTRACTION_SHARD_PAGES,
+        total_pages: Optional[int] = None
+    ):
+        self.pdf_path = pdf_path
+        self.processes = max(1, processes)
+        self.shard_pages = max(1, shard_pages)
+        self.total_pages = total_pages if total_pages is not None else count_pdf_pages(pdf_path)
+        self.page_timings: List[Tuple[int, float]] = []
+        self.logger = logging.getLogger(__name__)
 
     def extract_text(self, start_page: int, end_page: int) -> str:
+        pages = self.extract_pages(start_page, end_page)
+        return "".join(text for _, text in pages).strip()
+
+    def extract_pages(self, start_page: int, end_page: int) -> List[Tuple[int, str]]:
         start_page = max(1, start_page)
         end_page = min(end_page, self.total_pages)
 
         if start_page > end_page:
             raise ValueError("start_page cannot be greater than end_page")
 
-        page_numbers: List[int] = list(range(start_page - 1, end_page))
+        results = self.extract_page_indexes(list(range(start_page - 1, end_page)))
+        return [(index + 1, text) for index, text, _ in results]
+
+    def extract_page_indexes(self, page_indexes: List[int], progress: Optional[PageProgress] = None) -> List[PageResult]:
+        if not page_indexes:
+            self.page_timings = []
+            return []
+
+        results = self._run_shards(self._shards(sorted(page_indexes)), progress)
+        results.sort(key=lambda result: result[0])
+
+        self.page_timings = [(index + 1, seconds) for index, _, seconds in results]
+        return results
+
+    def timing_summary(self, slowest: int = 5) -> dict:
+        if not self.page_timings:
+            return {"pages": 0}
+        seconds = [s for _, s in self.page_timings]
+        return {
+            "pages": len(seconds),
+            "total_page_seconds": round(sum(seconds), 3),
+            "avg_page_seconds": round(sum(seconds) / len(seconds), 4),
+            "slowest_pages": [
+                {"page": page, "seconds": round(s, 3)}
+                for page, s in sorted(self.page_timings, key=lambda t: t[1], reverse=True)[:slowest]
+            ],
+        }
+
+    def _shards(self, page_indexes: List[int]) -> List[List[int]]:
+        shard_count = max(self.processes, math.ceil(len(page_indexes) / self.shard_pages))
+        shard_size = max(1, math.ceil(len(page_indexes) / shard_count))
+        return [page_indexes[i:i + shard_size] for i in range(0, len(page_indexes), shard_size)]
+
+    def _run_shards(self, shards: List[List[int]], progress: Optional[PageProgress] = None) -> List[PageResult]:
+        if self.processes == 1 or len(shards) == 1:
+            return self._run_sequential(shards, progress)
+
+        if multiprocessing.current_process().daemon:
+            # Celery prefork children are daemonic and cannot fork a pool; the workers fan
+            # page ranges out as tasks instead and extract each one with processes=1
+            self.logger.error(
+                f"PDF extraction asked for {self.processes} processes inside a daemonic process, "
+                f"extracting {sum(map(len, shards))} pages sequentially"
+            )
+            return self._run_sequential(shards, progress)
 
-        laparams = LAParams(
-            char_margin=2.0,
-            word_margin=0.1,
-            line_margin=0.5,
-            boxes_flow=None,
-        )
+        with ProcessPoolExecutor(max_workers=min(self.processes, len(shards))) as pool:
+            try:
+                futures = [pool.submit(_extract_shard, self.pdf_path, shard) for shard in shards]
+            except (AssertionError, OSError) as e:
+                self.logger.error(f"Process pool unavailable, extracting pages sequentially: {e}")
+                return self._run_sequential(shards, progress)
+            results: List[PageResult] = []
+            for future in as_completed(futures):
+                results.extend(future.result())
+                if progress is not None:
+                    progress(len(results))
+            return results
 
-        text = extract_text(BytesIO(self.pdf_bytes), page_numbers=page_numbers, laparams=laparams)
-        return text.strip()
+    def _run_sequential(self, shards: List[List[int]], progress: Optional[PageProgress]) -> List[PageResult]:
+        results: List[PageResult] = []
+        for shard in shards:
+            results.extend(_extract_shard(self.pdf_path, shard))
+            if progress is not None:
+                progress(len(results))
+        return results
@@ -0,0 +1,91 @@
+from typing import Any, Dict, List
+from sqlalchemy.orm import Session
+
+from app.repositories.processing_job_repository import ProcessingJobRepository
+from app.services.job_status import is_finalized
+from app.services.scene_boundary_service import SceneBoundaryService, SceneBoundaryError, SceneNotFoundError as BoundarySceneNotFound
+from app.services.scene_changes import SceneChangeSet
+from app.services.scene_layout import SceneLayout
+from app.services.scene_merge_service import SceneMergeService, SceneMergeError, SceneNotFoundError as MergeSceneNotFound
+from app.services.scene_split_service import SceneSplitService, SceneSplitError, SceneNotFoundError as SplitSceneNotFound
+from app.services.scene_update_service import SceneUpdateService, SceneUpdateError, SceneNotFoundError as UpdateSceneNotFound
+
+
+class SceneBatchError(Exception):
+    """Base class for batch scene edit errors."""
+
+
+class JobNotFoundError(SceneBatchError):
+    pass
+
+
+class JobNotEditableError(SceneBatchError):
+    pass
+
+
+class SceneBatchOperationError(SceneBatchError):
+    def __init__(self, index: int, op: str, cause: Exception):
+        super().__init__(f"Operation {index} ({op}) failed: {cause}")
+        self.index = index
+        self.op = op
+
+
+class SceneBatchSceneNotFoundError(SceneBatchOperationError):
+    pass
+
+
+class SceneBatchService:
+    """Applies merges, splits, boundary moves and text updates in one transaction.
+
+    Operations run in order and address scenes by their numbers after the
+    previous operations, exactly as if they had been sent one by one. They are
+    applied to a SceneLayout in memory and written with a single flush.
+    """
+
+    def __init__(self, session: Session):
+        self.session = session
+        self.job_repo = ProcessingJobRepository(session)
+        self.boundary_service = SceneBoundaryService(session)
+        self.merge_service = SceneMergeService(session)
+        self.split_service = SceneSplitService(session)
+        self.update_service = SceneUpdateService(session)
+
+    def apply(self, job_id: str, operations: List[Dict[str, Any]]) -> SceneChangeSet:
+        job = self.job_repo.get_by_id(job_id)
+        if not job:
+            raise JobNotFoundError(f"Job {job_id} not found")
+
+        if is_finalized(job.status):
+            raise JobNotEditableError("Job is finalized and scenes cannot be modified")
+
+        try:
+            layout = SceneLayout(self.session, job)
+            for index, operation in enumerate(operations):
+                try:
+                    self._apply_operation(layout, operation)
+                except (BoundarySceneNotFound, MergeSceneNotFound, SplitSceneNotFound, UpdateSceneNotFound) as e:
+                    raise SceneBatchSceneNotFoundError(index, operation["op"], e)
+                except (SceneBoundaryError, SceneMergeError, SceneSplitError, SceneUpdateError) as e:
+                    raise SceneBatchOperationError(index, operation["op"], e)
+
+            changes = layout.flush()
+            self.job_repo.bump_revision(job.id)
+            self.session.commit()
+        except Exception:
+            self.session.rollback()
+            raise
+
+        return changes
+
+    def _apply_operation(self, layout: SceneLayout, operation: Dict[str, Any]) -> None:
+        op = operation["op"]
+        if op == "merge":
+            self.merge_service.apply_merge(layout, operation["scene_numbers"])
+        elif op == "split":
+            self.split_service.apply_split(layout, operation["scene_number"], operation["at_sentence"])
+        elif op == "move_boundary":
+            self.boundary_service.apply_move(layout, operation["scene_number"], operation["sentences"])
+        elif op == "update":
+            self.update_service.apply_patches(layout, operation["scenes"])
+        else:
+            raise ValueError(f"Unknown scene operation: {op}")
@@ -0,0 +1,64 @@
+from sqlalchemy.orm import Session
+
+from app.services.scene_layout import SceneLayout
+
+
+class SceneBoundaryError(Exception):
+    """Base class for scene boundary errors."""
+
+
+class SceneBoundaryValidationError(SceneBoundaryError):
+    pass
+
+
+class SceneNotFoundError(SceneBoundaryError):
+    pass
+
+
+class SceneBoundaryService:
+    separator = " "
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def apply_move(self, layout: SceneLayout, scene_number: int, sentences: int) -> None:
+        """Moves the boundary between a scene of the layout and the next one by whole sentences.
+
+        A positive count hands the first sentences of the next scene to this one,
+        a negative count hands the last sentences of this scene to the next one.
+        """
+        if sentences == 0:
+            raise SceneBoundaryValidationError("sentences must not be zero")
+
+        scene = layout.get(scene_number)
+        following = layout.get(scene_number + 1)
+        if scene is None or following is None:
+            missing = scene_number if scene is None else scene_number + 1
+            raise SceneNotFoundError(f"Scene {missing} not found for job {layout.job.id}")
+
+        head = layout.piece(scene)
+        tail = layout.piece(following)
+        if sentences > 0:
+            if sentences >= len(tail.offsets):
+                raise SceneBoundaryValidationError(
+                    f"Scene {scene_number + 1} has {len(tail.offsets)} sentences, "
+                    f"moving {sentences} would empty it; merge the scenes instead"
+                )
+            moved, tail = layout.cut(tail, sentences)
+            head = layout.join([head, moved], self.separator)
+        else:
+            if -sentences >= len(head.offsets):
+                raise SceneBoundaryValidationError(
+                    f"Scene {scene_number} has {len(head.offsets)} sentences, "
+                    f"moving {-sentences} would empty it; merge the scenes instead"
+                )
+            head, moved = layout.cut(head, len(head.offsets) + sentences)
+            tail = layout.join([moved, tail], self.separator)
+
+        layout.assign(scene, head)
+        layout.assign(following, tail)
+        if scene.end_sentence_idx is not None and following.start_sentence_idx is not None:
+            scene.end_sentence_idx += sentences
+            following.start_sentence_idx += sentences
+        # the boundary no longer sits where the segmenter put it
+        following.boundary_confidence = None
@@ -0,0 +1,41 @@
+from dataclasses import dataclass, field
+from typing import Dict, List, Set
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+
+from app.models import Scene
+
+
+@dataclass
+class SceneChangeSet:
+    """What an edit did to the scenes of a job, so responses can carry a delta instead of the whole job.
+
+    shifts are applied in order: every scene numbered above after_scene_number
+    at that point moved by shift.
+    """
+
+    changed_ids: Set[UUID] = field(default_factory=set)
+    removed_ids: List[UUID] = field(default_factory=list)
+    shifts: List[Dict[str, int]] = field(default_factory=list)
+
+    def changed(self, scene: Scene) -> None:
+        self.changed_ids.add(scene.id)
+
+    def removed(self, scene_ids: List[UUID]) -> None:
+        self.removed_ids.extend(scene_ids)
+        self.changed_ids.difference_update(scene_ids)
+
+    def shifted(self, after_scene_number: int, shift: int) -> None:
+        if shift:
+            self.shifts.append({"after_scene_number": after_scene_number, "shift": shift})
+
+    def changed_scenes(self, session: Session) -> List[Scene]:
+        if not self.changed_ids:
+            return []
+        return (
+            session.query(Scene)
+            .filter(Scene.id.in_(self.changed_ids))
+            .order_by(Scene.scene_number)
+            .all()
+        )
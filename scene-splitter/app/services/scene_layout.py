@@ -0,0 +1,203 @@
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple, Union
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+
+from app.models import Scene
+from app.repositories.scene_repository import SceneRepository
+from app.services.scene_changes import SceneChangeSet
+from app.services.scene_metrics_service import SceneMetricsService
+from app.services.sentence_offsets import SentenceOffsets, shift_offsets
+
+
+@dataclass
+class ScenePiece:
+    """A scene text or a part of one, with sentence offsets relative to the piece.
+
+    start_char is set while the piece is still a span of the job text.
+    """
+
+    text: str
+    offsets: SentenceOffsets
+    start_char: Optional[int] = None
+
+
+class SceneLayout:
+    """The ordered scenes of a job while edits are applied to them in memory.
+
+    A scene is loaded only when an edit touches it; runs of scenes no edit
+    touched stay ranges of their stored numbers. flush() renumbers those runs
+    in one UPDATE however long the job is, and recomputes metrics once for
+    every scene an edit changed, from the sentence offsets the edits kept.
+    """
+
+    def __init__(self, session: Session, job):
+        self.session = session
+        self.job = job
+        self.scene_repo = SceneRepository(session)
+        self.metrics = SceneMetricsService()
+        scene_count = self.scene_repo.count(job.id)
+        self.entries: List[Union[Scene, range]] = [range(1, scene_count + 1)] if scene_count else []
+        self.added: List[Scene] = []
+        self.removed: List[Scene] = []
+        self.dirty: Dict[UUID, Scene] = {}
+        self.changes = SceneChangeSet()
+
+    def __len__(self) -> int:
+        return sum(len(entry) if isinstance(entry, range) else 1 for entry in self.entries)
+
+    def get(self, scene_number: int) -> Optional[Scene]:
+        index = self._locate(scene_number)
+        return None if index is None else self.entries[index]
+
+    def insert(self, after_scene_number: int, scene: Scene) -> None:
+        """Places a new scene after the given one; the scenes after it move down."""
+        index = 0 if after_scene_number == 0 else self._locate(after_scene_number) + 1
+        self.changes.shifted(after_scene_number, 1)
+        self.entries.insert(index, scene)
+        self.added.append(scene)
+
+    def remove(self, scene_number: int, count: int = 1) -> None:
+        """Drops count scenes starting at scene_number; the scenes after them move up."""
+        for _ in range(count):
+            scene = self.entries.pop(self._locate(scene_number))
+            self.dirty.pop(scene.id, None)
+            if scene in self.added:
+                self.added.remove(scene)
+            else:
+                self.removed.append(scene)
+                self.changes.removed([scene.id])
+        self.changes.shifted(scene_number + count - 1, -count)
+
+    def touch(self, scene: Scene) -> None:
+        """Marks a scene whose metrics must be recomputed on flush."""
+        self.dirty[scene.id] = scene
+
+    def text(self, scene: Scene) -> str:
+        # new scenes join the job only on flush, so spans are sliced from the job text here
+        if scene.scene_text is None and scene.start_char is not None and self.job.job_text is not None:
+            return self.job.job_text.slice(scene.start_char, scene.end_char)
+        return scene.text
+
+    def piece(self, scene: Scene) -> ScenePiece:
+        text = self.text(scene)
+        offsets = scene.sentence_offsets
+        if offsets is None:
+            # legacy rows without stored offsets are tokenized once, here
+            offsets = self.metrics.sentence_offsets(text)
+        start_char = scene.start_char if scene.scene_text is None else None
+        return ScenePiece(text, [list(offset) for offset in offsets], start_char)
+
+    @staticmethod
+    def cut(piece: ScenePiece, at: int) -> Tuple[ScenePiece, ScenePiece]:
+        """Splits a piece before its at-th sentence (0-based); both halves keep at least one sentence."""
+        head_end = piece.offsets[at - 1][1]
+        tail_start = piece.offsets[at][0]
+        head = ScenePiece(piece.text[:head_end], piece.offsets[:at], piece.start_char)
+        tail = ScenePiece(
+            piece.text[tail_start:],
+            shift_offsets(piece.offsets[at:], -tail_start),
+            None if piece.start_char is None else piece.start_char + tail_start,
+        )
+        return head, tail
+
+    def join(self, pieces: List[ScenePiece], separator: str) -> ScenePiece:
+        """Pieces join with the separator; spans the job text already joins that way stay one span."""
+        offsets: SentenceOffsets = []
+        if self._adjacent(pieces, separator):
+            start = pieces[0].start_char
+            end = pieces[-1].start_char + len(pieces[-1].text)
+            for piece in pieces:
+                offsets.extend(shift_offsets(piece.offsets, piece.start_char - start))
+            return ScenePiece(self.job.job_text.slice(start, end), offsets, start)
+
+        position = 0
+        for piece in pieces:
+            offsets.extend(shift_offsets(piece.offsets, position))
+            position += len(piece.text) + len(separator)
+        return ScenePiece(separator.join(piece.text for piece in pieces), offsets)
+
+    def _adjacent(self, pieces: List[ScenePiece], separator: str) -> bool:
+        # a gap, an overlap or another separator between the spans would change the text
+        job_text = self.job.job_text
+        if job_text is None or any(piece.start_char is None for piece in pieces):
+            return False
+        for previous, piece in zip(pieces, pieces[1:]):
+            previous_end = previous.start_char + len(previous.text)
+            if piece.start_char - previous_end != len(separator):
+                return False
+            if job_text.slice(previous_end, piece.start_char) != separator:
+                return False
+        return True
+
+    def assign(self, scene: Scene, piece: ScenePiece) -> None:
+        if piece.start_char is not None:
+            scene.scene_text = None
+            scene.start_char = piece.start_char
+            scene.end_char = piece.start_char + len(piece.text)
+        else:
+            scene.scene_text = piece.text
+            scene.start_char = scene.end_char = None
+        scene.sentence_offsets = piece.offsets
+        self.touch(scene)
+
+    def flush(self) -> SceneChangeSet:
+        """Writes the layout in the current transaction; the caller commits."""
+        self.scene_repo.delete_ids([scene.id for scene in self.removed])
+
+        # the untouched runs move first: loaded scenes still hold their stored numbers,
+        # which no run covers, and new scenes are not in the session yet
+        runs = []
+        numbered: List[Tuple[Scene, int]] = []
+        position = 1
+        for entry in self.entries:
+            if isinstance(entry, range):
+                if entry.start != position:
+                    runs.append((entry.start, entry.stop - 1, position - entry.start))
+                position += len(entry)
+            else:
+                numbered.append((entry, position))
+                position += 1
+        self.scene_repo.shift_ranges(self.job.id, runs)
+
+        for scene, scene_number in numbered:
+            if scene.scene_number != scene_number:
+                scene.scene_number = scene_number
+        for scene in self.added:
+            scene.processing_job = self.job
+            self.session.add(scene)
+
+        for scene in self.dirty.values():
+            self.metrics.apply(scene, scene.sentence_offsets)
+            self.changes.changed(scene)
+        return self.changes
+
+    def _locate(self, scene_number: int) -> Optional[int]:
+        """Index of the entry holding the scene, loading it out of its stored range first."""
+        if scene_number < 1:
+            return None
+
+        position = 1
+        for index, entry in enumerate(self.entries):
+            if not isinstance(entry, range):
+                if position == scene_number:
+                    return index
+                position += 1
+                continue
+
+            if scene_number < position + len(entry):
+                stored_number = entry[scene_number - position]
+                scene = (
+                    self.session.query(Scene)
+                    .filter(Scene.processing_job_id == self.job.id, Scene.scene_number == stored_number)
+                    .first()
+                )
+                if scene is None:
+                    return None
+                before = range(entry.start, stored_number)
+                after = range(stored_number + 1, entry.stop)
+                self.entries[index:index + 1] = [part for part in (before, scene, after) if not isinstance(part, range) or part]
+                return index + (1 if before else 0)
+            position += len(entry)
+        return None
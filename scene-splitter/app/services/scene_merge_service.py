@@ -1,11 +1,11 @@
 from typing import List
-from enum import Enum
 from sqlalchemy.orm import Session
 
 from app.models import Scene
 from app.repositories.processing_job_repository import ProcessingJobRepository
-from app.models.enums import ProcessingStatus
-from app.services.scene_metrics_service import SceneMetricsService
+from app.services.job_status import is_finalized
+from app.services.scene_changes import SceneChangeSet
+from app.services.scene_layout import SceneLayout
 
 
 class SceneMergeError(Exception):
@@ -29,70 +29,47 @@ class SceneNotFoundError(SceneMergeError):
 
 
 class SceneMergeService:
+    separator = "\n\n"
+
     def __init__(self, session: Session):
         self.session = session
         self.job_repo = ProcessingJobRepository(session)
-        self.metrics = SceneMetricsService()
 
-    def merge_scenes(self, job_id: str, scene_numbers: List[int]) -> List[Scene]:
+    def merge_scenes(self, job_id: str, scene_numbers: List[int]) -> SceneChangeSet:
         numbers = self._validate_scene_numbers(scene_numbers)
 
         job = self.job_repo.get_by_id(job_id)
         if not job:
             raise JobNotFoundError(f"Job {job_id} not found")
 
-        status_value = self._normalize_status(job.status)
-        if status_value in {
-            ProcessingStatus.APPROVED.value,
-            ProcessingStatus.COMPLETED.value,
-            "approved",
-            "completed",
-        }:
+        if is_finalized(job.status):
             raise JobNotEditableError("Job is finalized and scenes cannot be modified")
 
-        scenes = (
-            self.session.query(Scene)
-            .filter(Scene.processing_job_id == job.id, Scene.scene_number.in_(numbers))
-            .order_by(Scene.scene_number)
-            .all()
-        )
+        layout = SceneLayout(self.session, job)
+        self.apply_merge(layout, numbers)
+        changes = layout.flush()
+        self.job_repo.bump_revision(job.id)
+        self.session.commit()
+        return changes
 
-        if len(scenes) != len(numbers):
-            found_numbers = {scene.scene_number for scene in scenes}
-            missing = [num for num in numbers if num not in found_numbers]
+    def apply_merge(self, layout: SceneLayout, scene_numbers: List[int]) -> Scene:
+        """Merges consecutive scenes of the layout into the first one, their texts joined by the separator."""
+        numbers = self._validate_scene_numbers(scene_numbers)
+        scenes = [layout.get(number) for number in numbers]
+
+        if any(scene is None for scene in scenes):
+            missing = [num for num, scene in zip(numbers, scenes) if scene is None]
             missing_list = ", ".join(str(num) for num in missing)
-            raise SceneNotFoundError(f"Scenes with numbers [{missing_list}] not found for job {job_id}")
+            raise SceneNotFoundError(f"Scenes with numbers [{missing_list}] not found for job {layout.job.id}")
 
         merged_scene = scenes[0]
-        merged_scene.scene_number = numbers[0]
-        merged_scene.scene_text = "\n\n".join(scene.scene_text for scene in scenes)
-        merged_scene.start_sentence_idx = None
-        merged_scene.end_sentence_idx = None
-        merged_scene.boundary_confidence = None
-        self.metrics.apply(merged_scene)
-
-        for scene in scenes[1:]:
-            self.session.delete(scene)
-
-        shift = len(numbers) - 1
-        if shift:
-            following_scenes = (
-                self.session.query(Scene)
-                .filter(Scene.processing_job_id == job.id, Scene.scene_number > numbers[-1])
-                .order_by(Scene.scene_number)
-                .all()
-            )
-            for scene in following_scenes:
-                scene.scene_number -= shift
-
-        self.session.commit()
-
-        return (
-            self.session.query(Scene)
-            .filter(Scene.processing_job_id == job.id)
-            .order_by(Scene.scene_number)
-            .all()
-        )
+        layout.assign(merged_scene, layout.join([layout.piece(scene) for scene in scenes], self.separator))
+        merged_scene.start_sentence_idx = scenes[0].start_sentence_idx
+        merged_scene.end_sentence_idx = scenes[-1].end_sentence_idx
+        # the merged scene keeps the boundary that opened its first part
+        merged_scene.boundary_confidence = scenes[0].boundary_confidence
+        layout.remove(numbers[1], len(numbers) - 1)
+        return merged_scene
 
     @staticmethod
     def _validate_scene_numbers(scene_numbers: List[int]) -> List[int]:
@@ -111,13 +88,3 @@ class SceneMergeService:
                 raise SceneMergeValidationError("Scene numbers must be consecutive")
 
         return numbers
-
-    @staticmethod
-    def _normalize_status(raw_status: object) -> str:
-        if isinstance(raw_status, Enum):
-            return raw_status.value
-        if isinstance(raw_status, str) and raw_status.startswith("ProcessingStatus."):
-            name = raw_status.split(".", 1)[1]
-            if name in ProcessingStatus.__members__:
-                return ProcessingStatus[name].value
-        return str(raw_status)
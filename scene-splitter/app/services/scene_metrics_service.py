@@ -1,36 +1,21 @@
-import re
-import nltk
+from typing import Optional
 
 from app.models import Scene
+from app.repositories.scene_repository import scene_search_vector
+from app.services.sentence_offsets import SentenceOffsets
+from app.services.sentence_tokenizer import get_sentence_tokenizer
 
 
 class SceneMetricsService:
-    def __init__(self) -> None:
-        self._ensure_tokenizer()
-
-    def apply(self, scene: Scene) -> None:
-        text = scene.scene_text or ""
+    def apply(self, scene: Scene, sentence_offsets: Optional[SentenceOffsets] = None) -> None:
+        text = scene.text
         scene.word_count = len(text.split())
         scene.char_count = len(text)
-        try:
-            sentences = nltk.sent_tokenize(text, language="russian")
-            scene.sentence_count = len(sentences)
-        except Exception:
-            scene.sentence_count = self._fallback_sentence_count(text)
-
-    def _ensure_tokenizer(self) -> None:
-        try:
-            nltk.data.find("tokenizers/punkt_tab")
-        except LookupError:
-            try:
-                nltk.download("punkt_tab")
-            except Exception:
-                pass
-
-    @staticmethod
-    def _fallback_sentence_count(text: str) -> int:
-        if not text.strip():
-            return 0
+        if sentence_offsets is None:
+            sentence_offsets = self.sentence_offsets(text)
+        scene.sentence_offsets = sentence_offsets
+        scene.sentence_count = len(sentence_offsets)
+        scene.search_vector = scene_search_vector(text)
 
-        parts = re.split(r"[.!?]+", text)
-        return len([p for p in parts if p.strip()])
+    def sentence_offsets(self, text: str) -> SentenceOffsets:
+        return get_sentence_tokenizer().offsets(text)
@@ -1,10 +1,10 @@
 from typing import List
 from sqlalchemy.orm import Session
-import re
-import nltk
 
 from app.models import Scene
 from app.repositories.processing_job_repository import ProcessingJobRepository
+from app.services.sentence_offsets import slice_sentences
+from app.services.sentence_tokenizer import get_sentence_tokenizer
 
 
 class SceneQueryError(Exception):
@@ -23,7 +23,6 @@ class SceneQueryService:
     def __init__(self, session: Session):
         self.session = session
         self.job_repo = ProcessingJobRepository(session)
-        self._ensure_tokenizer()
 
     def get_scene_sentences(self, job_id: str, scene_number: int) -> List[str]:
         job = self.job_repo.get_by_id(job_id)
@@ -38,24 +37,9 @@ class SceneQueryService:
         if not scene:
             raise SceneNotFoundError(f"Scene {scene_number} not found for job {job_id}")
 
-        text = scene.scene_text or ""
-        try:
-            return nltk.sent_tokenize(text, language="russian")
-        except Exception:
-            return self._fallback_sentences(text)
-
-    def _ensure_tokenizer(self):
-        try:
-            nltk.data.find("tokenizers/punkt_tab")
-        except LookupError:
-            try:
-                nltk.download("punkt_tab")
-            except Exception:
-                pass
-
-    @staticmethod
-    def _fallback_sentences(text: str) -> List[str]:
-        if not text.strip():
-            return []
-        parts = re.split(r"(?<=[.!?])\\s+", text)
-        return [p.strip() for p in parts if p.strip()]
+        text = scene.text
+        if scene.sentence_offsets is not None:
+            return slice_sentences(text, scene.sentence_offsets)
+
+        # scenes saved before offsets were stored
+        return get_sentence_tokenizer().tokenize(text)
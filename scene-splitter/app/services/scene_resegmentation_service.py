@@ -0,0 +1,121 @@
+from typing import List, Dict, Any, Optional
+from sqlalchemy.orm import Session
+
+from app.models import Scene
+from app.repositories.processing_job_repository import ProcessingJobRepository
+from app.services.job_status import is_finalized
+from app.services.scene_splitter import SceneSplitterService
+from app.services.sentence_offsets import slice_sentences
+
+
+class SceneResegmentationError(Exception):
+    """Base class for scene re-segmentation errors."""
+
+
+class JobNotFoundError(SceneResegmentationError):
+    pass
+
+
+class JobNotEditableError(SceneResegmentationError):
+    pass
+
+
+class SceneNotFoundError(SceneResegmentationError):
+    pass
+
+
+class SceneResegmentationService:
+    context_sentences = 8
+
+    def __init__(self, session: Session, splitter: SceneSplitterService):
+        self.session = session
+        self.job_repo = ProcessingJobRepository(session)
+        self.splitter = splitter
+
+    def propose(self, job_id: str, scene_number: int, window: int = 1) -> Dict[str, Any]:
+        job = self.job_repo.get_by_id(job_id)
+        if not job:
+            raise JobNotFoundError(f"Job {job_id} not found")
+
+        if is_finalized(job.status):
+            raise JobNotEditableError("Job is finalized and scenes cannot be modified")
+
+        first = max(1, scene_number - window)
+        last = scene_number + window
+        scenes: List[Scene] = (
+            self.session.query(Scene)
+            .filter(
+                Scene.processing_job_id == job.id,
+                Scene.scene_number >= first - 1,
+                Scene.scene_number <= last + 1,
+            )
+            .order_by(Scene.scene_number)
+            .all()
+        )
+        by_number = {scene.scene_number: scene for scene in scenes}
+        if scene_number not in by_number:
+            raise SceneNotFoundError(f"Scene {scene_number} not found for job {job_id}")
+
+        window_scenes = [scene for scene in scenes if first <= scene.scene_number <= last]
+        first, last = window_scenes[0].scene_number, window_scenes[-1].scene_number
+
+        sentences = [s for scene in window_scenes for s in self._sentences(scene)]
+        before = self._sentences(by_number[first - 1])[-self.context_sentences:] if first - 1 in by_number else []
+        after = self._sentences(by_number[last + 1])[:self.context_sentences] if last + 1 in by_number else []
+
+        offset = window_scenes[0].start_sentence_idx
+        opening_confidence = window_scenes[0].boundary_confidence
+
+        if len(sentences) < 3:
+            valleys: List[int] = []
+            boundaries = self.splitter.get_scene_boundaries(valleys, [], len(sentences))
+        else:
+            embeddings = self.splitter.embed_sentences(before + sentences + after)
+            smoothed = self.splitter.compute_smoothed_similarities(embeddings)
+            # keep only the pairs inside the window; context just stabilises smoothing at the edges
+            smoothed = smoothed[len(before):len(before) + len(sentences) - 1]
+            depths = self.splitter.compute_depth_scores(smoothed)
+            options = self._window_options(job.segmentation_options, len(window_scenes))
+            valleys = self.splitter.select_boundaries(sentences, smoothed, depths, options)
+            boundaries = self.splitter.get_scene_boundaries(valleys, depths, len(sentences))
+
+        groups = self.splitter.group_sentences(sentences, valleys)
+        chunks = [' '.join(group) for group in groups]
+        stats = self.splitter.get_scene_statistics(chunks, groups)
+
+        proposed = []
+        for i, (text, stat, boundary) in enumerate(zip(chunks, stats, boundaries)):
+            start_idx = boundary.get('start_sentence_idx')
+            end_idx = boundary.get('end_sentence_idx')
+            proposed.append({
+                'scene_number': first + i,
+                'scene_text': text,
+                'sentence_count': stat['sentence_count'],
+                'word_count': stat['word_count'],
+                'char_count': stat['char_count'],
+                'start_sentence_idx': offset + start_idx if offset is not None and start_idx is not None else None,
+                'end_sentence_idx': offset + end_idx if offset is not None and end_idx is not None else None,
+                'boundary_confidence': opening_confidence if i == 0 else boundary.get('boundary_confidence'),
+            })
+
+        return {
+            'job_id': str(job.id),
+            'first_scene_number': first,
+            'last_scene_number': last,
+            'scenes': proposed,
+        }
+
+    @staticmethod
+    def _window_options(options: Optional[Dict[str, Any]], scene_count: int) -> Dict[str, Any]:
+        # target_scene_count is for the whole book; a window aims at the scene count it has now
+        window_options = dict(options or {})
+        if window_options.get('target_scene_count') is not None:
+            window_options['target_scene_count'] = scene_count
+        return window_options
+
+    def _sentences(self, scene: Scene) -> List[str]:
+        if scene.sentence_offsets is not None:
+            sentences = slice_sentences(scene.text, scene.sentence_offsets)
+            return [s for s in map(self.splitter.normalize_text, sentences) if s]
+        text = self.splitter.normalize_text(scene.text)
+        return self.splitter.tokenize_sentences(text) if text else []
@@ -0,0 +1,139 @@
+import logging
+from collections import deque
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class OptimalSegmentationService:
+    """Picks boundaries maximising total valley depth under min/max scene length.
+
+    Non-valley positions are only cut when max_length forces it. An optional
+    target scene count is reached through a Lagrangian penalty per boundary.
+    When no segmentation meets both bounds, min_length is dropped with a warning.
+    """
+
+    forced_cut_penalty = 1e-6
+    lagrangian_iterations = 30
+
+    def __init__(
+        self,
+        min_length: int = 1,
+        max_length: Optional[int] = None,
+        target_scene_count: Optional[int] = None,
+    ):
+        self.min_length = max(1, min_length or 1)
+        self.max_length = max_length
+        self.target_scene_count = target_scene_count
+
+    def find_boundaries(
+        self,
+        depths: np.ndarray,
+        valleys: List[int],
+        lengths: np.ndarray,
+    ) -> List[int]:
+        lengths = np.asarray(lengths, dtype=np.float64)
+        n = len(lengths)
+        if n < 2:
+            return []
+
+        gains = np.full(n - 1, -self.forced_cut_penalty)
+        if len(valleys):
+            gains[valleys] = np.asarray(depths, dtype=np.float64)[valleys]
+
+        cumulative = np.concatenate(([0.0], np.cumsum(lengths)))
+        window = self._candidate_windows(cumulative, self.min_length)
+        solved = self._solve(gains, window, penalty=0.0)
+        if solved is None:
+            # max_length always fits, single sentences are allowed to exceed it; min_length goes
+            logger.warning(
+                f"No segmentation of {n} sentences (total length {cumulative[-1]:g}) fits scenes of "
+                f"{self.min_length}..{self.max_length}, segmenting without min_length"
+            )
+            window = self._candidate_windows(cumulative, 1)
+            solved = self._solve(gains, window, penalty=0.0)
+
+        if not self.target_scene_count:
+            return solved[0]
+
+        target = self.target_scene_count - 1
+        spread = float(np.abs(gains).max()) + 1.0
+        low, high = -spread, spread
+        best: Optional[Tuple[int, List[int]]] = None
+
+        for _ in range(self.lagrangian_iterations):
+            penalty = (low + high) / 2
+            boundaries, count = self._solve(gains, window, penalty)
+            if best is None or abs(count - target) < best[0]:
+                best = (abs(count - target), boundaries)
+            if count == target:
+                break
+            if count > target:
+                low = penalty
+            else:
+                high = penalty
+
+        return best[1]
+
+    def _candidate_windows(self, cumulative: np.ndarray, min_length: int) -> Tuple[np.ndarray, np.ndarray]:
+        ends = np.arange(1, len(cumulative))
+        totals = cumulative[1:]
+
+        if self.max_length:
+            lo = np.searchsorted(cumulative, totals - self.max_length, side='left')
+        else:
+            lo = np.zeros(len(ends), dtype=np.int64)
+        hi = np.searchsorted(cumulative, totals - min_length, side='right') - 1
+
+        # a single sentence longer than max_length still has to form a scene
+        lo = np.minimum(lo, ends - 1)
+        hi = np.minimum(hi, ends - 1)
+        return lo, hi
+
+    def _solve(
+        self,
+        gains: np.ndarray,
+        window: Tuple[np.ndarray, np.ndarray],
+        penalty: float,
+    ) -> Optional[Tuple[List[int], int]]:
+        """(boundaries, their count) of the best segmentation, None when no segmentation fits the window."""
+        lo, hi = window
+        n = len(gains) + 1
+        score = np.full(n + 1, -np.inf)
+        count = np.zeros(n + 1, dtype=np.int64)
+        previous = np.full(n + 1, -1, dtype=np.int64)
+        score[0] = 0.0
+
+        candidates = deque()
+        pushed = -1
+        for j in range(1, n + 1):
+            while pushed < hi[j - 1]:
+                pushed += 1
+                if score[pushed] == -np.inf:
+                    continue
+                while candidates and score[candidates[-1]] <= score[pushed]:
+                    candidates.pop()
+                candidates.append(pushed)
+            while candidates and candidates[0] < lo[j - 1]:
+                candidates.popleft()
+            if not candidates:
+                continue
+
+            i = candidates[0]
+            gain = gains[j - 1] - penalty if j < n else 0.0
+            score[j] = score[i] + gain
+            count[j] = count[i] + (1 if j < n else 0)
+            previous[j] = i
+
+        if score[n] == -np.inf:
+            return None
+
+        boundaries = []
+        j = previous[n]
+        while j > 0:
+            boundaries.append(int(j - 1))
+            j = previous[j]
+        boundaries.reverse()
+        return boundaries, int(count[n])
@@ -0,0 +1,209 @@
+import os
+import re
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+from scipy.ndimage import gaussian_filter1d
+
+from app.models.enums import SegmentationMode
+from app.services.job_artifacts import (
+    job_shard_plan_key,
+    job_shard_sentences_key,
+    job_shard_similarities_key,
+    delete_artifact,
+    get_array,
+    get_json,
+    put_array,
+    put_json,
+)
+from app.services.scene_splitter import SceneSplitterService
+from app.services.streaming_scene_splitter import StreamingSceneSplitter
+
+SCENE_SPLITTING_SHARDING = os.getenv("SCENE_SPLITTING_SHARDING", "false").lower() == "true"
+SHARD_SENTENCES = int(os.getenv("SHARD_SENTENCES", "2000"))
+
+_ORDINALS = (
+    "перв|втор|трет|четв[её]рт|пят|шест|седьм|восьм|девят|десят"
+)
+# a heading word opens the sentence with a capital, its number stands alone: "Часть вторая",
+# "ГЛАВА XII", "Chapter 3", but not "Часть второго этажа" or "часть денег"
+_HEADING_END = r"(?=$|[\s.:!?\-—–])"
+_HEADING_NUMBER = (
+    r"(?:\d+"
+    r"|(?=[IVXLCDM])M{0,3}(?:CM|CD|D?C{0,3})(?:XC|XL|L?X{0,3})(?:IX|IV|V?I{0,3})"
+    rf"|(?i:(?:{_ORDINALS})(?:ая|ья|ый|ой|ий)))"
+)
+CHAPTER_HEADING_RE = re.compile(
+    r"^(?:(?:Глава|ГЛАВА|Часть|ЧАСТЬ|Книга|КНИГА|Chapter|CHAPTER|Part|PART|Book|BOOK)\s+"
+    rf"{_HEADING_NUMBER}{_HEADING_END}"
+    rf"|(?:Пролог|ПРОЛОГ|Эпилог|ЭПИЛОГ|Prologue|PROLOGUE|Epilogue|EPILOGUE){_HEADING_END})"
+)
+
+
+def is_chapter_heading(sentence: str) -> bool:
+    return CHAPTER_HEADING_RE.match(sentence) is not None
+
+
+class SceneShardPlanner:
+    """Cuts a text stream into sentence shards, preferring chapter headings as cut points.
+
+    A shard is closed at a chapter heading once it holds half of shard_sentences,
+    and unconditionally at shard_sentences. Every shard file also carries the
+    first sentence of the next shard so that the similarity across the cut is
+    computed exactly once.
+    """
+
+    def __init__(self, splitter: SceneSplitterService, shard_sentences: int = SHARD_SENTENCES):
+        self.splitter = splitter
+        self.shard_sentences = max(2, shard_sentences)
+
+    def plan(self, job_id: str, chunks: Iterable[str]) -> Dict[str, Any]:
+        shards: List[Dict[str, int]] = []
+        chapter_starts: List[int] = []
+        current: List[str] = []
+        start = 0
+        index = 0
+
+        def close(next_sentence: Optional[str]):
+            nonlocal current, start
+            put_json(
+                job_shard_sentences_key(job_id, len(shards)),
+                current + ([next_sentence] if next_sentence is not None else []),
+            )
+            shards.append({'start': start, 'end': index})
+            current = []
+            start = index
+
+        windows = StreamingSceneSplitter(self.splitter).iter_sentence_windows(chunks)
+        for window in windows:
+            for sentence in window:
+                heading = index > 0 and is_chapter_heading(sentence)
+                if heading:
+                    chapter_starts.append(index)
+                if current and (
+                    len(current) >= self.shard_sentences
+                    or (heading and len(current) >= self.shard_sentences // 2)
+                ):
+                    close(sentence)
+                current.append(sentence)
+                index += 1
+
+        if current or not shards:
+            close(None)
+
+        plan = {
+            'sentence_count': index,
+            'shards': shards,
+            'chapter_starts': chapter_starts,
+        }
+        put_json(job_shard_plan_key(job_id), plan)
+        return plan
+
+
+def compute_shard_similarities(splitter: SceneSplitterService, job_id: str, shard_index: int) -> int:
+    sentences = get_json(job_shard_sentences_key(job_id, shard_index))
+    if len(sentences) < 2:
+        similarities = np.array([], dtype=np.float32)
+    else:
+        similarities = splitter.compute_adjacent_similarities(splitter.embed_sentences(sentences))
+    put_array(job_shard_similarities_key(job_id, shard_index), similarities)
+    return len(sentences)
+
+
+def delete_shard_artifacts(job_id: str, plan: Dict[str, Any]) -> None:
+    for shard_index in range(len(plan['shards'])):
+        delete_artifact(job_shard_sentences_key(job_id, shard_index))
+        delete_artifact(job_shard_similarities_key(job_id, shard_index))
+    delete_artifact(job_shard_plan_key(job_id))
+
+
+class SceneShardReconciler:
+    """Stitches per-shard similarities into one curve and segments it like analyze_scenes.
+
+    Shard files are read one at a time and scenes are yielded as they close,
+    so at most one shard of sentences is held. Valleys mode streams the curve
+    as well; optimal mode keeps the similarities and sentence lengths, which
+    its search needs whole, and reads the sentences again to cut the scenes.
+    """
+
+    def __init__(self, splitter: SceneSplitterService):
+        self.splitter = splitter
+        self.scenes_count = 0
+
+    def iter_sentences(self, job_id: str, plan: Dict[str, Any]) -> Iterator[List[str]]:
+        for shard_index, shard in enumerate(plan['shards']):
+            shard_sentences = get_json(job_shard_sentences_key(job_id, shard_index))
+            yield shard_sentences[:shard['end'] - shard['start']]
+
+    def iter_shards(self, job_id: str, plan: Dict[str, Any]) -> Iterator[Tuple[List[str], np.ndarray]]:
+        last = len(plan['shards']) - 1
+        for shard_index, sentences in enumerate(self.iter_sentences(job_id, plan)):
+            similarities = get_array(job_shard_similarities_key(job_id, shard_index))
+            # shard i holds the pairs [start_i, end_i), the last one reaching into shard i + 1
+            expected = len(sentences) if shard_index < last else max(len(sentences) - 1, 0)
+            if len(similarities) != expected:
+                raise ValueError(f"Shard {shard_index} has {len(similarities)} similarities, expected {expected}")
+            yield sentences, similarities
+
+    def reconcile(
+        self,
+        job_id: str,
+        plan: Dict[str, Any],
+        options: Optional[Dict[str, Any]] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """Yields the scene dicts; scenes_count holds their number once the iterator is exhausted."""
+        self.scenes_count = 0
+        options = options or {}
+        if (options.get('mode') or SegmentationMode.VALLEYS.value) == SegmentationMode.VALLEYS.value:
+            scenes = StreamingSceneSplitter(self.splitter).iter_scenes_from_similarities(self.iter_shards(job_id, plan))
+        else:
+            scenes = self._iter_selected_scenes(job_id, plan, options)
+
+        for scene in scenes:
+            self.scenes_count += 1
+            yield scene
+
+    def _iter_selected_scenes(
+        self,
+        job_id: str,
+        plan: Dict[str, Any],
+        options: Dict[str, Any]
+    ) -> Iterator[Dict[str, Any]]:
+        similarities: List[np.ndarray] = []
+        lengths: List[np.ndarray] = []
+        for sentences, shard_similarities in self.iter_shards(job_id, plan):
+            similarities.append(shard_similarities)
+            lengths.append(self.splitter.sentence_lengths(sentences, options))
+
+        sentence_count = plan['sentence_count']
+        valleys: List[int] = []
+        depths = np.array([])
+        if sentence_count >= 3:
+            smoothed = gaussian_filter1d(np.concatenate(similarities), sigma=2.0)
+            depths = self.splitter.compute_depth_scores(smoothed)
+            valleys = self.splitter.select_boundaries(
+                [], smoothed, depths, options, lengths=np.concatenate(lengths)
+            )
+        boundaries = self.splitter.get_scene_boundaries(valleys, depths, sentence_count)
+
+        streaming = StreamingSceneSplitter(self.splitter)
+        if sentence_count == 0:
+            yield streaming.build_scene(1, [], None, None, None)
+            return
+
+        scene_sentences: List[str] = []
+        boundary_index = 0
+        for sentences in self.iter_sentences(job_id, plan):
+            for sentence in sentences:
+                scene_sentences.append(sentence)
+                boundary = boundaries[boundary_index]
+                if len(scene_sentences) == boundary['end_sentence_idx'] - boundary['start_sentence_idx'] + 1:
+                    boundary_index += 1
+                    yield streaming.build_scene(
+                        boundary_index,
+                        scene_sentences,
+                        boundary['start_sentence_idx'],
+                        boundary['end_sentence_idx'],
+                        boundary['boundary_confidence'],
+                    )
+                    scene_sentences = []
@@ -0,0 +1,48 @@
+import uuid
+from sqlalchemy.orm import Session
+
+from app.models import Scene
+from app.services.scene_layout import SceneLayout
+
+
+class SceneSplitError(Exception):
+    """Base class for scene split errors."""
+
+
+class SceneSplitValidationError(SceneSplitError):
+    pass
+
+
+class SceneNotFoundError(SceneSplitError):
+    pass
+
+
+class SceneSplitService:
+    def __init__(self, session: Session):
+        self.session = session
+
+    def apply_split(self, layout: SceneLayout, scene_number: int, at_sentence: int) -> Scene:
+        """Splits a scene of the layout before its at_sentence-th sentence (1-based).
+        Returns the new scene holding the tail."""
+        head = layout.get(scene_number)
+        if not head:
+            raise SceneNotFoundError(f"Scene {scene_number} not found for job {layout.job.id}")
+
+        piece = layout.piece(head)
+        if not 2 <= at_sentence <= len(piece.offsets):
+            raise SceneSplitValidationError(
+                f"Scene {scene_number} has {len(piece.offsets)} sentences, cannot split before sentence {at_sentence}"
+            )
+
+        head_piece, tail_piece = layout.cut(piece, at_sentence - 1)
+        tail = Scene(id=uuid.uuid4(), processing_job_id=layout.job.id, boundary_confidence=None)
+        layout.assign(head, head_piece)
+        layout.assign(tail, tail_piece)
+
+        if head.start_sentence_idx is not None:
+            tail.start_sentence_idx = head.start_sentence_idx + at_sentence - 1
+            tail.end_sentence_idx = head.end_sentence_idx
+            head.end_sentence_idx = tail.start_sentence_idx - 1
+
+        layout.insert(scene_number, tail)
+        return tail
@@ -1,19 +1,43 @@
-from typing import List, Tuple
+from typing import Callable, List, Tuple, Dict, Any, Optional
 import numpy as np
-import nltk
 import re
-from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
 from scipy.ndimage import gaussian_filter1d
 
+from app.models.enums import SegmentationMode, SegmentLengthUnit
+from app.services.embedding_cache import EmbeddingCacheService
+from app.services.embedding_client import EMBEDDING_SERVER_URL, get_embedding_client
+from app.services.model_registry import DEFAULT_BACKEND, DEFAULT_MODEL_NAME, get_model_registry
+from app.services.scene_segmentation import OptimalSegmentationService
+from app.services.sentence_offsets import locate_sentences, offsets_for_joined
+from app.services.sentence_tokenizer import get_sentence_tokenizer
+
 
 class SceneSplitterService:
-    def __init__(self, model_name: str = 'cointegrated/rubert-tiny2'):
-        self.model = SentenceTransformer(model_name)
-        try:
-            nltk.data.find('tokenizers/punkt_tab')
-        except LookupError:
-            nltk.download('punkt_tab')
+    def __init__(
+        self,
+        model_name: str = DEFAULT_MODEL_NAME,
+        embedding_cache: Optional[EmbeddingCacheService] = None,
+        backend: Optional[str] = None,
+        progress: Optional[Callable[[int], None]] = None
+    ):
+        self.tokenizer = get_sentence_tokenizer()
+        self.model_name = model_name
+        self.backend = backend or DEFAULT_BACKEND
+        self._model = None
+        self.embedding_cache = embedding_cache
+        # called with the number of sentences each embed_sentences call has embedded
+        self.progress = progress
+
+    @property
+    def model(self):
+        # resolved on first embed: reconciling shards and regrouping scenes never encode
+        if self._model is None:
+            # with an embedding server configured the worker never loads the encoder itself
+            if EMBEDDING_SERVER_URL:
+                self._model = get_embedding_client(self.model_name)
+            else:
+                self._model = get_model_registry().get(self.model_name, self.backend)
+        return self._model
     
     def normalize_text(self, text: str) -> str:
         text = re.sub(r'(?<!\n)\n(?!\n)', ' ', text)
@@ -21,56 +45,167 @@ class SceneSplitterService:
         return text.strip()
     
     def tokenize_sentences(self, text: str) -> List[str]:
-        return nltk.sent_tokenize(text, language='russian')
+        # documents and streaming windows are tokenized once, they stay out of the cache;
+        # segmenting on a punctuation split would silently move every boundary
+        return self.tokenizer.tokenize(text, cache=False, fallback=False)
     
     def embed_sentences(self, sentences: List[str]) -> np.ndarray:
-        return self.model.encode(sentences)
+        if self.embedding_cache is not None:
+            embeddings = self.embedding_cache.embed(sentences, self.model.encode)
+        else:
+            embeddings = self.model.encode(sentences)
+        if self.progress is not None:
+            self.progress(len(sentences))
+        return embeddings
     
+    def compute_adjacent_similarities(self, embeddings: np.ndarray) -> np.ndarray:
+        embeddings = np.asarray(embeddings)
+        if len(embeddings) < 2:
+            return np.array([], dtype=embeddings.dtype)
+
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        # zero vectors stay zero, as in sklearn.preprocessing.normalize
+        norms[norms == 0.0] = 1.0
+        normalized = embeddings / norms
+        return np.einsum('ij,ij->i', normalized[:-1], normalized[1:])
+
     def compute_smoothed_similarities(self, embeddings: np.ndarray, sigma: float = 2.0) -> np.ndarray:
-        similarities = [
-            cosine_similarity([embeddings[i]], [embeddings[i + 1]])[0][0]
-            for i in range(len(embeddings) - 1)
-        ]
+        similarities = self.compute_adjacent_similarities(embeddings)
         return gaussian_filter1d(similarities, sigma=sigma)
-    
+
     def find_valleys(self, smoothed: np.ndarray) -> List[int]:
-        valleys = []
-        for i in range(1, len(smoothed) - 1):
-            if smoothed[i] < smoothed[i - 1] and smoothed[i] < smoothed[i + 1]:
-                valleys.append(i)
-        return valleys
-    
-    def split_into_chunks(self, sentences: List[str], valleys: List[int]) -> List[str]:
-        chunks = []
+        smoothed = np.asarray(smoothed)
+        if len(smoothed) < 3:
+            return []
+
+        middle = smoothed[1:-1]
+        is_valley = (middle < smoothed[:-2]) & (middle < smoothed[2:])
+        return (np.flatnonzero(is_valley) + 1).tolist()
+
+    def compute_depth_scores(self, smoothed: np.ndarray) -> np.ndarray:
+        # TextTiling depth: climb to the nearest peak on both sides of every point
+        smoothed = np.asarray(smoothed, dtype=np.float64)
+        n = len(smoothed)
+        left_peaks = smoothed.copy()
+        right_peaks = smoothed.copy()
+
+        for i in range(1, n):
+            if smoothed[i - 1] > smoothed[i]:
+                left_peaks[i] = left_peaks[i - 1]
+        for i in range(n - 2, -1, -1):
+            if smoothed[i + 1] > smoothed[i]:
+                right_peaks[i] = right_peaks[i + 1]
+
+        return (left_peaks - smoothed) + (right_peaks - smoothed)
+
+    def get_scene_boundaries(
+        self,
+        valleys: List[int],
+        depths: np.ndarray,
+        sentence_count: int
+    ) -> List[Dict[str, Any]]:
+        if sentence_count == 0:
+            return [{'start_sentence_idx': None, 'end_sentence_idx': None, 'boundary_confidence': None}]
+
+        boundaries = []
+        start = 0
+        confidence: Optional[float] = None
+        for v in list(valleys) + [sentence_count - 1]:
+            boundaries.append({
+                'start_sentence_idx': start,
+                'end_sentence_idx': v,
+                'boundary_confidence': confidence,
+            })
+            if v < len(depths):
+                confidence = round(float(depths[v]), 6)
+            start = v + 1
+        return boundaries
+
+    def select_boundaries(
+        self,
+        sentences: List[str],
+        smoothed: np.ndarray,
+        depths: np.ndarray,
+        options: Optional[Dict[str, Any]] = None,
+        lengths: Optional[np.ndarray] = None
+    ) -> List[int]:
+        """lengths, when the caller has counted them already, spares keeping the sentences around."""
+        options = options or {}
+        valleys = self.find_valleys(smoothed)
+
+        mode = options.get('mode') or SegmentationMode.VALLEYS.value
+        if mode == SegmentationMode.VALLEYS.value:
+            return valleys
+        if mode != SegmentationMode.OPTIMAL.value:
+            raise ValueError(f"Unknown segmentation mode: {mode}")
+
+        if lengths is None:
+            lengths = self.sentence_lengths(sentences, options)
+
+        segmenter = OptimalSegmentationService(
+            min_length=options.get('min_scene_length') or 1,
+            max_length=options.get('max_scene_length'),
+            target_scene_count=options.get('target_scene_count'),
+        )
+        return segmenter.find_boundaries(depths, valleys, lengths)
+
+    def sentence_lengths(self, sentences: List[str], options: Optional[Dict[str, Any]] = None) -> np.ndarray:
+        if (options or {}).get('length_unit') == SegmentLengthUnit.WORDS.value:
+            return np.array([len(sentence.split()) for sentence in sentences])
+        return np.ones(len(sentences))
+
+    def group_sentences(self, sentences: List[str], valleys: List[int]) -> List[List[str]]:
+        groups = []
         start = 0
         for v in valleys:
-            chunks.append(' '.join(sentences[start:v+1]))
+            groups.append(sentences[start:v+1])
             start = v + 1
-        chunks.append(' '.join(sentences[start:]))
-        return chunks
+        groups.append(sentences[start:])
+        return groups
+
+    def split_into_chunks(self, sentences: List[str], valleys: List[int]) -> List[str]:
+        return [' '.join(group) for group in self.group_sentences(sentences, valleys)]
     
-    def analyze_scenes(self, text: str) -> Tuple[List[str], List[int], np.ndarray]:
+    def analyze_scenes(
+        self,
+        text: str,
+        options: Optional[Dict[str, Any]] = None
+    ) -> Tuple[List[str], List[int], np.ndarray, List[Dict[str, Any]]]:
         normalized_text = self.normalize_text(text)
         sentences = self.tokenize_sentences(normalized_text)
         
         if len(sentences) < 3:
-            return [text], [], np.array([])
+            boundaries = self.get_scene_boundaries([], np.array([]), len(sentences))
+            return [text], [], np.array([]), boundaries
         
         embeddings = self.embed_sentences(sentences)
         smoothed = self.compute_smoothed_similarities(embeddings)
-        valleys = self.find_valleys(smoothed)
+        depths = self.compute_depth_scores(smoothed)
+        valleys = self.select_boundaries(sentences, smoothed, depths, options)
         scenes = self.split_into_chunks(sentences, valleys)
+        boundaries = self.get_scene_boundaries(valleys, depths, len(sentences))
         
-        return scenes, valleys, smoothed
+        return scenes, valleys, smoothed, boundaries
     
-    def get_scene_statistics(self, scenes: List[str]) -> List[dict]:
+    def get_scene_statistics(
+        self,
+        scenes: List[str],
+        scene_sentences: Optional[List[List[str]]] = None
+    ) -> List[dict]:
+        """scene_sentences, when the caller still has them, spares re-tokenizing the scene texts."""
+        located = scene_sentences is None
+        if located:
+            scene_sentences = self.tokenizer.tokenize_many(scenes)
+
         stats = []
         for i, scene in enumerate(scenes):
-            sentences = self.tokenize_sentences(scene)
+            sentences = scene_sentences[i]
+            offsets = locate_sentences(scene, sentences) if located else offsets_for_joined(sentences)
             stats.append({
                 'scene_number': i + 1,
                 'sentence_count': len(sentences),
                 'word_count': len(scene.split()),
-                'char_count': len(scene)
+                'char_count': len(scene),
+                'sentence_offsets': offsets
             })
         return stats
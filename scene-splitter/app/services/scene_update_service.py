@@ -1,11 +1,10 @@
 from typing import List, Dict, Any
 from sqlalchemy.orm import Session
-from enum import Enum
 
 from app.models import Scene
 from app.repositories.processing_job_repository import ProcessingJobRepository
-from app.models.enums import ProcessingStatus
-from app.services.scene_metrics_service import SceneMetricsService
+from app.services.job_status import is_finalized
+from app.services.scene_layout import SceneLayout
 
 
 class SceneUpdateError(Exception):
@@ -20,59 +19,106 @@ class SceneNotFoundError(SceneUpdateError):
     pass
 
 
+class ScenePatchValidationError(SceneUpdateError):
+    pass
+
+
 class SceneUpdateService:
     def __init__(self, session: Session):
         self.session = session
         self.job_repo = ProcessingJobRepository(session)
-        self.metrics = SceneMetricsService()
 
     def update_scenes(self, job_id: str, patches: List[Dict[str, Any]]) -> List[Scene]:
         job = self.job_repo.get_by_id(job_id)
         if not job:
             raise JobNotEditableError(f"Job {job_id} not found")
 
-        status_value = self._normalize_status(job.status)
-        if status_value in {ProcessingStatus.APPROVED.value, ProcessingStatus.COMPLETED.value, "approved", "completed"}:
+        if is_finalized(job.status):
             raise JobNotEditableError("Job is finalized and scenes cannot be modified")
 
+        layout = SceneLayout(self.session, job)
+        scenes = self.apply_patches(layout, patches)
+        layout.flush()
+        self.job_repo.bump_revision(job.id)
+        self.session.commit()
+        return scenes
+
+    def apply_patches(self, layout: SceneLayout, patches: List[Dict[str, Any]]) -> List[Scene]:
+        """Applies patches to scenes of the layout; their metrics are recomputed on flush."""
         numbers = [p["scene_number"] for p in patches]
-        scenes = (
-            self.session.query(Scene)
-            .filter(Scene.processing_job_id == job.id, Scene.scene_number.in_(numbers))
-            .all()
-        )
-
-        found_map = {scene.scene_number: scene for scene in scenes}
-        if len(found_map) != len(numbers):
+        found_map = {}
+        for number in set(numbers):
+            scene = layout.get(number)
+            if scene is not None:
+                found_map[number] = scene
+
+        if len(found_map) != len(set(numbers)):
             missing = set(numbers) - set(found_map.keys())
             missing_list = ", ".join(str(m) for m in sorted(missing))
-            raise SceneNotFoundError(f"Scenes with numbers [{missing_list}] not found for job {job_id}")
+            raise SceneNotFoundError(f"Scenes with numbers [{missing_list}] not found for job {layout.job.id}")
 
         for patch in patches:
             scene = found_map[patch["scene_number"]]
+            before = (scene.scene_text, scene.start_char, scene.end_char)
+
+            if patch.get("start_char") is not None or patch.get("end_char") is not None:
+                self._apply_span(layout, scene, patch)
+            else:
+                new_text = patch.get("scene_text")
+                if new_text is None:
+                    raise ScenePatchValidationError("scene_text or start_char/end_char is required for each patch item")
+                self._apply_text(layout.job, scene, new_text)
+            if (scene.scene_text, scene.start_char, scene.end_char) != before:
+                # the new text is tokenized once, on flush
+                scene.sentence_offsets = None
+            layout.touch(scene)
+
+        return [found_map[number] for number in sorted(found_map)]
 
-            new_text = patch.get("scene_text")
-            if new_text is None:
-                raise SceneUpdateError("scene_text is required for each patch item")
-
-            scene.scene_text = new_text
-            self.metrics.apply(scene)
-
-        self.session.commit()
-
-        return (
-            self.session.query(Scene)
-            .filter(Scene.processing_job_id == job.id, Scene.scene_number.in_(numbers))
-            .order_by(Scene.scene_number)
-            .all()
-        )
+    @staticmethod
+    def _apply_span(layout: SceneLayout, scene: Scene, patch: Dict[str, Any]) -> None:
+        job = layout.job
+        job_text = job.job_text
+        if job_text is None:
+            raise ScenePatchValidationError(f"Job {job.id} has no stored text, patch scene_text instead")
+
+        number = patch["scene_number"]
+        start = patch.get("start_char") if patch.get("start_char") is not None else scene.start_char
+        end = patch.get("end_char") if patch.get("end_char") is not None else scene.end_char
+        if start is None or end is None or not 0 <= start < end <= job_text.char_count:
+            raise ScenePatchValidationError(
+                f"Span [{start}, {end}) of scene {number} is outside the job text "
+                f"of {job_text.char_count} characters"
+            )
+
+        # scenes keep their order in the job text and never share characters
+        previous = layout.get(number - 1)
+        if previous is not None and previous.scene_text is None and previous.end_char is not None and start < previous.end_char:
+            raise ScenePatchValidationError(
+                f"Span [{start}, {end}) of scene {number} overlaps scene {number - 1}, "
+                f"which ends at {previous.end_char}"
+            )
+        following = layout.get(number + 1)
+        if following is not None and following.scene_text is None and following.start_char is not None and end > following.start_char:
+            raise ScenePatchValidationError(
+                f"Span [{start}, {end}) of scene {number} overlaps scene {number + 1}, "
+                f"which starts at {following.start_char}"
+            )
+
+        scene.start_char = start
+        scene.end_char = end
+        scene.scene_text = None
 
     @staticmethod
-    def _normalize_status(raw_status: object) -> str:
-        if isinstance(raw_status, Enum):
-            return raw_status.value
-        if isinstance(raw_status, str) and raw_status.startswith("ProcessingStatus."):
-            name = raw_status.split(".", 1)[1]
-            if name in ProcessingStatus.__members__:
-                return ProcessingStatus[name].value
-        return str(raw_status)
+    def _apply_text(job, scene: Scene, new_text: str) -> None:
+        job_text = job.job_text
+        if (
+            job_text is not None
+            and scene.start_char is not None
+            and scene.end_char is not None
+            and job_text.slice(scene.start_char, scene.end_char) == new_text
+        ):
+            # unchanged text stays a plain span
+            scene.scene_text = None
+        else:
+            scene.scene_text = new_text
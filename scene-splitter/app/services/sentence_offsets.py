@@ -0,0 +1,35 @@
+from typing import List, Sequence
+
+# [start, end) character offsets of every sentence inside a scene text
+SentenceOffsets = List[List[int]]
+
+
+def offsets_for_joined(sentences: Sequence[str], separator: str = " ") -> SentenceOffsets:
+    offsets = []
+    position = 0
+    for sentence in sentences:
+        offsets.append([position, position + len(sentence)])
+        position += len(sentence) + len(separator)
+    return offsets
+
+
+def locate_sentences(text: str, sentences: Sequence[str]) -> SentenceOffsets:
+    """Finds tokenizer output in the text it came from; sentences are substrings in order."""
+    offsets = []
+    cursor = 0
+    for sentence in sentences:
+        start = text.find(sentence, cursor)
+        if start < 0:
+            start = cursor
+        end = start + len(sentence)
+        offsets.append([start, end])
+        cursor = end
+    return offsets
+
+
+def shift_offsets(offsets: SentenceOffsets, delta: int) -> SentenceOffsets:
+    return [[start + delta, end + delta] for start, end in offsets]
+
+
+def slice_sentences(text: str, offsets: SentenceOffsets) -> List[str]:
+    return [text[start:end] for start, end in offsets]
@@ -0,0 +1,144 @@
+import hashlib
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.services.sentence_offsets import SentenceOffsets, locate_sentences
+
+SENTENCE_TOKENIZER_LANGUAGE = os.getenv("SENTENCE_TOKENIZER_LANGUAGE", "russian")
+SENTENCE_TOKENIZER_CACHE_SIZE = int(os.getenv("SENTENCE_TOKENIZER_CACHE_SIZE", "4096"))
+# whole documents are tokenized once per job, caching them would only evict the scenes
+SENTENCE_TOKENIZER_CACHE_MAX_CHARS = int(os.getenv("SENTENCE_TOKENIZER_CACHE_MAX_CHARS", "50000"))
+SENTENCE_TOKENIZER_RETRY_SECONDS = float(os.getenv("SENTENCE_TOKENIZER_RETRY_SECONDS", "60"))
+
+_FALLBACK_BOUNDARY = re.compile(r"(?<=[.!?…])\s+")
+
+
+class SentenceTokenizer:
+    """Process-wide Punkt sentence tokenizer shared by the services, the API and the workers.
+
+    The Punkt parameters are loaded once, on first use or on load(); results for
+    scene-sized texts are kept in an LRU cache keyed by a hash of the text. When
+    the Punkt data cannot be loaded, sentences are split on terminal punctuation.
+    """
+
+    def __init__(
+        self,
+        language: str = SENTENCE_TOKENIZER_LANGUAGE,
+        cache_size: int = SENTENCE_TOKENIZER_CACHE_SIZE,
+        cache_max_chars: int = SENTENCE_TOKENIZER_CACHE_MAX_CHARS,
+        retry_seconds: float = SENTENCE_TOKENIZER_RETRY_SECONDS,
+    ):
+        self.language = language
+        self.cache_size = cache_size
+        self.cache_max_chars = cache_max_chars
+        self.retry_seconds = retry_seconds
+        self._punkt = None
+        self._failed_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._cache: "OrderedDict[bytes, Tuple[str, ...]]" = OrderedDict()
+        self._stats = {"hits": 0, "misses": 0, "fallbacks": 0}
+        self.logger = logging.getLogger(__name__)
+
+    def load(self) -> bool:
+        """Loads the Punkt parameters, downloading them if needed; False means the regex fallback is used.
+
+        A failed load is retried once retry_seconds have passed, so a worker picks
+        Punkt up when the data becomes available instead of failing until restart.
+        """
+        if self._punkt is not None:
+            return True
+        if not self._retry_due():
+            return False
+
+        with self._lock:
+            if self._punkt is None and self._retry_due():
+                try:
+                    from nltk.tokenize.punkt import PunktTokenizer
+
+                    from app.services.model_registry import get_model_registry
+
+                    get_model_registry().ensure_tokenizer_data()
+                    self._punkt = PunktTokenizer(self.language)
+                    self._failed_at = None
+                except Exception as e:
+                    self.logger.warning(
+                        f"Punkt tokenizer for {self.language} unavailable, splitting on punctuation "
+                        f"and retrying in {self.retry_seconds:g}s: {e}"
+                    )
+                    self._failed_at = time.monotonic()
+        return self._punkt is not None
+
+    def _retry_due(self) -> bool:
+        return self._failed_at is None or time.monotonic() - self._failed_at >= self.retry_seconds
+
+    def tokenize(self, text: str, cache: bool = True, fallback: bool = True) -> List[str]:
+        """fallback=False raises LookupError instead of splitting on punctuation without Punkt."""
+        if not text or not text.strip():
+            return []
+
+        cacheable = cache and self.cache_size > 0 and len(text) <= self.cache_max_chars
+        if cacheable:
+            key = hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+            with self._lock:
+                cached = self._cache.get(key)
+                if cached is not None:
+                    self._cache.move_to_end(key)
+                    self._stats["hits"] += 1
+                    return list(cached)
+                self._stats["misses"] += 1
+
+        sentences = self._tokenize(text, fallback)
+
+        if cacheable:
+            with self._lock:
+                self._cache[key] = tuple(sentences)
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return sentences
+
+    def tokenize_many(self, texts: Iterable[str]) -> List[List[str]]:
+        self.load()
+        return [self.tokenize(text) for text in texts]
+
+    def offsets(self, text: str) -> SentenceOffsets:
+        return locate_sentences(text, self.tokenize(text))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self._stats,
+                "cached": len(self._cache),
+                "punkt": True if self._punkt is not None else (False if self._failed_at is not None else None),
+            }
+
+    def _tokenize(self, text: str, fallback: bool) -> List[str]:
+        if self.load():
+            return self._punkt.tokenize(text)
+        if not fallback:
+            raise LookupError(f"Punkt tokenizer for {self.language} is unavailable")
+        with self._lock:
+            self._stats["fallbacks"] += 1
+        return self.fallback(text)
+
+    @staticmethod
+    def fallback(text: str) -> List[str]:
+        return [part.strip() for part in _FALLBACK_BOUNDARY.split(text) if part.strip()]
+
+
+_tokenizer: Optional[SentenceTokenizer] = None
+_tokenizer_lock = threading.Lock()
+
+def get_sentence_tokenizer() -> SentenceTokenizer:
+    global _tokenizer
+    # sync routes run in the threadpool, two of them must not end up with separate caches
+    if _tokenizer is None:
+        with _tokenizer_lock:
+            if _tokenizer is None:
+                _tokenizer = SentenceTokenizer()
+
+    return _tokenizer
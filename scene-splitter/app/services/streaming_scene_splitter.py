@@ -0,0 +1,252 @@
+import os
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+from scipy.ndimage import gaussian_filter1d
+
+from app.services.scene_splitter import SceneSplitterService
+
+STREAMING_WINDOW_CHARS = int(os.getenv("STREAMING_WINDOW_CHARS", "50000"))
+SCENE_SPLITTING_STREAMING = os.getenv("SCENE_SPLITTING_STREAMING", "true").lower() == "true"
+
+
+class StreamingSceneSplitter:
+    """Valley-mode scene splitting over a text stream with bounded memory.
+
+    Text is tokenized and embedded one window at a time. Only the similarities
+    inside the Gaussian kernel radius are kept, and every scene is yielded as
+    soon as the valley closing it is final. Boundaries, depths and scene texts
+    match SceneSplitterService.analyze_scenes in valleys mode.
+    """
+
+    def __init__(
+        self,
+        splitter: SceneSplitterService,
+        window_chars: int = STREAMING_WINDOW_CHARS,
+        sigma: float = 2.0,
+        truncate: float = 4.0,
+    ):
+        self.splitter = splitter
+        self.window_chars = max(1, window_chars)
+        self.sigma = sigma
+        self.truncate = truncate
+        # same kernel radius as gaussian_filter1d uses internally
+        self.radius = int(truncate * sigma + 0.5)
+        self.sentence_count = 0
+        self.valleys_found = 0
+
+    def iter_scenes(self, chunks: Iterable[str]) -> Iterator[Dict[str, Any]]:
+        similarities = _SimilarityStream(self.splitter, self.sigma, self.truncate, self.radius)
+        windows = (
+            (window, self.splitter.embed_sentences(window))
+            for window in self.iter_sentence_windows(chunks)
+        )
+        return self._iter_scenes(windows, similarities.push, similarities)
+
+    def iter_scenes_from_similarities(self, parts: Iterable[Tuple[List[str], np.ndarray]]) -> Iterator[Dict[str, Any]]:
+        """Scenes from sentences that come with their similarities already computed.
+
+        Every part holds sentences and the similarities of their pairs in order; a
+        pair may reach into the next part, the last part is one pair short.
+        """
+        similarities = _SimilarityStream(self.splitter, self.sigma, self.truncate, self.radius)
+        return self._iter_scenes(parts, similarities.extend, similarities)
+
+    def _iter_scenes(
+        self,
+        parts: Iterable[Tuple[List[str], Any]],
+        push: Callable[[Any], List[Tuple[int, float]]],
+        similarities: "_SimilarityStream",
+    ) -> Iterator[Dict[str, Any]]:
+        self.sentence_count = 0
+        self.valleys_found = 0
+
+        sentences: Deque[str] = deque()
+        scene_start = 0
+        scene_number = 0
+        opening_valley: Optional[int] = None
+        valleys = _ValleyStream()
+
+        def close_scene(end: int) -> Dict[str, Any]:
+            nonlocal scene_start, scene_number
+            scene_sentences = [sentences.popleft() for _ in range(end - scene_start + 1)]
+            # the opening valley has always stopped climbing by the time the next one is found
+            confidence = valleys.depth_of(opening_valley) if opening_valley is not None else None
+            scene_number += 1
+            scene = self.build_scene(scene_number, scene_sentences, scene_start, end, confidence)
+            scene_start = end + 1
+            return scene
+
+        def drain(smoothed_values) -> Iterator[Dict[str, Any]]:
+            nonlocal opening_valley
+            for index, value in smoothed_values:
+                for valley in valleys.feed(index, value):
+                    self.valleys_found += 1
+                    yield close_scene(valley)
+                    opening_valley = valley
+
+        for window, payload in parts:
+            sentences.extend(window)
+            self.sentence_count += len(window)
+            yield from drain(push(payload))
+
+        if self.sentence_count < 3:
+            # too short to compare sentences, one scene with the same span as analyze_scenes gives it
+            last = self.sentence_count - 1 if self.sentence_count else None
+            yield self.build_scene(1, list(sentences), 0 if self.sentence_count else None, last, None)
+            return
+
+        yield from drain(similarities.finish())
+        valleys.finish()
+        yield close_scene(self.sentence_count - 1)
+
+    def iter_sentence_windows(self, chunks: Iterable[str]) -> Iterator[List[str]]:
+        carry = ""
+        raw = ""
+        for chunk in chunks:
+            raw += chunk
+            # only text up to the last whitespace is safe to normalize; a word may continue in the next chunk
+            cut = max(raw.rfind(" "), raw.rfind("\n"), raw.rfind("\t"), raw.rfind("\r"))
+            if cut < 0 or len(carry) + cut < self.window_chars:
+                continue
+
+            text = self.splitter.normalize_text(f"{carry} {raw[:cut]}")
+            raw = raw[cut + 1:]
+            window = self.splitter.tokenize_sentences(text)
+            if len(window) < 2:
+                carry = text
+                continue
+
+            # the last sentence may still continue, tokenize it again with the next window
+            carry = text[text.rfind(window[-1]):]
+            yield window[:-1]
+
+        text = self.splitter.normalize_text(f"{carry} {raw}")
+        if text:
+            window = self.splitter.tokenize_sentences(text)
+            if window:
+                yield window
+
+    def build_scene(
+        self,
+        scene_number: int,
+        scene_sentences: List[str],
+        start: Optional[int],
+        end: Optional[int],
+        confidence: Optional[float],
+    ) -> Dict[str, Any]:
+        scene_text = ' '.join(scene_sentences)
+        stats = self.splitter.get_scene_statistics([scene_text], [scene_sentences])[0]
+        return {
+            'scene_number': scene_number,
+            'scene_text': scene_text,
+            'sentence_count': stats['sentence_count'],
+            'word_count': stats['word_count'],
+            'char_count': stats['char_count'],
+            'sentence_offsets': stats['sentence_offsets'],
+            'start_sentence_idx': start,
+            'end_sentence_idx': end,
+            'boundary_confidence': confidence,
+        }
+
+
+class _SimilarityStream:
+    """Adjacent similarities smoothed with gaussian_filter1d, released once the kernel window is complete."""
+
+    def __init__(self, splitter: SceneSplitterService, sigma: float, truncate: float, radius: int):
+        self.splitter = splitter
+        self.sigma = sigma
+        self.truncate = truncate
+        self.radius = radius
+        self.last_embedding: Optional[np.ndarray] = None
+        self.dtype = np.float32
+        self.buffer: List[float] = []
+        self.buffer_start = 0
+        self.done = 0
+
+    @property
+    def total(self) -> int:
+        return self.buffer_start + len(self.buffer)
+
+    def push(self, embeddings: np.ndarray):
+        embeddings = np.asarray(embeddings)
+        if len(embeddings) == 0:
+            return []
+        if self.last_embedding is not None:
+            embeddings = np.vstack([self.last_embedding[None, :], embeddings])
+        self.last_embedding = embeddings[-1].copy()
+        return self.extend(self.splitter.compute_adjacent_similarities(embeddings))
+
+    def extend(self, similarities: np.ndarray):
+        similarities = np.asarray(similarities)
+        if len(similarities):
+            self.dtype = similarities.dtype
+        self.buffer.extend(similarities.tolist())
+        return self._release(self.total - self.radius)
+
+    def finish(self):
+        return self._release(self.total)
+
+    def _release(self, upto: int):
+        if upto <= self.done:
+            return []
+
+        # reflect padding at the left edge is only right while the buffer still starts at zero,
+        # later values are taken at least one radius away from both edges
+        smoothed = gaussian_filter1d(
+            np.asarray(self.buffer, dtype=self.dtype), sigma=self.sigma, truncate=self.truncate
+        )
+        released = [
+            (index, float(smoothed[index - self.buffer_start]))
+            for index in range(self.done, upto)
+        ]
+        self.done = upto
+
+        keep_from = max(self.buffer_start, self.done - self.radius)
+        del self.buffer[:keep_from - self.buffer_start]
+        self.buffer_start = keep_from
+        return released
+
+
+class _ValleyStream:
+    """Online find_valleys and compute_depth_scores over smoothed values arriving in order."""
+
+    def __init__(self):
+        self.previous: List[float] = []
+        self.left_peak = 0.0
+        # valley index -> [valley value, right peak so far, last value seen]
+        self.climbing: Dict[int, List[float]] = {}
+        self.depths: Dict[int, float] = {}
+
+    def feed(self, index: int, value: float) -> List[int]:
+        for valley, (valley_value, peak, last) in list(self.climbing.items()):
+            if value > last:
+                self.climbing[valley] = [valley_value, value, value]
+            else:
+                self._settle(valley, valley_value, peak)
+
+        found = []
+        if len(self.previous) == 2:
+            before, middle = self.previous
+            if middle < before and middle < value:
+                valley = index - 1
+                self.climbing[valley] = [middle, value, value]
+                self.depths[valley] = self.left_peak - middle
+                found.append(valley)
+
+        if index == 0 or self.previous[-1] <= value:
+            self.left_peak = value
+        self.previous = (self.previous + [value])[-2:]
+        return found
+
+    def finish(self):
+        for valley, (valley_value, peak, _) in list(self.climbing.items()):
+            self._settle(valley, valley_value, peak)
+
+    def depth_of(self, valley: int) -> float:
+        return round(self.depths[valley], 6)
+
+    def _settle(self, valley: int, valley_value: float, peak: float):
+        del self.climbing[valley]
+        self.depths[valley] += peak - valley_value
@@ -0,0 +1,24 @@
+from app.utils.celery import celery_app
+from app.utils.database import get_db_session
+from app.repositories.embedding_cache_repository import EmbeddingCacheRepository
+from app.services.embedding_cache import EMBEDDING_CACHE_MAX_ENTRIES
+
+
+@celery_app.task(name="evict_embedding_cache")
+def evict_embedding_cache():
+    session = get_db_session()
+
+    try:
+        deleted = EmbeddingCacheRepository(session).evict_to_size(EMBEDDING_CACHE_MAX_ENTRIES)
+
+        if deleted > 0:
+            print(f"Evicted cached sentence embeddings: {deleted}")
+
+        return {'deleted': deleted}
+
+    except Exception as e:
+        print(f"Error while evicting sentence embeddings: {e}")
+        raise
+
+    finally:
+        session.close()
@@ -1,5 +1,14 @@
 from app.utils.celery import celery_app
-from app.services.pdf_extractor import PdfTextExtractorService
+from app.services.page_text_cache import PageTextCacheService
+from app.services.job_artifacts import (
+    job_pages_plan_key,
+    job_pages_shard_key,
+    delete_artifact,
+    get_json,
+    put_job_text,
+    put_json,
+)
+from app.services.job_events import JobProgressReporter
 from app.repositories.processing_job_repository import ProcessingJobRepository
 from app.utils.database import get_db_session
 from app.services.tasks.scene_splitting_task import scene_splitting_task
@@ -7,35 +16,143 @@ from sqlalchemy.orm import Session
 from app.models.enums import ProcessingStatus, ProcessingStep
 
 
-@celery_app.task(name="extract_text_task", bind=True)
-def extract_text_task(self, job_id: str, pdf_bytes: bytes, start_page: int = 1, end_page: int = 999):
+def _split_extracted_text(job_id: str, extracted_text: str) -> str:
+    if not extracted_text.strip():
+        raise ValueError("No text extracted from PDF file")
+    
+    text_key = put_job_text(job_id, extracted_text)
+    scene_splitting_task.delay(job_id, text_key)
+    return text_key
+
+
+@celery_app.task(name="extract_text_task", bind=True, max_retries=3)
+def extract_text_task(self, job_id: str, storage_key: str, start_page: int = 1, end_page: int = 999):
     session: Session = get_db_session()
     job_repo = ProcessingJobRepository(session)
     
     try:
         job_repo.update_status(job_id, ProcessingStatus.EXTRACTING, ProcessingStep.TEXT_EXTRACTION)
         
-        service = PdfTextExtractorService(pdf_bytes)
-        extracted_text = service.extract_text(start_page, end_page)
+        job = job_repo.get_by_id(job_id)
+        if not job:
+            raise ValueError(f"Processing job {job_id} not found")
+        
+        service = PageTextCacheService(session)
+        wanted, pages, missing = service.plan(job.document, start_page, end_page)
+        shards = service.shard(missing)
+        
+        if len(shards) > 1:
+            # prefork workers are daemonic and cannot run a process pool, so the page ranges
+            # go out as tasks and the shard that completes the counter assembles the text
+            put_json(job_pages_plan_key(job_id), {
+                'wanted': wanted,
+                'shards': shards,
+                'cached_pages': sorted(pages.items()),
+            })
+            job_repo.start_page_shards(job_id, len(shards))
+            for shard_index in range(len(shards)):
+                extract_pages_task.delay(job_id, shard_index)
+            
+            return {
+                'status': 'success',
+                'pages': len(wanted),
+                'cached_pages': len(pages),
+                'shards_count': len(shards),
+                'message': f'Split {len(missing)} pages into {len(shards)} extraction shards'
+            }
+        
+        progress = JobProgressReporter(job_id, "pages")
+        extracted_text, extraction_stats = service.extract_text(
+            job.document, start_page, end_page, progress=progress.update
+        )
+        progress.flush()
+        print(f"Extracted pages for job {job_id}: {extraction_stats}")
+        
+        text_key = _split_extracted_text(job_id, extracted_text)
+        
+        return {
+            'status': 'success',
+            'text_length': len(extracted_text),
+            'text_key': text_key,
+            'extraction': extraction_stats,
+            'message': f'Extracted text with {len(extracted_text)} characters'
+        }
+        
+    except Exception as e:
+        if self.request.retries >= self.max_retries:
+            job_repo.fail_processing(job_id, str(e))
+            raise
+        job_repo.retry_processing(job_id, str(e))
+        
+        raise self.retry(
+            exc=e,
+            countdown=60 * (2 ** self.request.retries)
+        )
+    
+    finally:
+        session.close()
+
+
+@celery_app.task(name="extract_pages_task", bind=True, max_retries=3)
+def extract_pages_task(self, job_id: str, shard_index: int):
+    session: Session = get_db_session()
+    job_repo = ProcessingJobRepository(session)
+    
+    try:
+        job = job_repo.get_by_id(job_id)
+        if not job:
+            raise ValueError(f"Processing job {job_id} not found")
+        if job.status == ProcessingStatus.FAILED.value:
+            # a sibling shard has given up, the job will not be assembled
+            return {'status': 'skipped', 'shard_index': shard_index}
+        
+        plan = get_json(job_pages_plan_key(job_id))
+        service = PageTextCacheService(session)
+        extracted, timing = service.extract_pages(job.document, plan['shards'][shard_index], processes=1)
+        put_json(job_pages_shard_key(job_id, shard_index), [[index, text] for index, text, _ in extracted])
+        print(f"Extracted page shard {shard_index} for job {job_id}: {timing}")
+        
+        # exactly one shard sees the counter reach the total; rpc:// results cannot drive a chord
+        if not job_repo.complete_page_shard(job_id, shard_index):
+            session.commit()
+            return {
+                'status': 'success',
+                'shard_index': shard_index,
+                'extraction': timing,
+            }
         
-        if not extracted_text.strip():
-            raise ValueError("No text extracted from PDF file")
+        pages = {index: text for index, text in plan['cached_pages']}
+        shard_keys = [job_pages_shard_key(job_id, i) for i in range(len(plan['shards']))]
+        for key in shard_keys:
+            pages.update((index, text) for index, text in get_json(key))
+        extracted_text = service.assemble(plan['wanted'], pages)
+        text_key = _split_extracted_text(job_id, extracted_text)
+        # the shard is recorded only once the text is handed on, a failure above retries the assembly
+        session.commit()
         
-        scene_splitting_task.delay(job_id, extracted_text)
+        for key in shard_keys + [job_pages_plan_key(job_id)]:
+            delete_artifact(key)
         
         return {
             'status': 'success',
+            'shard_index': shard_index,
             'text_length': len(extracted_text),
+            'text_key': text_key,
+            'extraction': timing,
             'message': f'Extracted text with {len(extracted_text)} characters'
         }
         
     except Exception as e:
-        job_repo.update_status(job_id, ProcessingStatus.FAILED, error_message=str(e))
+        session.rollback()
+        if self.request.retries >= self.max_retries:
+            job_repo.fail_processing(job_id, str(e))
+            raise
+        # sibling shards are still extracting, the job stays in EXTRACTING while this one waits
+        print(f"Page shard {shard_index} of job {job_id} failed, retrying: {e}")
         
         raise self.retry(
             exc=e,
-            countdown=60 * (2 ** self.request.retries),
-            max_retries=3
+            countdown=60 * (2 ** self.request.retries)
         )
     
     finally:
@@ -0,0 +1,27 @@
+from app.utils.celery import celery_app
+from app.utils.database import get_db_session
+from app.repositories.page_cache_repository import PageCacheRepository
+from app.services.page_text_cache import PAGE_CACHE_MAX_AGE_DAYS, PAGE_CACHE_MAX_BYTES
+
+
+@celery_app.task(name="evict_page_cache")
+def evict_page_cache():
+    session = get_db_session()
+
+    try:
+        deleted = PageCacheRepository(session).evict(
+            older_than_days=PAGE_CACHE_MAX_AGE_DAYS,
+            max_bytes=PAGE_CACHE_MAX_BYTES,
+        )
+
+        if deleted > 0:
+            print(f"Evicted cached PDF pages: {deleted}")
+
+        return {'deleted': deleted}
+
+    except Exception as e:
+        print(f"Error while evicting cached PDF pages: {e}")
+        raise
+
+    finally:
+        session.close()
@@ -0,0 +1,86 @@
+import os
+import time
+
+from celery.exceptions import SoftTimeLimitExceeded
+
+from app.utils.celery import celery_app
+from app.services.job_artifacts import (
+    RESEGMENT_RESULTS_PREFIX,
+    evict_artifacts,
+    put_json,
+    resegment_result_key,
+)
+from app.services.job_events import publish_job_event
+from app.services.scene_splitter import SceneSplitterService
+from app.services.embedding_cache import EmbeddingCacheService, EMBEDDING_CACHE_ENABLED
+from app.services.model_registry import DEFAULT_MODEL_NAME
+from app.services.scene_resegmentation_service import (
+    SceneResegmentationService,
+    JobNotFoundError,
+    JobNotEditableError,
+    SceneNotFoundError,
+)
+from app.utils.database import get_db_session
+from sqlalchemy.orm import Session
+
+# a proposal nobody waits for any more is not worth a worker
+RESEGMENT_TASK_TIME_LIMIT_SECONDS = int(os.getenv("RESEGMENT_TASK_TIME_LIMIT_SECONDS", "60"))
+# proposals that were never fetched, and markers of tasks that never finished
+RESEGMENT_RESULT_MAX_AGE_SECONDS = int(os.getenv("RESEGMENT_RESULT_MAX_AGE_SECONDS", "3600"))
+
+
+# a soft limit only: the hard one kills the worker process and the warm model with it
+@celery_app.task(name="resegment_scenes_task", bind=True, soft_time_limit=RESEGMENT_TASK_TIME_LIMIT_SECONDS)
+def resegment_scenes_task(self, job_id: str, scene_number: int, window: int = 1):
+    """Stores the proposal as an artifact the API hands out and announces it on the job event stream."""
+    key = resegment_result_key(job_id, self.request.id)
+    # a worker that dies mid-proposal leaves this marker to expire, the API then answers 504;
+    # the few extra seconds cover storing the result after the soft limit fired
+    put_json(key, {'status': 'running', 'expires_at': time.time() + RESEGMENT_TASK_TIME_LIMIT_SECONDS + 5})
+    result = _propose(job_id, scene_number, window)
+    put_json(key, result)
+    publish_job_event(job_id, "resegment", task_id=self.request.id, status=result['status'])
+    return {'status': result['status']}
+
+
+@celery_app.task(name="evict_resegment_results")
+def evict_resegment_results():
+    try:
+        deleted = evict_artifacts(RESEGMENT_RESULTS_PREFIX, RESEGMENT_RESULT_MAX_AGE_SECONDS)
+
+        if deleted > 0:
+            print(f"Evicted re-segmentation results: {deleted}")
+
+        return {'deleted': deleted}
+
+    except Exception as e:
+        print(f"Error while evicting re-segmentation results: {e}")
+        raise
+
+
+def _propose(job_id: str, scene_number: int, window: int) -> dict:
+    session: Session = get_db_session()
+    
+    try:
+        embedding_cache = EmbeddingCacheService(session, DEFAULT_MODEL_NAME) if EMBEDDING_CACHE_ENABLED else None
+        splitter = SceneSplitterService(DEFAULT_MODEL_NAME, embedding_cache=embedding_cache)
+        service = SceneResegmentationService(session, splitter)
+        
+        result = service.propose(job_id, scene_number, window)
+        result['status'] = 'success'
+        result['embedding_cache'] = embedding_cache.stats() if embedding_cache is not None else None
+        return result
+        
+    except (JobNotFoundError, SceneNotFoundError) as e:
+        return {'status': 'error', 'status_code': 404, 'detail': str(e)}
+    except JobNotEditableError as e:
+        return {'status': 'error', 'status_code': 400, 'detail': str(e)}
+    except SoftTimeLimitExceeded:
+        print(f"Re-segmentation of scene {scene_number} in job {job_id} hit its time limit")
+        return {'status': 'error', 'status_code': 504, 'detail': 'Re-segmentation did not finish in time'}
+    except Exception as e:
+        print(f"Re-segmentation of scene {scene_number} in job {job_id} failed: {e}")
+        return {'status': 'error', 'status_code': 500, 'detail': 'Re-segmentation failed'}
+    
+    finally:
+        session.close()
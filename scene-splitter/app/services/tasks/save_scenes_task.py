@@ -1,14 +1,17 @@
-from typing import List, Dict, Any
 from app.utils.celery import celery_app
-from app.models import Scene
+from app.repositories.scene_repository import SceneRepository
+from app.repositories.job_text_repository import JobTextRepository
+from app.services.job_text import JobTextBuilder
+from app.services.job_artifacts import iter_job_scenes, delete_artifact
+from app.services.job_events import JobProgressReporter
 from app.repositories.processing_job_repository import ProcessingJobRepository
 from app.utils.database import get_db_session
 from sqlalchemy.orm import Session
 from app.models.enums import ProcessingStatus, ProcessingStep
 
 
-@celery_app.task(name="save_scenes_task", bind=True)
-def save_scenes_task(self, job_id: str, scenes_data: List[Dict[str, Any]]):
+@celery_app.task(name="save_scenes_task", bind=True, max_retries=3)
+def save_scenes_task(self, job_id: str, scenes_key: str):
     session: Session = get_db_session()
     job_repo = ProcessingJobRepository(session)
     
@@ -19,43 +22,56 @@ def save_scenes_task(self, job_id: str, scenes_data: List[Dict[str, Any]]):
         if not job:
             raise ValueError(f"Processing job {job_id} not found")
         
-        saved_scenes = []
-        
-        for scene_data in scenes_data:
-            scene = Scene(
-                processing_job_id=job_id,
-                scene_number=scene_data['scene_number'],
-                scene_text=scene_data['scene_text'],
-                sentence_count=scene_data['sentence_count'],
-                word_count=scene_data['word_count'],
-                char_count=scene_data['char_count'],
-                start_sentence_idx=scene_data.get('start_sentence_idx'),
-                end_sentence_idx=scene_data.get('end_sentence_idx'),
-                boundary_confidence=scene_data.get('boundary_confidence')
-            )
-            session.add(scene)
-            session.flush()
-            
-            saved_scenes.append(scene.scene_number)
+        text_builder = JobTextBuilder()
+        progress = JobProgressReporter(job_id, "scenes")
+        
+        def scene_rows():
+            for scene_data in iter_job_scenes(scenes_key):
+                progress.advance()
+                # the text goes into job_texts once, the scene keeps only its span
+                start_char, end_char = text_builder.append(scene_data['scene_text'])
+                yield {
+                    'scene_number': scene_data['scene_number'],
+                    'scene_text': None,
+                    'start_char': start_char,
+                    'end_char': end_char,
+                    'sentence_count': scene_data['sentence_count'],
+                    'word_count': scene_data['word_count'],
+                    'char_count': scene_data['char_count'],
+                    'sentence_offsets': scene_data.get('sentence_offsets'),
+                    'start_sentence_idx': scene_data.get('start_sentence_idx'),
+                    'end_sentence_idx': scene_data.get('end_sentence_idx'),
+                    'boundary_confidence': scene_data.get('boundary_confidence'),
+                    'search_text': scene_data['scene_text'],
+                }
+        
+        saved_count = SceneRepository(session).replace_for_job(job_id, scene_rows())
+        JobTextRepository(session).replace(
+            job_id, text_builder.finish(), text_builder.char_count, text_builder.byte_size
+        )
+        job_repo.bump_revision(job_id)
+        progress.flush()
         
         session.commit()
+        delete_artifact(scenes_key)
         job_repo.update_status(job_id, ProcessingStatus.READY_FOR_REVIEW, ProcessingStep.FINALIZATION)
         
         return {
             'status': 'success',
-            'saved_scenes_count': len(saved_scenes),
-            'scene_numbers': saved_scenes,
-            'message': f'Successfully saved {len(saved_scenes)} scenes'
+            'saved_scenes_count': saved_count,
+            'message': f'Successfully saved {saved_count} scenes'
         }
         
     except Exception as e:
         session.rollback()
-        job_repo.update_status(job_id, ProcessingStatus.FAILED, error_message=str(e))
+        if self.request.retries >= self.max_retries:
+            job_repo.fail_processing(job_id, str(e))
+            raise
+        job_repo.retry_processing(job_id, str(e))
         
         raise self.retry(
             exc=e,
-            countdown=60 * (2 ** self.request.retries),
-            max_retries=3
+            countdown=60 * (2 ** self.request.retries)
         )
     
     finally:
@@ -0,0 +1,102 @@
+from app.utils.celery import celery_app
+from app.services.scene_splitter import SceneSplitterService
+from app.services.scene_sharding import (
+    SceneShardReconciler,
+    compute_shard_similarities,
+    delete_shard_artifacts,
+)
+from app.services.embedding_cache import EmbeddingCacheService, EMBEDDING_CACHE_ENABLED
+from app.services.model_registry import DEFAULT_MODEL_NAME
+from app.services.job_artifacts import job_shard_plan_key, get_json, put_job_scenes
+from app.repositories.processing_job_repository import ProcessingJobRepository
+from app.utils.database import get_db_session
+from sqlalchemy.orm import Session
+from app.models.enums import ProcessingStatus
+
+
+@celery_app.task(name="split_shard_task", bind=True, max_retries=3)
+def split_shard_task(self, job_id: str, shard_index: int):
+    session: Session = get_db_session()
+    job_repo = ProcessingJobRepository(session)
+    
+    try:
+        job = job_repo.get_by_id(job_id)
+        if not job:
+            raise ValueError(f"Processing job {job_id} not found")
+        if job.status == ProcessingStatus.FAILED.value:
+            # a sibling shard has given up, the job will not be reconciled
+            return {'status': 'skipped', 'shard_index': shard_index}
+        
+        embedding_cache = EmbeddingCacheService(session, DEFAULT_MODEL_NAME) if EMBEDDING_CACHE_ENABLED else None
+        splitter = SceneSplitterService(DEFAULT_MODEL_NAME, embedding_cache=embedding_cache)
+        sentences_count = compute_shard_similarities(splitter, job_id, shard_index)
+        
+        # exactly one shard sees the counter reach the total; rpc:// results cannot drive a chord
+        if job_repo.complete_shard(job_id, shard_index):
+            reconcile_shards_task.delay(job_id)
+        # recorded only once the reconcile is queued, a failure above retries the shard
+        session.commit()
+        
+        return {
+            'status': 'success',
+            'shard_index': shard_index,
+            'sentences_count': sentences_count,
+            'embedding_cache': embedding_cache.stats() if embedding_cache is not None else None,
+        }
+        
+    except Exception as e:
+        session.rollback()
+        if self.request.retries >= self.max_retries:
+            job_repo.fail_processing(job_id, str(e))
+            raise
+        # sibling shards are still embedding, the job stays in SPLITTING while this one waits
+        print(f"Shard {shard_index} of job {job_id} failed, retrying: {e}")
+        
+        raise self.retry(
+            exc=e,
+            countdown=60 * (2 ** self.request.retries)
+        )
+    
+    finally:
+        session.close()
+
+
+@celery_app.task(name="reconcile_shards_task", bind=True, max_retries=3)
+def reconcile_shards_task(self, job_id: str):
+    session: Session = get_db_session()
+    job_repo = ProcessingJobRepository(session)
+    
+    try:
+        job = job_repo.get_by_id(job_id)
+        if not job:
+            raise ValueError(f"Processing job {job_id} not found")
+        
+        plan = get_json(job_shard_plan_key(job_id))
+        splitter = SceneSplitterService(DEFAULT_MODEL_NAME)
+        reconciler = SceneShardReconciler(splitter)
+        scenes_key = put_job_scenes(job_id, reconciler.reconcile(job_id, plan, job.segmentation_options))
+        
+        from app.services.tasks.save_scenes_task import save_scenes_task
+        save_scenes_task.delay(job_id, scenes_key)
+        delete_shard_artifacts(job_id, plan)
+        
+        return {
+            'status': 'success',
+            'scenes_count': reconciler.scenes_count,
+            'shards_count': len(plan['shards']),
+            'message': f'Found {reconciler.scenes_count} scenes in {len(plan["shards"])} shards'
+        }
+        
+    except Exception as e:
+        if self.request.retries >= self.max_retries:
+            job_repo.fail_processing(job_id, str(e))
+            raise
+        job_repo.retry_processing(job_id, str(e))
+        
+        raise self.retry(
+            exc=e,
+            countdown=60 * (2 ** self.request.retries)
+        )
+    
+    finally:
+        session.close()
@@ -1,53 +1,121 @@
 from app.utils.celery import celery_app
 from app.services.scene_splitter import SceneSplitterService
+from app.services.embedding_cache import EmbeddingCacheService, EMBEDDING_CACHE_ENABLED
+from app.services.model_registry import DEFAULT_MODEL_NAME
+from app.services.streaming_scene_splitter import StreamingSceneSplitter, SCENE_SPLITTING_STREAMING
+from app.services.scene_sharding import (
+    SCENE_SPLITTING_SHARDING,
+    SceneShardPlanner,
+    SceneShardReconciler,
+    compute_shard_similarities,
+    delete_shard_artifacts,
+)
+from app.services.job_artifacts import get_job_text, iter_job_text, put_job_scenes, delete_artifact
+from app.services.job_events import JobProgressReporter
 from app.repositories.processing_job_repository import ProcessingJobRepository
 from app.utils.database import get_db_session
 from sqlalchemy.orm import Session
-from app.models.enums import ProcessingStatus, ProcessingStep
+from app.models.enums import ProcessingStatus, ProcessingStep, SegmentationMode
 
 
-@celery_app.task(name="scene_splitting_task", bind=True)
-def scene_splitting_task(self, job_id: str, extracted_text: str):
+@celery_app.task(name="scene_splitting_task", bind=True, max_retries=3)
+def scene_splitting_task(self, job_id: str, text_key: str):
     session: Session = get_db_session()
     job_repo = ProcessingJobRepository(session)
     
     try:
         job_repo.update_status(job_id, ProcessingStatus.SPLITTING, ProcessingStep.SCENE_SPLITTING)
         
-        splitter = SceneSplitterService()
-        scenes, valleys, smoothed = splitter.analyze_scenes(extracted_text)
-        scene_stats = splitter.get_scene_statistics(scenes)
-        
-        scenes_data = []
-        for i, (scene_text, stats) in enumerate(zip(scenes, scene_stats)):
-            scenes_data.append({
-                'scene_number': i + 1,
-                'scene_text': scene_text,
-                'sentence_count': stats['sentence_count'],
-                'word_count': stats['word_count'],
-                'char_count': stats['char_count'],
-                'start_sentence_idx': None,
-                'end_sentence_idx': None,
-                'boundary_confidence': None
-            })
+        job = job_repo.get_by_id(job_id)
+        if not job:
+            raise ValueError(f"Processing job {job_id} not found")
         
+        options = job.segmentation_options or {}
+        embedding_cache = EmbeddingCacheService(session, DEFAULT_MODEL_NAME) if EMBEDDING_CACHE_ENABLED else None
+        progress = JobProgressReporter(job_id, "sentences")
+        splitter = SceneSplitterService(DEFAULT_MODEL_NAME, embedding_cache=embedding_cache, progress=progress.advance)
+        
+        if SCENE_SPLITTING_SHARDING:
+            plan = SceneShardPlanner(splitter).plan(job_id, iter_job_text(text_key))
+            shards_count = len(plan['shards'])
+            
+            if shards_count > 1:
+                from app.services.tasks.scene_shard_tasks import split_shard_task
+                job_repo.start_shards(job_id, shards_count)
+                for shard_index in range(shards_count):
+                    split_shard_task.delay(job_id, shard_index)
+                delete_artifact(text_key)
+                
+                return {
+                    'status': 'success',
+                    'sentence_count': plan['sentence_count'],
+                    'chapters_found': len(plan['chapter_starts']),
+                    'shards_count': shards_count,
+                    'message': f'Split text into {shards_count} shards'
+                }
+            
+            # a single shard gains nothing from fan-out, reconcile it right here
+            progress.total = plan['sentence_count']
+            compute_shard_similarities(splitter, job_id, 0)
+            reconciler = SceneShardReconciler(splitter)
+            scenes_key = put_job_scenes(job_id, reconciler.reconcile(job_id, plan, options))
+            delete_shard_artifacts(job_id, plan)
+            scenes_count = reconciler.scenes_count
+            valleys_count = scenes_count - 1
+        elif SCENE_SPLITTING_STREAMING and (options.get('mode') or SegmentationMode.VALLEYS.value) == SegmentationMode.VALLEYS.value:
+            streaming = StreamingSceneSplitter(splitter)
+            scenes_key = put_job_scenes(job_id, streaming.iter_scenes(iter_job_text(text_key)))
+            scenes_count = streaming.valleys_found + 1
+            valleys_count = streaming.valleys_found
+        else:
+            # optimal segmentation needs the whole depth curve at once
+            extracted_text = get_job_text(text_key)
+            scenes, valleys, smoothed, boundaries = splitter.analyze_scenes(extracted_text, options)
+            scene_stats = splitter.get_scene_statistics(scenes)
+            
+            scenes_data = (
+                {
+                    'scene_number': i + 1,
+                    'scene_text': scene_text,
+                    'sentence_count': stats['sentence_count'],
+                    'word_count': stats['word_count'],
+                    'char_count': stats['char_count'],
+                    'sentence_offsets': stats['sentence_offsets'],
+                    'start_sentence_idx': boundary.get('start_sentence_idx'),
+                    'end_sentence_idx': boundary.get('end_sentence_idx'),
+                    'boundary_confidence': boundary.get('boundary_confidence')
+                }
+                for i, (scene_text, stats, boundary) in enumerate(zip(scenes, scene_stats, boundaries))
+            )
+            scenes_key = put_job_scenes(job_id, scenes_data)
+            scenes_count = len(scenes)
+            valleys_count = len(valleys)
+        
+        progress.flush()
         from app.services.tasks.save_scenes_task import save_scenes_task
-        save_scenes_task.delay(job_id, scenes_data)
+        save_scenes_task.delay(job_id, scenes_key)
+        delete_artifact(text_key)
+        
+        if embedding_cache is not None:
+            print(f"Embedding cache for job {job_id}: {embedding_cache.stats()}")
         
         return {
             'status': 'success',
-            'scenes_count': len(scenes),
-            'valleys_found': len(valleys),
-            'message': f'Found {len(scenes)} scenes in text'
+            'scenes_count': scenes_count,
+            'valleys_found': valleys_count,
+            'embedding_cache': embedding_cache.stats() if embedding_cache is not None else None,
+            'message': f'Found {scenes_count} scenes in text'
         }
         
     except Exception as e:
-        job_repo.update_status(job_id, ProcessingStatus.FAILED, error_message=str(e))
+        if self.request.retries >= self.max_retries:
+            job_repo.fail_processing(job_id, str(e))
+            raise
+        job_repo.retry_processing(job_id, str(e))
         
         raise self.retry(
             exc=e,
-            countdown=60 * (2 ** self.request.retries),
-            max_retries=3
+            countdown=60 * (2 ** self.request.retries)
         )
     
     finally:
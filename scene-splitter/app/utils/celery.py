@@ -1,5 +1,6 @@
 import os
 from celery import Celery
+from celery.signals import worker_process_init
 from kombu import Queue, Exchange
 
 required_env_vars = ["RABBITMQ_USER", "RABBITMQ_PASS", "RABBITMQ_HOST", "RABBITMQ_PORT"]
@@ -25,6 +26,10 @@ celery_app = Celery(
         "app.services.tasks.scene_splitting_task",
         "app.services.tasks.save_scenes_task",
         "app.services.tasks.publish_outbox_events_task",
+        "app.services.tasks.embedding_cache_task",
+        "app.services.tasks.resegment_scenes_task",
+        "app.services.tasks.page_cache_task",
+        "app.services.tasks.scene_shard_tasks",
     ]
 )
 
@@ -37,6 +42,7 @@ celery_app.conf.update(
     task_queues=[
         Queue('scene_splitter_pdf_tasks', task_exchange, routing_key='tasks.pdf', durable=True),
         Queue('scene_splitter_default', task_exchange, routing_key='tasks.default', durable=True),
+        Queue('scene_splitter_interactive', task_exchange, routing_key='tasks.interactive', durable=True),
     ],
     
     task_acks_late=True,
@@ -54,8 +60,12 @@ celery_app.conf.update(
 
 celery_app.conf.task_routes.update({
     'extract_text_task': {'queue': 'scene_splitter_pdf_tasks', 'routing_key': 'tasks.pdf'},
+    'extract_pages_task': {'queue': 'scene_splitter_pdf_tasks', 'routing_key': 'tasks.pdf'},
     'scene_splitting_task': {'queue': 'scene_splitter_default', 'routing_key': 'tasks.default'},
     'save_scenes_task': {'queue': 'scene_splitter_default', 'routing_key': 'tasks.default'},
+    'split_shard_task': {'queue': 'scene_splitter_default', 'routing_key': 'tasks.default'},
+    'reconcile_shards_task': {'queue': 'scene_splitter_default', 'routing_key': 'tasks.default'},
+    'resegment_scenes_task': {'queue': 'scene_splitter_interactive', 'routing_key': 'tasks.interactive'},
 })
 
 if os.getenv('CELERY_ENABLE_MONITORING', 'false').lower() == 'true':
@@ -71,7 +81,43 @@ celery_app.conf.beat_schedule = {
         'task': 'cleanup_old_outbox_events',
         'schedule': 3600,
     },
+    'evict-embedding-cache-hourly': {
+        'task': 'evict_embedding_cache',
+        'schedule': 3600,
+    },
+    'evict-page-cache-hourly': {
+        'task': 'evict_page_cache',
+        'schedule': 3600,
+    },
+    'evict-resegment-results-hourly': {
+        'task': 'evict_resegment_results',
+        'schedule': 3600,
+    },
 }
 
+@worker_process_init.connect
+def warmup_models(**kwargs):
+    if os.getenv('SCENE_SPLITTER_WARMUP_MODELS', 'true').lower() != 'true':
+        return
+
+    # workers tokenize even when the encoder runs in the embedding server
+    try:
+        from app.services.sentence_tokenizer import get_sentence_tokenizer
+
+        get_sentence_tokenizer().load()
+    except Exception as e:
+        print(f"Sentence tokenizer warmup failed, it will be loaded on first use: {e}")
+    if os.getenv('EMBEDDING_SERVER_URL'):
+        return
+
+    from app.services.model_registry import get_model_registry
+
+    try:
+        stats = get_model_registry().warmup()
+        print(f"Scene splitter model ready: {stats}")
+    except Exception as e:
+        print(f"Model warmup failed, models will be loaded on first use: {e}")
+
+
 def get_broker_url():
     return broker_url
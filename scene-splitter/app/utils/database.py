@@ -19,9 +19,16 @@ if not DATABASE_URL:
 
     DATABASE_URL = f"postgresql://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_HOST}:{POSTGRES_PORT}/{POSTGRES_DB}"
 
+# the API runs its sync handlers on API_THREADPOOL_SIZE threads; size + overflow should cover them
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "20"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_TIMEOUT_SECONDS = float(os.getenv("DB_POOL_TIMEOUT_SECONDS", "30"))
+
 engine = create_engine(
     DATABASE_URL,
-    pool_size=20,
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    pool_timeout=DB_POOL_TIMEOUT_SECONDS,
     pool_pre_ping=True,
     pool_recycle=300,
     echo=os.getenv("SQL_DEBUG", "false").lower() == "true"
@@ -0,0 +1,34 @@
+"""Add sentence_embeddings table for the embedding cache
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'sentence_embeddings',
+        sa.Column('model_name', sa.String(length=255), nullable=False),
+        sa.Column('sentence_hash', sa.String(length=40), nullable=False),
+        sa.Column('embedding', sa.LargeBinary(), nullable=False),
+        sa.Column('dimensions', sa.Integer(), nullable=False),
+        sa.Column('dtype', sa.String(length=16), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('last_used_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('model_name', 'sentence_hash')
+    )
+    op.create_index('ix_sentence_embeddings_last_used_at', 'sentence_embeddings', ['last_used_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_sentence_embeddings_last_used_at', table_name='sentence_embeddings')
+    op.drop_table('sentence_embeddings')
@@ -0,0 +1,26 @@
+"""Add content hash and blob storage key to documents
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('documents', sa.Column('content_hash', sa.String(length=64), nullable=True))
+    op.add_column('documents', sa.Column('storage_key', sa.String(length=512), nullable=True))
+    op.create_index('ix_documents_content_hash', 'documents', ['content_hash'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_documents_content_hash', table_name='documents')
+    op.drop_column('documents', 'storage_key')
+    op.drop_column('documents', 'content_hash')
@@ -0,0 +1,38 @@
+"""Add extracted_pages cache and page count on documents
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '007'
+down_revision = '006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('documents', sa.Column('page_count', sa.Integer(), nullable=True))
+
+    op.create_table(
+        'extracted_pages',
+        sa.Column('content_hash', sa.String(length=64), nullable=False),
+        sa.Column('page_index', sa.Integer(), nullable=False),
+        sa.Column('laparams_fingerprint', sa.String(length=40), nullable=False),
+        sa.Column('text', sa.Text(), nullable=False),
+        sa.Column('byte_size', sa.Integer(), nullable=False),
+        sa.Column('extraction_seconds', sa.Float(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('last_accessed_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('content_hash', 'page_index', 'laparams_fingerprint')
+    )
+    op.create_index('ix_extracted_pages_last_accessed_at', 'extracted_pages', ['last_accessed_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_extracted_pages_last_accessed_at', table_name='extracted_pages')
+    op.drop_table('extracted_pages')
+    op.drop_column('documents', 'page_count')
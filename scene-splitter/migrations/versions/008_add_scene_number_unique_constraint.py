@@ -0,0 +1,37 @@
+"""Make scene numbers unique per processing job
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+
+revision = '008'
+down_revision = '007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # retried save_scenes_task runs could insert the same scenes twice; keep one copy
+    op.execute(
+        """
+        DELETE FROM scenes s
+        USING scenes d
+        WHERE s.processing_job_id = d.processing_job_id
+          AND s.scene_number = d.scene_number
+          AND s.ctid > d.ctid
+        """
+    )
+    op.create_unique_constraint(
+        'uq_scenes_job_scene_number',
+        'scenes',
+        ['processing_job_id', 'scene_number'],
+        deferrable=True,
+        initially='DEFERRED',
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint('uq_scenes_job_scene_number', 'scenes', type_='unique')
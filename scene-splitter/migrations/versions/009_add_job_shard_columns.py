@@ -0,0 +1,25 @@
+"""Track sharded scene splitting progress on processing_jobs
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = '009'
+down_revision = '008'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('processing_jobs', sa.Column('shards_total', sa.Integer(), nullable=True))
+    op.add_column('processing_jobs', sa.Column('shards_completed', postgresql.ARRAY(sa.Integer()), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('processing_jobs', 'shards_completed')
+    op.drop_column('processing_jobs', 'shards_total')
@@ -0,0 +1,62 @@
+"""Store job text once and scenes as character spans
+
+Revision ID: 011
+Revises: 010
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+import zlib
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = '011'
+down_revision = '010'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'job_texts',
+        sa.Column('processing_job_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('compressed_text', sa.LargeBinary(), nullable=False),
+        sa.Column('char_count', sa.Integer(), nullable=False),
+        sa.Column('byte_size', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['processing_job_id'], ['processing_jobs.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('processing_job_id')
+    )
+    # already zlib-compressed, TOAST compression would only burn CPU
+    op.execute("ALTER TABLE job_texts ALTER COLUMN compressed_text SET STORAGE EXTERNAL")
+
+    op.add_column('scenes', sa.Column('start_char', sa.Integer(), nullable=True))
+    op.add_column('scenes', sa.Column('end_char', sa.Integer(), nullable=True))
+    # existing rows keep their text as an override
+    op.alter_column('scenes', 'scene_text', existing_type=sa.Text(), nullable=True)
+
+
+def downgrade() -> None:
+    # spans are materialized back into scene_text before the job texts go away
+    bind = op.get_bind()
+    job_texts = bind.execute(sa.text("SELECT processing_job_id, compressed_text FROM job_texts")).fetchall()
+    for job_id, compressed_text in job_texts:
+        text = zlib.decompress(compressed_text).decode('utf-8')
+        scenes = bind.execute(
+            sa.text(
+                "SELECT id, start_char, end_char FROM scenes "
+                "WHERE processing_job_id = :job_id AND scene_text IS NULL"
+            ),
+            {'job_id': job_id},
+        ).fetchall()
+        if scenes:
+            bind.execute(
+                sa.text("UPDATE scenes SET scene_text = :scene_text WHERE id = :id"),
+                [{'id': scene_id, 'scene_text': text[start:end]} for scene_id, start, end in scenes],
+            )
+    op.execute("UPDATE scenes SET scene_text = '' WHERE scene_text IS NULL")
+    op.alter_column('scenes', 'scene_text', existing_type=sa.Text(), nullable=False)
+    op.drop_column('scenes', 'end_char')
+    op.drop_column('scenes', 'start_char')
+    op.drop_table('job_texts')
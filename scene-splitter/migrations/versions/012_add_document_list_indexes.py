@@ -0,0 +1,28 @@
+"""Indexes for the paginated document list
+
+Revision ID: 012
+Revises: 011
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '012'
+down_revision = '011'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # keyset pagination compares (created_at, id), NULLs would drop out of every page
+    op.execute("UPDATE documents SET created_at = COALESCE(updated_at, now()) WHERE created_at IS NULL")
+    op.alter_column('documents', 'created_at', existing_type=sa.DateTime(), nullable=False)
+    op.create_index('ix_documents_created_at_id', 'documents', ['created_at', 'id'], unique=False)
+    op.create_index('ix_processing_jobs_document_id', 'processing_jobs', ['document_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_processing_jobs_document_id', table_name='processing_jobs')
+    op.drop_index('ix_documents_created_at_id', table_name='documents')
+    op.alter_column('documents', 'created_at', existing_type=sa.DateTime(), nullable=True)
@@ -0,0 +1,69 @@
+"""Full-text search over scenes and a scene revision counter on jobs
+
+Revision ID: 013
+Revises: 012
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+import os
+import zlib
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = '013'
+down_revision = '012'
+branch_labels = None
+depends_on = None
+
+# must match the config the app writes and queries with, see app/repositories/scene_repository.py
+SCENE_SEARCH_CONFIG = os.getenv('SCENE_SEARCH_CONFIG', 'russian')
+
+
+def upgrade() -> None:
+    op.add_column('processing_jobs', sa.Column('revision', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('scenes', sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True))
+
+    # span scenes have their text only in the compressed job text
+    bind = op.get_bind()
+    bind.execute(
+        sa.text(
+            "UPDATE scenes SET search_vector = to_tsvector(CAST(:config AS regconfig), scene_text) "
+            "WHERE scene_text IS NOT NULL"
+        ),
+        {'config': SCENE_SEARCH_CONFIG},
+    )
+    job_texts = bind.execute(sa.text(
+        "SELECT t.processing_job_id, t.compressed_text FROM job_texts t "
+        "WHERE EXISTS (SELECT 1 FROM scenes s WHERE s.processing_job_id = t.processing_job_id "
+        "AND s.scene_text IS NULL)"
+    )).fetchall()
+    for job_id, compressed_text in job_texts:
+        text = zlib.decompress(compressed_text).decode('utf-8')
+        scenes = bind.execute(
+            sa.text(
+                "SELECT id, start_char, end_char FROM scenes "
+                "WHERE processing_job_id = :job_id AND scene_text IS NULL"
+            ),
+            {'job_id': job_id},
+        ).fetchall()
+        if scenes:
+            bind.execute(
+                sa.text(
+                    "UPDATE scenes SET search_vector = to_tsvector(CAST(:config AS regconfig), :text) "
+                    "WHERE id = :id"
+                ),
+                [
+                    {'id': scene_id, 'text': text[start:end], 'config': SCENE_SEARCH_CONFIG}
+                    for scene_id, start, end in scenes
+                ],
+            )
+
+    op.create_index('ix_scenes_search_vector', 'scenes', ['search_vector'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_scenes_search_vector', table_name='scenes')
+    op.drop_column('scenes', 'search_vector')
+    op.drop_column('processing_jobs', 'revision')
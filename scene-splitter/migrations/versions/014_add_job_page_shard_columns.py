@@ -0,0 +1,25 @@
+"""Track page-sharded PDF extraction progress on processing_jobs
+
+Revision ID: 014
+Revises: 013
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = '014'
+down_revision = '013'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('processing_jobs', sa.Column('page_shards_total', sa.Integer(), nullable=True))
+    op.add_column('processing_jobs', sa.Column('page_shards_completed', postgresql.ARRAY(sa.Integer()), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('processing_jobs', 'page_shards_completed')
+    op.drop_column('processing_jobs', 'page_shards_total')
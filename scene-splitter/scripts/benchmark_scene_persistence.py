@@ -0,0 +1,96 @@
+"""Compare per-scene add+flush persistence with SceneRepository.replace_for_job.
+
+Runs against the database from DATABASE_URL (migrated to head). Every run works
+on a throwaway document/job pair that is deleted afterwards.
+
+Usage: PYTHONPATH=. python scripts/benchmark_scene_persistence.py [sizes...]
+"""
+import sys
+import time
+
+from sqlalchemy import func, select
+
+from app.models import Document, ProcessingJob, Scene
+from app.repositories.scene_repository import SceneRepository
+from app.utils.database import get_db_session
+
+DEFAULT_SIZES = [100, 1_000, 10_000]
+SCENE_TEXT = "Он открыл дверь и вышел в сад. " * 40
+
+
+def scene_rows(count: int):
+    return (
+        {
+            'scene_number': i + 1,
+            'scene_text': SCENE_TEXT,
+            'sentence_count': 40,
+            'word_count': 280,
+            'char_count': len(SCENE_TEXT),
+            'start_sentence_idx': i * 40,
+            'end_sentence_idx': i * 40 + 39,
+            'boundary_confidence': 0.5 if i else None,
+        }
+        for i in range(count)
+    )
+
+
+def per_scene_path(session, job_id, count: int):
+    for row in scene_rows(count):
+        session.add(Scene(processing_job_id=job_id, **row))
+        session.flush()
+    session.commit()
+
+
+def bulk_path(session, job_id, count: int):
+    SceneRepository(session).replace_for_job(job_id, scene_rows(count))
+    session.commit()
+
+
+def timed(fn, *args):
+    started = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - started
+
+
+def scene_count(session, job_id) -> int:
+    return session.scalar(select(func.count()).select_from(Scene).where(Scene.processing_job_id == job_id))
+
+
+def main(sizes):
+    session = get_db_session()
+    document = Document(filename="benchmark.pdf", file_size=0, mime_type="application/pdf")
+    session.add(document)
+    session.flush()
+    job = ProcessingJob(document_id=document.id)
+    session.add(job)
+    session.commit()
+
+    try:
+        print(f"{'scenes':>8} {'per-scene, s':>13} {'bulk, s':>9} {'speedup':>8} {'retry keeps count':>18}")
+        for size in sizes:
+            session.query(Scene).filter(Scene.processing_job_id == job.id).delete()
+            session.commit()
+            old_seconds = timed(per_scene_path, session, job.id, size)
+
+            session.query(Scene).filter(Scene.processing_job_id == job.id).delete()
+            session.commit()
+            new_seconds = timed(bulk_path, session, job.id, size)
+            # a retried task runs the same write again and must not duplicate rows
+            bulk_path(session, job.id, size)
+            idempotent = scene_count(session, job.id) == size
+
+            print(
+                f"{size:>8} {old_seconds:>13.3f} {new_seconds:>9.3f} "
+                f"{old_seconds / max(new_seconds, 1e-9):>7.1f}x {str(idempotent):>18}"
+            )
+    finally:
+        session.rollback()
+        session.query(Scene).filter(Scene.processing_job_id == job.id).delete()
+        session.delete(job)
+        session.delete(document)
+        session.commit()
+        session.close()
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES)
@@ -0,0 +1,62 @@
+"""Compare the per-pair and the batched similarity/valley paths of SceneSplitterService.
+
+Usage: PYTHONPATH=. python scripts/benchmark_similarity.py [sizes...]
+"""
+import sys
+import time
+
+import numpy as np
+from scipy.ndimage import gaussian_filter1d
+from sklearn.metrics.pairwise import cosine_similarity
+
+from app.services.scene_splitter import SceneSplitterService
+
+EMBEDDING_DIM = 312
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+
+
+def pairwise_path(embeddings: np.ndarray):
+    similarities = [
+        cosine_similarity([embeddings[i]], [embeddings[i + 1]])[0][0]
+        for i in range(len(embeddings) - 1)
+    ]
+    smoothed = gaussian_filter1d(similarities, sigma=2.0)
+    valleys = []
+    for i in range(1, len(smoothed) - 1):
+        if smoothed[i] < smoothed[i - 1] and smoothed[i] < smoothed[i + 1]:
+            valleys.append(i)
+    return smoothed, valleys
+
+
+def batched_path(splitter: SceneSplitterService, embeddings: np.ndarray):
+    smoothed = splitter.compute_smoothed_similarities(embeddings)
+    return smoothed, splitter.find_valleys(smoothed)
+
+
+def timed(fn, *args):
+    started = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - started
+
+
+def main(sizes):
+    # the numeric helpers do not touch the encoder, so skip loading it
+    splitter = SceneSplitterService.__new__(SceneSplitterService)
+    rng = np.random.default_rng(42)
+
+    print(f"{'sentences':>10} {'pairwise, s':>12} {'batched, s':>11} {'speedup':>8} {'same valleys':>13}")
+    for size in sizes:
+        embeddings = rng.standard_normal((size, EMBEDDING_DIM)).astype(np.float32)
+
+        (old_smoothed, old_valleys), old_seconds = timed(pairwise_path, embeddings)
+        (new_smoothed, new_valleys), new_seconds = timed(batched_path, splitter, embeddings)
+
+        same = old_valleys == new_valleys and np.allclose(old_smoothed, new_smoothed, atol=1e-6)
+        print(
+            f"{size:>10} {old_seconds:>12.3f} {new_seconds:>11.4f} "
+            f"{old_seconds / max(new_seconds, 1e-9):>7.0f}x {str(same):>13}"
+        )
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES)
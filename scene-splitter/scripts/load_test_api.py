@@ -0,0 +1,142 @@
+"""Measure API latency under many concurrent pollers, optionally during upload bursts.
+
+Every client polls GET /api/jobs/{job_id}/status (and, with --scenes, the first
+page of the scene listing) in a loop for --duration seconds. With --upload the
+given PDF is posted to /api/split-scenes/ in bursts of --burst uploads every
+--burst-every seconds, which is what used to freeze status polling. The report
+shows per-endpoint request counts, errors and latency percentiles. The exit code
+is 1 if the status p99 exceeds --max-p99-ms.
+
+Run it against a deployment before and after a change with the same arguments. Compare
+numbers from the Postgres compose stack only: sqlite serialises writers and has no pool
+to exhaust, so its tail latencies say nothing about API_THREADPOOL_SIZE or DB_POOL_SIZE.
+
+Usage: python scripts/load_test_api.py [--base-url http://localhost:8000] [--job-id ID]
+           [--clients 200] [--duration 30] [--scenes] [--upload file.pdf --burst 10 --burst-every 5]
+           [--max-p99-ms 500]
+"""
+import argparse
+import asyncio
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import httpx
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+
+    async def timed(self, name: str, request) -> Optional[httpx.Response]:
+        started = time.perf_counter()
+        try:
+            response = await request
+        except httpx.HTTPError:
+            self.errors[name] += 1
+            return None
+        self.latencies[name].append((time.perf_counter() - started) * 1000)
+        if response.status_code >= 400:
+            self.errors[name] += 1
+        return response
+
+
+def percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    if not ordered:
+        return float("nan")
+    index = min(len(ordered) - 1, max(0, round(q / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def find_job_id(client: httpx.AsyncClient) -> Optional[str]:
+    response = await client.get("/api/documents", params={"limit": 20})
+    response.raise_for_status()
+    for document in response.json()["documents"]:
+        for job in document.get("processing_jobs") or []:
+            return job["id"]
+    return None
+
+
+async def poller(client: httpx.AsyncClient, recorder: Recorder, job_id: str, deadline: float, scenes: bool):
+    while time.perf_counter() < deadline:
+        await recorder.timed("status", client.get(f"/api/jobs/{job_id}/status"))
+        if scenes:
+            await recorder.timed("scenes", client.get(f"/api/jobs/{job_id}/scenes", params={"limit": 50}))
+
+
+async def uploader(client: httpx.AsyncClient, recorder: Recorder, pdf: Path, burst: int, every: float, deadline: float):
+    content = pdf.read_bytes()
+    while time.perf_counter() < deadline:
+        await asyncio.gather(*[
+            recorder.timed(
+                "upload",
+                client.post(
+                    "/api/split-scenes/",
+                    files={"file": (pdf.name, content, "application/pdf")},
+                    data={"start_page": "1", "end_page": "1"},
+                ),
+            )
+            for _ in range(burst)
+        ])
+        await asyncio.sleep(every)
+
+
+async def run(args) -> int:
+    limits = httpx.Limits(max_connections=args.clients + args.burst, max_keepalive_connections=args.clients + args.burst)
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=args.timeout) as client:
+        job_id = args.job_id or await find_job_id(client)
+        if not job_id:
+            print("No job to poll; pass --job-id or upload a document first")
+            return 2
+
+        recorder = Recorder()
+        deadline = time.perf_counter() + args.duration
+        workers = [poller(client, recorder, job_id, deadline, args.scenes) for _ in range(args.clients)]
+        if args.upload:
+            workers.append(uploader(client, recorder, args.upload, args.burst, args.burst_every, deadline))
+
+        started = time.perf_counter()
+        await asyncio.gather(*workers)
+        elapsed = time.perf_counter() - started
+
+    print(f"{args.clients} clients, {elapsed:.1f}s against {args.base_url}")
+    print(f"{'endpoint':<10} {'requests':>9} {'errors':>7} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    for name in sorted(set(recorder.latencies) | set(recorder.errors)):
+        values = recorder.latencies[name]
+        print(
+            f"{name:<10} {len(values):>9} {recorder.errors[name]:>7} {len(values) / elapsed:>8.1f} "
+            f"{percentile(values, 50):>8.1f} {percentile(values, 95):>8.1f} "
+            f"{percentile(values, 99):>8.1f} {max(values, default=float('nan')):>8.1f}"
+        )
+
+    status_p99 = percentile(recorder.latencies["status"], 99)
+    if args.max_p99_ms is not None and not status_p99 <= args.max_p99_ms:
+        print(f"status p99 {status_p99:.1f} ms exceeds {args.max_p99_ms} ms")
+        return 1
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--job-id", help="job to poll; defaults to the newest job in /api/documents")
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds")
+    parser.add_argument("--timeout", type=float, default=60.0, help="per-request timeout in seconds")
+    parser.add_argument("--scenes", action="store_true", help="also fetch the first scene page on every poll")
+    parser.add_argument("--upload", type=Path, help="PDF to upload in bursts while polling")
+    parser.add_argument("--burst", type=int, default=10, help="uploads per burst")
+    parser.add_argument("--burst-every", type=float, default=5.0, help="seconds between bursts")
+    parser.add_argument("--max-p99-ms", type=float)
+    args = parser.parse_args()
+    if not args.upload:
+        args.burst = 0
+    return asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
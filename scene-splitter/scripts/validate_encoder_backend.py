@@ -0,0 +1,121 @@
+"""Check that an encoder backend splits a corpus the same way as the fp32 baseline.
+
+Every .txt file in the corpus directory is split twice with the valleys
+segmenter: once with the baseline backend and once with the candidate. The
+report shows per-document boundary agreement, embedding cosine similarity and
+encoding throughput. The exit code is 1 if the mean boundary F1 falls below
+--min-f1.
+
+Usage: PYTHONPATH=. python scripts/validate_encoder_backend.py CORPUS_DIR
+           [--baseline torch] [--candidate onnx-int8] [--tolerance 1] [--min-f1 0.95]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import List, Set
+
+import numpy as np
+
+from app.services.model_registry import DEFAULT_MODEL_NAME, SUPPORTED_BACKENDS
+from app.services.scene_splitter import SceneSplitterService
+
+
+def boundary_f1(expected: Set[int], actual: Set[int], tolerance: int) -> float:
+    if not expected and not actual:
+        return 1.0
+    matched_expected = sum(1 for b in expected if any(abs(b - a) <= tolerance for a in actual))
+    matched_actual = sum(1 for a in actual if any(abs(a - b) <= tolerance for b in expected))
+    precision = matched_actual / len(actual) if actual else 0.0
+    recall = matched_expected / len(expected) if expected else 0.0
+    return 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+
+
+def window_diff(expected: List[int], actual: List[int], sentence_count: int) -> float:
+    """WindowDiff (Pevzner & Hearst): share of windows with a different boundary count, 0 is identical."""
+    if sentence_count < 2:
+        return 0.0
+    reference = np.zeros(sentence_count - 1, dtype=np.int64)
+    hypothesis = np.zeros(sentence_count - 1, dtype=np.int64)
+    reference[expected] = 1
+    hypothesis[actual] = 1
+    k = max(1, round(sentence_count / (2 * (len(expected) + 1))))
+    if k >= sentence_count - 1:
+        return float(reference.sum() != hypothesis.sum())
+    ref_counts = np.convolve(reference, np.ones(k, dtype=np.int64), mode="valid")
+    hyp_counts = np.convolve(hypothesis, np.ones(k, dtype=np.int64), mode="valid")
+    return float(np.mean(ref_counts != hyp_counts))
+
+
+def split(splitter: SceneSplitterService, sentences: List[str]):
+    started = time.perf_counter()
+    embeddings = np.asarray(splitter.embed_sentences(sentences), dtype=np.float32)
+    seconds = time.perf_counter() - started
+    smoothed = splitter.compute_smoothed_similarities(embeddings)
+    depths = splitter.compute_depth_scores(smoothed)
+    return embeddings, splitter.select_boundaries(sentences, smoothed, depths), seconds
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("corpus", type=Path)
+    parser.add_argument("--model", default=DEFAULT_MODEL_NAME)
+    parser.add_argument("--baseline", default="torch", choices=SUPPORTED_BACKENDS)
+    parser.add_argument("--candidate", default="onnx-int8", choices=SUPPORTED_BACKENDS)
+    parser.add_argument("--tolerance", type=int, default=1, help="boundary offset in sentences still counted as a match")
+    parser.add_argument("--min-f1", type=float, default=0.95)
+    args = parser.parse_args()
+
+    files = sorted(args.corpus.glob("*.txt"))
+    if not files:
+        print(f"No .txt files in {args.corpus}")
+        return 2
+
+    baseline = SceneSplitterService(args.model, backend=args.baseline)
+    candidate = SceneSplitterService(args.model, backend=args.candidate)
+    # exclude one-off model loading and graph initialisation from the throughput numbers
+    baseline.embed_sentences(["Прогрев."])
+    candidate.embed_sentences(["Прогрев."])
+
+    print(f"{'document':<32} {'sentences':>9} {'scenes':>13} {'exact':>6} {'F1':>6} {'WinDiff':>8} {'cos min':>8}")
+    f1_scores = []
+    totals = {"sentences": 0, "baseline_seconds": 0.0, "candidate_seconds": 0.0}
+    for path in files:
+        sentences = baseline.tokenize_sentences(baseline.normalize_text(path.read_text(encoding="utf-8")))
+        if len(sentences) < 3:
+            continue
+
+        base_embeddings, base_valleys, base_seconds = split(baseline, sentences)
+        cand_embeddings, cand_valleys, cand_seconds = split(candidate, sentences)
+
+        f1 = boundary_f1(set(base_valleys), set(cand_valleys), args.tolerance)
+        f1_scores.append(f1)
+        totals["sentences"] += len(sentences)
+        totals["baseline_seconds"] += base_seconds
+        totals["candidate_seconds"] += cand_seconds
+
+        cosine = np.einsum("ij,ij->i", base_embeddings, cand_embeddings) / (
+            np.linalg.norm(base_embeddings, axis=1) * np.linalg.norm(cand_embeddings, axis=1) + 1e-12
+        )
+        print(
+            f"{path.name[:32]:<32} {len(sentences):>9} {len(base_valleys) + 1:>6}/{len(cand_valleys) + 1:<6} "
+            f"{str(base_valleys == cand_valleys):>6} {f1:>6.3f} "
+            f"{window_diff(base_valleys, cand_valleys, len(sentences)):>8.4f} {cosine.min():>8.4f}"
+        )
+
+    if not f1_scores:
+        print("Corpus has no document with at least 3 sentences")
+        return 2
+
+    mean_f1 = float(np.mean(f1_scores))
+    base_rate = totals["sentences"] / max(totals["baseline_seconds"], 1e-9)
+    cand_rate = totals["sentences"] / max(totals["candidate_seconds"], 1e-9)
+    print()
+    print(f"mean boundary F1 (±{args.tolerance}): {mean_f1:.4f}")
+    print(f"{args.baseline}: {base_rate:.0f} sentences/s, {args.candidate}: {cand_rate:.0f} sentences/s "
+          f"({cand_rate / base_rate:.2f}x)")
+    return 0 if mean_f1 >= args.min_f1 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())